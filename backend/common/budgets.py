@@ -0,0 +1,37 @@
+import logging
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def get_query_budget(view_func, method: str) -> int | None:
+    """
+    Budget a view declares for the action serving ``method``.
+
+    Views list them in ``query_budgets``, keyed by action for viewsets and by
+    lowercase method name for other views. Undeclared actions are unbounded.
+    """
+    view = getattr(view_func, "cls", getattr(view_func, "view_class", None))
+    budgets = getattr(view, "query_budgets", None)
+    if not budgets:
+        return None
+
+    method = method.lower()
+    actions = getattr(view_func, "actions", None)
+    return budgets.get(actions.get(method, method) if actions else method)
+
+
+def check_query_budget(label: str, budget: int, queries: int) -> None:
+    if queries <= budget:
+        return
+
+    message = f"{label} ran {queries} queries, its budget is {budget}."
+    if settings.QUERY_BUDGET_MODE == "raise":
+        raise QueryBudgetExceeded(message)
+
+    logger.warning(message)
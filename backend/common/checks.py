@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def cache_is_local() -> bool:
+    """Whether each process has its own ``default`` cache, unseen by the others."""
+    return isinstance(caches["default"], LocMemCache)
+
+
+def cache_is_shared() -> bool:
+    """Whether entries one process sets in the ``default`` cache reach the others."""
+    return not cache_is_local() and not isinstance(caches["default"], DummyCache)
+
+
+@checks.register(checks.Tags.caches)
+def check_user_cache(app_configs, **kwargs):
+    if settings.DEBUG or not cache_is_local():
+        return []
+
+    return [
+        checks.Warning(
+            "The default cache is local to each process, other processes keep "
+            "authenticating changed or deactivated users for up to "
+            f"JWT_USER_CACHE_TTL ({settings.JWT_USER_CACHE_TTL}s).",
+            hint="Point CACHE_URL at a cache shared by every process.",
+            id="common.W001",
+        )
+    ]
+
+
+@checks.register(checks.Tags.caches, checks.Tags.database)
+def check_replica_cache(app_configs, **kwargs):
+    if not settings.DATABASE_REPLICAS or cache_is_shared():
+        return []
+
+    return [
+        checks.Error(
+            "DATABASE_REPLICAS need a cache shared by every process to pin clients "
+            "to the primary after they write, reads stay on the primary until then.",
+            hint="Point CACHE_URL at a cache shared by every process.",
+            id="common.E002",
+        )
+    ]
@@ -0,0 +1,92 @@
+from decimal import Decimal
+from decimal import ROUND_HALF_EVEN
+
+from django.core import checks
+from django.db import models
+
+# Largest ``max_digits`` whose scaled values still fit each integer column.
+INTEGER_COLUMNS = (
+    (4, "SmallIntegerField"),
+    (9, "IntegerField"),
+    (18, "BigIntegerField"),
+)
+
+
+class ScaledDecimalField(models.DecimalField):
+    """
+    ``DecimalField`` stored as an integer count of ``decimal_places`` steps.
+
+    pH 6.5 with one decimal place is stored as 65: a ``smallint`` takes two bytes
+    where a ``numeric`` takes five to eight, and sums, minimums and maximums run
+    on integer arithmetic. The column is a ``smallint``, ``integer`` or
+    ``bigint`` depending on ``max_digits``. Models, forms, serializers, filters
+    and ``Min``, ``Max`` and ``Sum`` over the column still see ``Decimal``
+    values. ``Avg`` and arithmetic such as ``F("ph") * 2`` resolve to a plain
+    ``DecimalField`` and would return steps, like raw SQL does: average with
+    ``ScaledAvg`` and give arithmetic the field as ``output_field`` instead.
+    """
+
+    def check(self, **kwargs):
+        errors = super().check(**kwargs)
+        if (
+            isinstance(self.max_digits, int)
+            and self.max_digits > INTEGER_COLUMNS[-1][0]
+        ):
+            errors.append(
+                checks.Error(
+                    f"'max_digits' must be at most {INTEGER_COLUMNS[-1][0]}.",
+                    obj=self,
+                    id="common.E001",
+                )
+            )
+
+        return errors
+
+    @property
+    def scale(self) -> int:
+        return 10**self.decimal_places
+
+    def db_type(self, connection):
+        for max_digits, internal_type in INTEGER_COLUMNS:
+            if self.max_digits <= max_digits:
+                return connection.data_types[internal_type]
+
+        return connection.data_types[INTEGER_COLUMNS[-1][1]]
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+
+        return Decimal(value).scaleb(-self.decimal_places)
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if not prepared:
+            value = self.get_prep_value(value)
+        if value is None:
+            return value
+
+        # Lookup values keep their extra digits: ``ph > 6.55`` compares the
+        # column with 65.5 rather than a rounded bound.
+        value = value.scaleb(self.decimal_places)
+        if value == value.to_integral_value():
+            return int(value)
+
+        return value
+
+    def get_db_prep_save(self, value, connection):
+        value = self.get_prep_value(value)
+        if value is None:
+            return value
+
+        return int(value.scaleb(self.decimal_places).quantize(1, ROUND_HALF_EVEN))
+
+
+class ScaledAvg(models.Avg):
+    """``Avg`` that reads the average of a ``ScaledDecimalField`` back unscaled."""
+
+    def _resolve_output_field(self):
+        source_field = self.get_source_fields()[0]
+        if isinstance(source_field, ScaledDecimalField):
+            return source_field
+
+        return super()._resolve_output_field()
@@ -0,0 +1,133 @@
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import HttpRequest
+from prometheus_client import CollectorRegistry
+from prometheus_client import Counter
+from prometheus_client import Histogram
+from prometheus_client import multiprocess
+from prometheus_client import REGISTRY
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time spent serving a request.",
+    ["view", "method"],
+)
+REQUESTS = Counter(
+    "http_requests",
+    "Requests served.",
+    ["view", "method", "status"],
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Database queries run while serving a request.",
+    ["view"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, float("inf")),
+)
+REQUEST_QUERY_DURATION = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent in database queries while serving a request.",
+    ["view"],
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "Size of response bodies, streamed responses are left out.",
+    ["view"],
+    buckets=(100, 1000, 10_000, 100_000, 1_000_000, 10_000_000, float("inf")),
+)
+
+
+def get_registry() -> CollectorRegistry:
+    """
+    Registry to expose, merging every worker's samples in multiprocess mode.
+
+    Multi-worker servers must point ``PROMETHEUS_MULTIPROC_DIR`` at an empty
+    directory shared by their workers, each of them then writes its samples to
+    its own memory mapped files.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def get_view_label(request: HttpRequest) -> str:
+    """
+    ``<basename>-<action>`` for viewsets, e.g. ``measurements-list``, otherwise
+    the URL name. Bounded by the URLconf, so label cardinality stays low.
+    """
+    match = request.resolver_match
+    if match is None:
+        return "unmatched"
+
+    actions = getattr(match.func, "actions", None)
+    if actions:
+        # Viewsets routed by hand have no basename.
+        basename = match.func.initkwargs.get("basename") or match.view_name
+        method = request.method.lower()
+        return f"{basename}-{actions.get(method, method)}"
+
+    return match.view_name or match.route
+
+
+class QueryRecorder:
+    """``execute_wrapper`` counting queries and the time they took."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+# Recorders of the request being served, see ``recording_queries``.
+query_recorders: ContextVar[tuple[QueryRecorder, ...]] = ContextVar(
+    "query_recorders", default=()
+)
+
+
+def record_queries(execute, sql, params, many, context):
+    """``execute_wrapper`` of every connection, feeding ``query_recorders``."""
+    for recorder in reversed(query_recorders.get()):
+        execute = partial(recorder, execute)
+
+    return execute(sql, params, many, context)
+
+
+@receiver(connection_created)
+def install_query_recorders(sender, connection, **kwargs):
+    # Reconnecting keeps the wrappers of the previous connection.
+    if record_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_queries)
+
+
+@contextmanager
+def recording_queries() -> Iterator[QueryRecorder]:
+    """
+    Counts the queries of every database alias run inside the block.
+
+    Unlike ``connection.execute_wrapper``, which only wraps the current
+    thread's connections, this also counts queries that async views and the
+    async ORM run in ``sync_to_async`` threads, as context variables follow them
+    there.
+    """
+    recorder = QueryRecorder()
+    token = query_recorders.set((*query_recorders.get(), recorder))
+    try:
+        yield recorder
+    finally:
+        query_recorders.reset(token)
@@ -0,0 +1,219 @@
+import time
+
+from asgiref.sync import iscoroutinefunction
+from asgiref.sync import markcoroutinefunction
+from asgiref.sync import sync_to_async
+from common.budgets import check_query_budget
+from common.budgets import get_query_budget
+from common.checks import cache_is_shared
+from common.metrics import get_view_label
+from common.metrics import QueryRecorder
+from common.metrics import recording_queries
+from common.metrics import REQUEST_DURATION
+from common.metrics import REQUEST_QUERIES
+from common.metrics import REQUEST_QUERY_DURATION
+from common.metrics import REQUESTS
+from common.metrics import RESPONSE_SIZE
+from common.routers import choose_replica
+from common.routers import is_pinned_to_primary
+from common.routers import pin_to_primary
+from common.routers import replica_alias
+from django.conf import settings
+from django.http import HttpRequest
+from django.http import HttpResponse
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class AsyncCapableMiddleware:
+    """
+    Middleware running in the mode of the handler it wraps.
+
+    Under ``config.asgi`` the chain stays async from the server to async views,
+    a sync middleware would make Django run everything below it in a thread.
+    Subclasses implement ``__call__`` for WSGI and ``__acall__`` for ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+
+class ReplicaRoutingMiddleware(AsyncCapableMiddleware):
+    """
+    Serves safe requests to ``DATABASE_REPLICA_VIEW_MODULES`` from a replica.
+
+    One replica is picked per request so all of its queries see the same
+    snapshot. A client whose unsafe request succeeded is pinned to the primary
+    for ``DATABASE_REPLICA_PIN_SECONDS``, long enough for the replicas to catch
+    up, so it always reads what it has just written. Pins live in the cache,
+    without one shared by every process everything is read from the primary,
+    see ``common.checks.check_replica_cache``.
+    """
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        token = replica_alias.set(None)
+        try:
+            response = self.get_response(request)
+        finally:
+            replica_alias.reset(token)
+
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            pin_to_primary(request)
+
+        return response
+
+    async def __acall__(self, request):
+        # ``sync_to_async`` copies the context into its thread and back, so the
+        # replica ``process_view`` picks reaches the view's queries.
+        token = replica_alias.set(None)
+        try:
+            response = await self.get_response(request)
+        finally:
+            replica_alias.reset(token)
+
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            await sync_to_async(pin_to_primary)(request)
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            request.method not in SAFE_METHODS
+            or not settings.DATABASE_REPLICAS
+            or not cache_is_shared()
+        ):
+            return None
+
+        # DRF views are functions made by ``as_view``, they keep their class.
+        module = getattr(view_func, "cls", view_func).__module__
+        if module in settings.DATABASE_REPLICA_VIEW_MODULES and not (
+            is_pinned_to_primary(request)
+        ):
+            replica_alias.set(choose_replica())
+
+        return None
+
+
+class MetricsMiddleware(AsyncCapableMiddleware):
+    """
+    Records latency, database queries and response size per view, see
+    ``common.metrics``. Queries of every database alias are counted.
+    """
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        started = time.perf_counter()
+        with recording_queries() as queries:
+            response = self.get_response(request)
+
+        self.observe(request, response, time.perf_counter() - started, queries)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        with recording_queries() as queries:
+            response = await self.get_response(request)
+
+        self.observe(request, response, time.perf_counter() - started, queries)
+        return response
+
+    def observe(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        duration: float,
+        queries: QueryRecorder,
+    ) -> None:
+        view = get_view_label(request)
+        REQUEST_DURATION.labels(view, request.method).observe(duration)
+        REQUESTS.labels(view, request.method, response.status_code).inc()
+        REQUEST_QUERIES.labels(view).observe(queries.count)
+        REQUEST_QUERY_DURATION.labels(view).observe(queries.duration)
+        if not response.streaming:
+            RESPONSE_SIZE.labels(view).observe(len(response.content))
+
+
+class QueryBudgetMiddleware(AsyncCapableMiddleware):
+    """
+    Checks requests against the ``query_budgets`` of their view, logging or
+    raising ``QueryBudgetExceeded`` past them as ``QUERY_BUDGET_MODE`` says.
+    """
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if settings.QUERY_BUDGET_MODE == "off":
+            return self.get_response(request)
+
+        request.query_budget = None
+        with recording_queries() as queries:
+            response = self.get_response(request)
+
+        self.check(request, queries)
+        return response
+
+    async def __acall__(self, request):
+        if settings.QUERY_BUDGET_MODE == "off":
+            return await self.get_response(request)
+
+        request.query_budget = None
+        with recording_queries() as queries:
+            response = await self.get_response(request)
+
+        self.check(request, queries)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if settings.QUERY_BUDGET_MODE != "off":
+            request.query_budget = get_query_budget(view_func, request.method)
+
+        return None
+
+    def check(self, request: HttpRequest, queries: QueryRecorder) -> None:
+        if request.query_budget is not None:
+            check_query_budget(
+                get_view_label(request), request.query_budget, queries.count
+            )
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    ``WhiteNoiseMiddleware`` that keeps an async middleware chain async.
+
+    WhiteNoise only runs synchronously, under ``config.asgi`` static files are
+    served from a thread and every other request is awaited.
+    """
+
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+
+        return await self.get_response(request)
@@ -0,0 +1,89 @@
+import hashlib
+from calendar import timegm
+from datetime import datetime
+
+from common.serializers import get_values_lookups
+from common.serializers import get_values_plan
+from common.serializers import serialize_values
+from django.utils.cache import get_conditional_response
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.utils.http import quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class ConditionalGetMixin:
+    """
+    Answers ``list`` and ``retrieve`` with 304 Not Modified before anything is
+    serialized when the client's ``If-None-Match``/``If-Modified-Since`` match.
+
+    Views implement ``get_conditional_state`` returning the newest change of what
+    the action would render plus an optional version string, or ``None`` to skip.
+    """
+
+    def get_conditional_state(self) -> tuple[datetime, str] | None:
+        raise NotImplementedError
+
+    def get_etag(self, last_modified: datetime, version: str) -> str:
+        key = ":".join(
+            (
+                str(self.request.user.pk),
+                self.request.accepted_renderer.format,
+                self.request.get_full_path(),
+                last_modified.isoformat(),
+                version,
+            )
+        )
+        return quote_etag(hashlib.md5(key.encode(), usedforsecurity=False).hexdigest())
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        state = self.get_conditional_state()
+        if state is None:
+            return handler(request, *args, **kwargs)
+
+        last_modified, version = state
+        etag = self.get_etag(last_modified, version)
+        timestamp = timegm(last_modified.utctimetuple())
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response["ETag"] = etag
+            response["Last-Modified"] = http_date(timestamp)
+
+        patch_vary_headers(response, ("Authorization",))
+        return response
+
+
+class ValuesListMixin:
+    """
+    Serves ``list`` from ``.values()`` rows instead of model instances.
+
+    The serializer class is only used to plan which columns to fetch and how to
+    represent them, see ``common.serializers.get_values_plan``, so responses stay
+    the same without building a model and serializer per row. Columns the
+    pagination orders on but does not render go in ``values_extra_fields``.
+    """
+
+    values_extra_fields: tuple[str, ...] = ()
+
+    def list(self, request, *args, **kwargs):
+        plan = get_values_plan(self.get_serializer())
+        queryset = self.filter_queryset(self.get_queryset()).values(
+            *get_values_lookups(plan), *self.values_extra_fields
+        )
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serialize_values(plan, page))
+
+        return Response(serialize_values(plan, queryset))
@@ -1,6 +1,152 @@
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor
+from rest_framework.pagination import CursorPagination
 from rest_framework.pagination import PageNumberPagination
 
 
 class CustomPageNumberPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination keyed on ``(ordering field, id)``.
+
+    Unlike DRF's ``CursorPagination`` ties are broken by the primary key instead of
+    an offset, so every page is a single index range scan without ``COUNT(*)``.
+    The ordering is taken from the view's filterset ``OrderingFilter`` so the
+    ``order_by`` query param keeps working; only its first field is used.
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = "-created_at"
+    ordering_param = "order_by"
+    tiebreaker = "id"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+
+        return self.get_page_results(list(queryset))
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """Narrows ``queryset`` down to the rows of the requested page."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+
+        field = self.ordering.lstrip("-")
+        descending = self.ordering.startswith("-")
+        if self.cursor is not None and self.cursor.reverse:
+            descending = not descending
+
+        if descending:
+            queryset = queryset.order_by(f"-{field}", f"-{self.tiebreaker}")
+        else:
+            queryset = queryset.order_by(field, self.tiebreaker)
+
+        if self.cursor is not None and self.cursor.position is not None:
+            value, pk = self.decode_position(self.cursor.position)
+            lookup = "lt" if descending else "gt"
+            # The redundant ``lte``/``gte`` bound is what lets Postgres start the
+            # index scan at the cursor instead of filtering from the first row.
+            try:
+                queryset = queryset.filter(
+                    Q(**{f"{field}__{lookup}e": value}),
+                    Q(**{f"{field}__{lookup}": value})
+                    | Q(**{field: value, f"{self.tiebreaker}__{lookup}": pk}),
+                )
+            except (ValidationError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+
+        return queryset[: self.page_size + 1]
+
+    def get_page_results(self, results: list) -> list:
+        """Trims the extra lookahead row and resolves next/previous links."""
+        has_following = len(results) > self.page_size
+        results = results[: self.page_size]
+
+        if self.cursor is not None and self.cursor.reverse:
+            results.reverse()
+            self.has_next = True
+            self.has_previous = has_following
+        else:
+            self.has_next = has_following
+            self.has_previous = self.cursor is not None
+
+        self.page = results
+        return results
+
+    def get_ordering(self, request, queryset, view):
+        term = request.query_params.get(self.ordering_param, "").split(",")[0].strip()
+        filterset_class = getattr(view, "filterset_class", None)
+        if not term or filterset_class is None:
+            return self.ordering
+
+        ordering_filter = filterset_class.base_filters.get(self.ordering_param)
+        field = getattr(ordering_filter, "param_map", {}).get(term.lstrip("-"))
+        if field is None:
+            return self.ordering
+
+        return f"-{field}" if term.startswith("-") else field
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+
+        position = self.encode_position(self.page[-1]) if self.page else None
+        return self.encode_cursor(
+            Cursor(
+                offset=0,
+                reverse=False,
+                position=position or self.cursor.position,
+            )
+        )
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+
+        position = self.encode_position(self.page[0]) if self.page else None
+        return self.encode_cursor(
+            Cursor(
+                offset=0,
+                reverse=True,
+                position=position or self.cursor.position,
+            )
+        )
+
+    def encode_position(self, row) -> str:
+        field = self.ordering.lstrip("-")
+        if isinstance(row, dict):
+            value, pk = row[field], row[self.tiebreaker]
+        else:
+            value, pk = getattr(row, field), getattr(row, self.tiebreaker)
+
+        # ``isoformat`` keeps microseconds, which DjangoJSONEncoder would drop.
+        if hasattr(value, "isoformat"):
+            value = value.isoformat()
+
+        return json.dumps([str(value), str(pk)])
+
+    def decode_position(self, position: str) -> tuple[str, str]:
+        try:
+            value, pk = json.loads(position)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return value, pk
@@ -0,0 +1,26 @@
+import io
+
+import orjson
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+
+class ORJSONParser(JSONParser):
+    """
+    ``JSONParser`` decoding UTF-8 bodies with orjson.
+
+    Bodies orjson refuses are handed to the stdlib parser, which either reads
+    what orjson cannot, like integers past 64 bits, or raises the usual
+    ``ParseError``.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        body = stream.read()
+        if encoding.lower().replace("_", "-") in ("utf-8", "utf8"):
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass
+
+        return super().parse(io.BytesIO(body), media_type, parser_context)
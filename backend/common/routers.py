@@ -0,0 +1,65 @@
+import hashlib
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db import DEFAULT_DB_ALIAS
+from django.http import HttpRequest
+
+# Replica the current request reads from, ``None`` reads from the primary.
+replica_alias: ContextVar[str | None] = ContextVar("replica_alias", default=None)
+
+
+def get_pin_cache_key(request: HttpRequest) -> str:
+    # Whatever identifies the client before authentication runs: its
+    # credentials, its session or as a last resort its address.
+    client = (
+        request.META.get("HTTP_AUTHORIZATION")
+        or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        or request.META.get("REMOTE_ADDR", "")
+    )
+    return f"replicas:pin:{hashlib.sha256(client.encode()).hexdigest()}"
+
+
+def pin_to_primary(request: HttpRequest) -> None:
+    cache.set(get_pin_cache_key(request), True, settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+def is_pinned_to_primary(request: HttpRequest) -> bool:
+    return cache.get(get_pin_cache_key(request), False)
+
+
+def choose_replica() -> str | None:
+    return (
+        random.choice(settings.DATABASE_REPLICAS)
+        if settings.DATABASE_REPLICAS
+        else None
+    )
+
+
+class ReplicaRouter:
+    """
+    Reads from ``replica_alias`` when it is set, everything else uses the primary.
+
+    Writes always go to the primary, even for instances loaded from a replica,
+    and so do reads inside a transaction, which must see its own writes.
+    """
+
+    def db_for_read(self, model, **hints) -> str:
+        alias = replica_alias.get()
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+
+        return alias
+
+    def db_for_write(self, model, **hints) -> str:
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool:
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints) -> bool:
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,32 @@
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db.models.functions import Greatest
+from rest_framework.filters import SearchFilter
+
+
+class TrigramSearchFilter(SearchFilter):
+    """
+    ``SearchFilter`` ranking matches by their trigram similarity to the search.
+
+    Matching is left to ``SearchFilter``, indexed by ``common.models.trigram_index``;
+    the most similar ``search_fields`` value of a row ranks it, ties keep the
+    view's ordering.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        queryset = super().filter_queryset(request, queryset, view)
+        search_fields = self.get_search_fields(view, request)
+        search = " ".join(self.get_search_terms(request))
+        if not search_fields or not search:
+            return queryset
+
+        similarities = [
+            TrigramSimilarity(
+                field[1:] if field[0] in self.lookup_prefixes else field, search
+            )
+            for field in search_fields
+        ]
+        rank = Greatest(*similarities) if len(similarities) > 1 else similarities[0]
+
+        return queryset.alias(search_rank=rank).order_by(
+            "-search_rank", *queryset.query.order_by
+        )
@@ -0,0 +1,108 @@
+from collections.abc import Callable
+from collections.abc import Iterable
+from decimal import Decimal
+from typing import NamedTuple
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+
+class ValuesColumn(NamedTuple):
+    key: str
+    lookup: str | None
+    to_representation: Callable | None
+    # Plan of a nested serializer.
+    nested: tuple | None = None
+
+
+def get_fast_representation(field: serializers.Field) -> Callable:
+    """``field.to_representation``, with shortcuts for the most common fields."""
+    if type(field) in (serializers.CharField, serializers.IntegerField):
+        # Both just cast their value.
+        return str if isinstance(field, serializers.CharField) else int
+    if type(field) is serializers.UUIDField and field.uuid_format == "hex_verbose":
+        return str
+    if (
+        type(field) is serializers.DecimalField
+        and getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+        and not field.localize
+    ):
+        exponent = -field.decimal_places
+
+        def to_representation(value):
+            # Rows of a ``numeric`` or ``ScaledDecimalField`` column already have
+            # the field's scale, so quantizing would not change them.
+            if type(value) is Decimal and value.as_tuple().exponent == exponent:
+                return f"{value:f}"
+            return field.to_representation(value)
+
+        return to_representation
+
+    return field.to_representation
+
+
+def get_values_plan(serializer: serializers.Serializer, prefix: str = "") -> tuple:
+    """
+    Maps the readable fields of ``serializer`` to ``.values()`` lookups.
+
+    Only fields sourced from a model column, directly or through a nested
+    serializer of a non-null forward relation, are supported, anything else raises
+    ``ImproperlyConfigured``.
+    """
+    plan = []
+    for key, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if (
+            field.source == "*"
+            or "." in field.source
+            or (
+                isinstance(
+                    field,
+                    (serializers.SerializerMethodField, serializers.ListSerializer),
+                )
+            )
+        ):
+            raise ImproperlyConfigured(
+                f"{type(serializer).__name__}.{key} cannot be read with .values()."
+            )
+
+        lookup = f"{prefix}{field.source}"
+        if isinstance(field, serializers.Serializer):
+            plan.append(
+                ValuesColumn(key, None, None, get_values_plan(field, f"{lookup}__"))
+            )
+        else:
+            plan.append(ValuesColumn(key, lookup, get_fast_representation(field)))
+
+    return tuple(plan)
+
+
+def get_values_lookups(plan: tuple) -> list[str]:
+    lookups = []
+    for column in plan:
+        if column.nested is not None:
+            lookups += get_values_lookups(column.nested)
+        else:
+            lookups.append(column.lookup)
+
+    return lookups
+
+
+def _represent(plan: tuple, row: dict) -> dict:
+    data = {}
+    for key, lookup, to_representation, nested in plan:
+        if nested is not None:
+            data[key] = _represent(nested, row)
+        else:
+            # Same as ``Serializer.to_representation``, nulls are not converted.
+            value = row[lookup]
+            data[key] = None if value is None else to_representation(value)
+
+    return data
+
+
+def serialize_values(plan: tuple, rows: Iterable[dict]) -> list[dict]:
+    """What the planned serializer would output for ``.values()`` rows."""
+    return [_represent(plan, row) for row in rows]
@@ -0,0 +1,89 @@
+import ipaddress
+import secrets
+
+from asgiref.sync import sync_to_async
+from common.metrics import get_registry
+from django.conf import settings
+from django.http import HttpResponse
+from django.http import HttpResponseForbidden
+from django.views.decorators.http import require_safe
+from prometheus_client import CONTENT_TYPE_LATEST
+from prometheus_client import generate_latest
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    """
+    ``APIView`` whose handlers are coroutines.
+
+    Served through ``config.asgi`` a request waiting on Postgres or on a slow
+    client no longer occupies a worker. Authentication and permission checks
+    keep using the configured DRF classes, run in Django's database thread
+    as they may query users. Handlers return DRF ``Response`` objects as usual.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            else:
+                handler = self.http_method_not_allowed
+
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def http_method_not_allowed(self, request, *args, **kwargs):
+        return super().http_method_not_allowed(request, *args, **kwargs)
+
+    async def options(self, request, *args, **kwargs):
+        return super().options(request, *args, **kwargs)
+
+
+def is_metrics_scraper(request) -> bool:
+    """
+    Whether the request comes from ``METRICS_ALLOWED_NETWORKS`` and, when
+    ``METRICS_TOKEN`` is set, carries it as ``Authorization: Bearer <token>``.
+    """
+    try:
+        address = ipaddress.ip_address(request.META.get("REMOTE_ADDR", ""))
+    except ValueError:
+        return False
+
+    if not any(
+        address in ipaddress.ip_network(network)
+        for network in settings.METRICS_ALLOWED_NETWORKS
+    ):
+        return False
+
+    if not settings.METRICS_TOKEN:
+        return True
+
+    return secrets.compare_digest(
+        request.META.get("HTTP_AUTHORIZATION", "").encode(),
+        f"Bearer {settings.METRICS_TOKEN}".encode(),
+    )
+
+
+@require_safe
+def metrics(request):
+    """Exposes ``common.metrics`` in the Prometheus text format to scrapers."""
+    if not is_metrics_scraper(request):
+        return HttpResponseForbidden()
+
+    return HttpResponse(
+        generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST
+    )
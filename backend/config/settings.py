@@ -71,6 +71,7 @@ DJANGO_CORE_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 ]
 
 THIRD_PARTY_APPS = [
@@ -93,14 +94,17 @@ INSTALLED_APPS = DJANGO_CORE_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 CORS_ALLOWED_ORIGINS = env("CORS_ORIGIN_WHITELIST", default="").split(",")
 
 MIDDLEWARE = [
+    "common.middleware.MetricsMiddleware",
+    "common.middleware.QueryBudgetMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "common.middleware.StaticFilesMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "common.middleware.ReplicaRoutingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -156,24 +160,55 @@ if DEBUG:
 # https://docs.djangoproject.com/en/4.1/ref/settings/#databases
 
 DB_CONNECTION = json.loads(env("DB_CONNECTION"))
-DATABASES = {
-    "default": {
+# A JSON list of connections shaped like ``DB_CONNECTION``, one per replica.
+DB_REPLICA_CONNECTIONS = json.loads(env("DB_REPLICA_CONNECTIONS", default="[]"))
+
+
+def get_database(connection: dict) -> dict:
+    return {
         "ENGINE": "django.db.backends.postgresql",
-        "NAME": DB_CONNECTION["dbname"],
-        "USER": DB_CONNECTION["username"],
-        "PASSWORD": DB_CONNECTION["password"],
-        "HOST": DB_CONNECTION["host"],
-        "PORT": DB_CONNECTION["port"],
+        "NAME": connection["dbname"],
+        "USER": connection["username"],
+        "PASSWORD": connection["password"],
+        "HOST": connection["host"],
+        "PORT": connection["port"],
     }
-}
+
+
+DATABASES = {"default": get_database(DB_CONNECTION)}
+for index, replica in enumerate(DB_REPLICA_CONNECTIONS):
+    DATABASES[f"replica_{index}"] = {
+        **get_database(replica),
+        "TEST": {"MIRROR": "default"},
+    }
+
+# Cached users, device keys and replica pins are invalidated through this cache,
+# so it must be shared, e.g. ``redis://redis:6379/0``, when several processes
+# serve the API. ``common.checks`` reports process-local caches.
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+
+# Safe requests served by these modules read from a replica, unless the client
+# wrote within ``DATABASE_REPLICA_PIN_SECONDS``, see ``common.middleware``. Pins
+# live in the cache, replicas are only used once ``CACHE_URL`` is shared.
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_REPLICA_VIEW_MODULES = ("hydroponic.views", "users.views")
+DATABASE_REPLICA_PIN_SECONDS = env.int("DATABASE_REPLICA_PIN_SECONDS", default=10)
+DATABASE_ROUTERS = ["common.routers.ReplicaRouter"]
 
 REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
-    "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-    ),
+    "DEFAULT_AUTHENTICATION_CLASSES": ("users.authentication.CachedJWTAuthentication",),
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
     "DEFAULT_PAGINATION_CLASS": "common.pagination.CustomPageNumberPagination",
+    "DEFAULT_RENDERER_CLASSES": (
+        "common.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "common.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
 }
 
 SIMPLE_JWT = {
@@ -183,6 +218,53 @@ SIMPLE_JWT = {
     "BLACKLIST_AFTER_ROTATION": True,
     "UPDATE_LAST_LOGIN": False,
 }
+# Validated access tokens kept per process and seconds an authenticated user is
+# cached, see ``users.authentication.CachedJWTAuthentication``.
+JWT_TOKEN_CACHE_SIZE = env.int("JWT_TOKEN_CACHE_SIZE", default=10000)
+JWT_USER_CACHE_TTL = env.int("JWT_USER_CACHE_TTL", default=60)
+
+# Who may read ``/metrics``: clients of these networks, carrying
+# ``Authorization: Bearer <METRICS_TOKEN>`` when it is set.
+METRICS_ALLOWED_NETWORKS = env.list(
+    "METRICS_ALLOWED_NETWORKS", default=["127.0.0.1/32", "::1/128"]
+)
+METRICS_TOKEN = env("METRICS_TOKEN", default="")
+
+# What to do when a request runs more queries than the ``query_budgets`` of its
+# view: "off", "log" a warning or "raise" ``common.budgets.QueryBudgetExceeded``.
+QUERY_BUDGET_MODE = env("QUERY_BUDGET_MODE", default="log")
+
+# Hydroponic
+
+HYDROPONIC_BULK_MAX_MEASUREMENTS = env.int(
+    "HYDROPONIC_BULK_MAX_MEASUREMENTS", default=1000
+)
+HYDROPONIC_EXPORT_CHUNK_SIZE = env.int("HYDROPONIC_EXPORT_CHUNK_SIZE", default=2000)
+# Aggregations over longer time ranges are answered from rollup tables.
+HYDROPONIC_ROLLUP_MIN_RANGE = dt.timedelta(
+    days=env.int("HYDROPONIC_ROLLUP_MIN_RANGE_DAYS", default=7)
+)
+# Raw measurements older than this are replaced by hourly downsamples, unless a
+# system has its own ``HydroponicRetentionPolicy``. Unset keeps them forever.
+HYDROPONIC_RAW_RETENTION_DAYS = env.int("HYDROPONIC_RAW_RETENTION_DAYS", default=None)
+HYDROPONIC_RETENTION_BATCH_DAYS = env.int("HYDROPONIC_RETENTION_BATCH_DAYS", default=1)
+# Write-behind ingestion: created measurements are acknowledged once spooled and
+# copied into the database in batches by size or by time.
+HYDROPONIC_INGEST_BUFFER = env.bool("HYDROPONIC_INGEST_BUFFER", default=False)
+HYDROPONIC_INGEST_SPOOL_DIR = env(
+    "HYDROPONIC_INGEST_SPOOL_DIR", default=BASE_DIR / "spool"
+)
+HYDROPONIC_INGEST_FSYNC = env.bool("HYDROPONIC_INGEST_FSYNC", default=True)
+HYDROPONIC_INGEST_FLUSH_SIZE = env.int("HYDROPONIC_INGEST_FLUSH_SIZE", default=2**20)
+HYDROPONIC_INGEST_FLUSH_INTERVAL = env.float(
+    "HYDROPONIC_INGEST_FLUSH_INTERVAL", default=1.0
+)
+HYDROPONIC_INGEST_MAX_BUFFER = env.int("HYDROPONIC_INGEST_MAX_BUFFER", default=2**26)
+HYDROPONIC_DEVICE_KEY_CACHE_TTL = env.int(
+    "HYDROPONIC_DEVICE_KEY_CACHE_TTL", default=300
+)
+HYDROPONIC_IMPORT_BATCH_SIZE = env.int("HYDROPONIC_IMPORT_BATCH_SIZE", default=5000)
+HYDROPONIC_IMPORT_MAX_ERRORS = env.int("HYDROPONIC_IMPORT_MAX_ERRORS", default=1000)
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
@@ -13,6 +13,7 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from common.views import metrics
 from django.conf import settings
 from django.contrib import admin
 from django.urls import include
@@ -41,6 +42,7 @@ urlpatterns = [
     path("hydroponic/", include("hydroponic.urls")),
     path("auth/", include("config.auth_urls")),
     path("admin/", admin.site.urls),
+    path("metrics", metrics, name="metrics"),
 ]
 
 if settings.DEBUG:
@@ -1,4 +1,8 @@
+from contextlib import contextmanager
+
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 
 
@@ -13,3 +17,25 @@ pytest_plugins = [
 @pytest.fixture
 def api_client():
     return APIClient()
+
+
+@pytest.fixture
+def assert_query_budget():
+    """
+    ``with assert_query_budget(View, "list"):`` fails when the block runs more
+    queries than ``View.query_budgets`` allows for the action. Parametrize the
+    test over data sizes to check the budget holds as data grows.
+    """
+
+    @contextmanager
+    def check(view, action: str):
+        budget = view.query_budgets[action]
+        with CaptureQueriesContext(connection) as queries:
+            yield queries
+
+        assert len(queries) <= budget, (
+            f"{view.__name__}.{action} ran {len(queries)} queries, its budget is "
+            f"{budget}:\n" + "\n".join(query["sql"] for query in queries)
+        )
+
+    return check
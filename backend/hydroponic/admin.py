@@ -1,6 +1,11 @@
+from common.admin import AutocompleteListFilter
+from common.admin import LargeTableAdminMixin
 from django.contrib import admin
+from hydroponic.models import HydroponicDeviceKey
 from hydroponic.models import HydroponicMeasurement
+from hydroponic.models import HydroponicRetentionPolicy
 from hydroponic.models import HydroponicSystem
+from hydroponic.queries import mark_measurements_changed
 
 
 @admin.register(HydroponicSystem)
@@ -13,15 +18,17 @@ class HydroponicSystemAdmin(admin.ModelAdmin):
         "updated_at",
     )
     list_filter = ("user",)
+    # Each one backed by a trigram index, see ``trigram_index``.
     search_fields = (
         "user__email",
         "name",
+        "description",
     )
     readonly_fields = ("user",)
 
 
 @admin.register(HydroponicMeasurement)
-class HydroponicMeasurementAdmin(admin.ModelAdmin):
+class HydroponicMeasurementAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = (
         "id",
         "system",
@@ -31,7 +38,14 @@ class HydroponicMeasurementAdmin(admin.ModelAdmin):
         "created_at",
         "updated_at",
     )
-    list_filter = ("system", "system__user")
+    list_filter = (
+        ("system", AutocompleteListFilter),
+        ("system__user", AutocompleteListFilter),
+    )
+    list_select_related = ("system",)
+    # Both walk the ``(created_at, id)`` index instead of sorting the table.
+    date_hierarchy = "created_at"
+    ordering = ("-created_at", "-id")
     search_fields = (
         "system__name",
         "system__user__email",
@@ -41,3 +55,53 @@ class HydroponicMeasurementAdmin(admin.ModelAdmin):
         "water_temperature",
         "tds",
     )
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        mark_measurements_changed(HydroponicSystem.objects.filter(pk=obj.system_id))
+
+    def delete_queryset(self, request, queryset):
+        systems = HydroponicSystem.objects.filter(
+            pk__in=list(queryset.values_list("system_id", flat=True).distinct())
+        )
+        super().delete_queryset(request, queryset)
+        mark_measurements_changed(systems)
+
+
+@admin.register(HydroponicRetentionPolicy)
+class HydroponicRetentionPolicyAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "system",
+        "raw_retention_days",
+        "created_at",
+        "updated_at",
+    )
+    search_fields = (
+        "system__name",
+        "system__user__email",
+    )
+    raw_id_fields = ("system",)
+
+
+@admin.register(HydroponicDeviceKey)
+class HydroponicDeviceKeyAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "name",
+        "prefix",
+        "system",
+        "created_at",
+        "revoked_at",
+    )
+    search_fields = (
+        "name",
+        "prefix",
+        "system__name",
+        "system__user__email",
+    )
+    readonly_fields = ("system",)
+
+    def has_add_permission(self, request) -> bool:
+        # Keys are issued through the API, which shows the raw key once.
+        return False
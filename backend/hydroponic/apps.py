@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class HydroponicConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "hydroponic"
+
+    def ready(self):
+        from hydroponic import signals  # noqa: F401
@@ -0,0 +1,106 @@
+import secrets
+
+from common.checks import cache_is_shared
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import QuerySet
+from django.utils.crypto import salted_hmac
+from django.utils.translation import gettext_lazy as _
+from hydroponic.models import HydroponicDeviceKey
+from hydroponic.models import HydroponicSystem
+from rest_framework import HTTP_HEADER_ENCODING
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.authentication import get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+
+DEVICE_KEY_KEYWORD = "Device"
+DEVICE_KEY_PREFIX = "hyd_"
+
+
+def hash_device_key(raw_key: str) -> str:
+    # A keyed SHA-256 is enough for random keys and costs microseconds,
+    # unlike the password hashers made to slow down guessing.
+    return salted_hmac("hydroponic.device_key", raw_key, algorithm="sha256").hexdigest()
+
+
+def get_device_key_cache_key(digest: str) -> str:
+    return f"hydroponic:device_key:{digest}"
+
+
+def forget_device_keys(device_keys: QuerySet) -> None:
+    cache.delete_many(
+        [
+            get_device_key_cache_key(digest)
+            for digest in device_keys.values_list("digest", flat=True)
+        ]
+    )
+
+
+def create_device_key(
+    system: HydroponicSystem, name: str
+) -> tuple[HydroponicDeviceKey, str]:
+    """Creates a key for ``system``, the raw key is only ever returned here."""
+    raw_key = DEVICE_KEY_PREFIX + secrets.token_urlsafe(32)
+    device_key = HydroponicDeviceKey.objects.create(
+        system=system,
+        name=name,
+        prefix=raw_key[:12],
+        digest=hash_device_key(raw_key),
+    )
+
+    return device_key, raw_key
+
+
+class DeviceKeyAuthentication(BaseAuthentication):
+    """
+    Authenticates ``Authorization: Device <key>`` headers.
+
+    ``request.user`` is the system owner and ``request.auth`` the
+    ``HydroponicDeviceKey``, whose system is loaded along with it. Active keys
+    are cached for ``HYDROPONIC_DEVICE_KEY_CACHE_TTL`` seconds and forgotten
+    when they are saved, or their system changes owner or its user is
+    activated or deactivated, see ``hydroponic.signals``. Only a cache shared
+    by every process, see ``CACHE_URL``, forgets them everywhere, so keys are
+    looked up every time without one and revoking a key takes effect right away
+    either way.
+    """
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != DEVICE_KEY_KEYWORD.lower().encode():
+            return None
+
+        if len(auth) != 2:
+            raise AuthenticationFailed(_("Invalid device key header."))
+
+        try:
+            raw_key = auth[1].decode(HTTP_HEADER_ENCODING)
+        except UnicodeError:
+            raise AuthenticationFailed(_("Invalid device key."))
+
+        digest = hash_device_key(raw_key)
+        cache_key = get_device_key_cache_key(digest)
+        use_cache = cache_is_shared()
+        device_key = cache.get(cache_key) if use_cache else None
+        if device_key is None:
+            device_key = (
+                HydroponicDeviceKey.objects.filter(digest=digest, revoked_at=None)
+                .select_related("system__user")
+                .first()
+            )
+            if device_key is None:
+                raise AuthenticationFailed(_("Invalid device key."))
+
+            if use_cache:
+                cache.set(
+                    cache_key, device_key, settings.HYDROPONIC_DEVICE_KEY_CACHE_TTL
+                )
+
+        user = device_key.system.user
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive."))
+
+        return user, device_key
+
+    def authenticate_header(self, request) -> str:
+        return DEVICE_KEY_KEYWORD
@@ -0,0 +1,310 @@
+import datetime as dt
+import json
+import statistics
+import time
+from collections.abc import Callable
+from collections.abc import Iterator
+from contextlib import ExitStack
+from typing import NamedTuple
+from urllib.parse import quote
+
+from common.metrics import QueryRecorder
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connections
+from django.db import transaction
+from django.test import Client
+from django.urls import get_resolver
+from django.urls import resolve
+from django.urls import URLResolver
+from django.utils import timezone
+from hydroponic.authentication import create_device_key
+from hydroponic.models import HydroponicDeviceKey
+from hydroponic.models import HydroponicMeasurement
+from hydroponic.seeds import seed_measurements
+from rest_framework_simplejwt.tokens import RefreshToken
+from users.models import User
+
+BENCHMARK_URLCONFS = ("hydroponic.urls", "config.auth_urls")
+BENCHMARK_EMAIL = "benchmark-{size}-{{}}@hydroponic.local"
+BENCHMARK_PASSWORD = "hydroponic"
+IMPORT_ROWS = 100
+
+
+def _measurement(context: dict) -> dict:
+    return {
+        "system_id": context["system"],
+        "ph": "6.1",
+        "water_temperature": "21.5",
+        "tds": 640,
+    }
+
+
+def _import_file(context: dict) -> dict:
+    rows = "".join(
+        f"{context['system']},6.1,21.5,640,{context['now']}\n"
+        for _ in range(IMPORT_ROWS)
+    )
+    return {
+        "file": SimpleUploadedFile(
+            "measurements.csv",
+            f"system_id,ph,water_temperature,tds,created_at\n{rows}".encode(),
+        )
+    }
+
+
+class BenchmarkRoute(NamedTuple):
+    name: str
+    method: str
+    # Formatted with the context built by ``get_context``.
+    path: str
+    body: Callable[[dict], dict] | None = None
+    authenticated: bool = True
+    multipart: bool = False
+
+
+BENCHMARK_ROUTES = (
+    BenchmarkRoute("api-root", "GET", "/hydroponic/"),
+    BenchmarkRoute("systems-list", "GET", "/hydroponic/systems/"),
+    BenchmarkRoute("systems-list-search", "GET", "/hydroponic/systems/?search=system"),
+    BenchmarkRoute(
+        "systems-create",
+        "POST",
+        "/hydroponic/systems/",
+        lambda context: {"name": "Benchmark", "description": "Created"},
+    ),
+    BenchmarkRoute("systems-retrieve", "GET", "/hydroponic/systems/{system}/"),
+    BenchmarkRoute(
+        "systems-update",
+        "PUT",
+        "/hydroponic/systems/{system}/",
+        lambda context: {"name": "Benchmark", "description": "Updated"},
+    ),
+    BenchmarkRoute(
+        "systems-partial_update",
+        "PATCH",
+        "/hydroponic/systems/{system}/",
+        lambda context: {"description": "Patched"},
+    ),
+    BenchmarkRoute("systems-destroy", "DELETE", "/hydroponic/systems/{system}/"),
+    BenchmarkRoute("systems-dashboard", "GET", "/hydroponic/systems/dashboard/"),
+    BenchmarkRoute("measurements-list", "GET", "/hydroponic/measurements/"),
+    BenchmarkRoute(
+        "measurements-list-filtered",
+        "GET",
+        "/hydroponic/measurements/?system_id={system}&ph__gte=6&order_by=-created_at",
+    ),
+    BenchmarkRoute(
+        "measurements-create", "POST", "/hydroponic/measurements/", _measurement
+    ),
+    BenchmarkRoute(
+        "measurements-retrieve", "GET", "/hydroponic/measurements/{measurement}/"
+    ),
+    BenchmarkRoute(
+        "measurements-aggregate",
+        "GET",
+        "/hydroponic/measurements/aggregate/?bucket=hour&system_id={system}"
+        "&created_at__gte={day_ago}",
+    ),
+    BenchmarkRoute(
+        "measurements-aggregate-rollups",
+        "GET",
+        "/hydroponic/measurements/aggregate/?bucket=day&system_id={system}",
+    ),
+    BenchmarkRoute(
+        "measurements-bulk",
+        "POST",
+        "/hydroponic/measurements/bulk/",
+        lambda context: {"measurements": [_measurement(context)] * 100},
+    ),
+    BenchmarkRoute(
+        "measurements-export",
+        "GET",
+        "/hydroponic/measurements/export/?file_format=csv&system_id={system}"
+        "&created_at__gte={day_ago}",
+    ),
+    BenchmarkRoute(
+        "measurements-upload",
+        "POST",
+        "/hydroponic/measurements/import/",
+        _import_file,
+        multipart=True,
+    ),
+    BenchmarkRoute("device-keys-list", "GET", "/hydroponic/device-keys/"),
+    BenchmarkRoute(
+        "device-keys-create",
+        "POST",
+        "/hydroponic/device-keys/",
+        lambda context: {"system_id": context["system"], "name": "Benchmark"},
+    ),
+    BenchmarkRoute(
+        "device-keys-destroy", "DELETE", "/hydroponic/device-keys/{device_key}/"
+    ),
+    BenchmarkRoute(
+        "systems-async-detail", "GET", "/hydroponic/async/systems/{system}/"
+    ),
+    BenchmarkRoute("measurements-async", "GET", "/hydroponic/async/measurements/"),
+    BenchmarkRoute(
+        "measurements-async-create",
+        "POST",
+        "/hydroponic/async/measurements/",
+        _measurement,
+    ),
+    BenchmarkRoute(
+        "register",
+        "POST",
+        "/auth/users/register/",
+        lambda context: {"email": "benchmark@hydroponic.local", "password": "secret"},
+        authenticated=False,
+    ),
+    BenchmarkRoute("current-user", "GET", "/auth/users/current_user/"),
+    BenchmarkRoute(
+        "token-obtain-pair",
+        "POST",
+        "/auth/token/",
+        lambda context: {"email": context["email"], "password": BENCHMARK_PASSWORD},
+        authenticated=False,
+    ),
+    BenchmarkRoute(
+        "token-refresh",
+        "POST",
+        "/auth/token/refresh/",
+        lambda context: {"refresh": context["refresh"]},
+        authenticated=False,
+    ),
+)
+
+
+def _join_route(prefix: str, pattern) -> str:
+    # Same joining as ``ResolverMatch.route``.
+    return prefix + str(pattern).removeprefix("^")
+
+
+def _walk(patterns, prefix: str = "") -> Iterator[tuple[str, str]]:
+    for pattern in patterns:
+        route = _join_route(prefix, pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            yield from _walk(pattern.url_patterns, route)
+        elif "(?P<format>" not in route:
+            view = pattern.callback
+            actions = getattr(view, "actions", None)
+            if actions is None:
+                cls = getattr(view, "cls", getattr(view, "view_class", None))
+                actions = {
+                    method: method
+                    for method in cls.http_method_names
+                    if method not in ("head", "options") and hasattr(cls, method)
+                }
+            for method in actions:
+                # DRF adds ``head`` to viewset actions once they served a request.
+                if method != "head":
+                    yield route, method.upper()
+
+
+def list_routes() -> set[tuple[str, str]]:
+    """Routes and methods served by ``BENCHMARK_URLCONFS``."""
+    routes = set()
+    for pattern in get_resolver().url_patterns:
+        urlconf = getattr(pattern, "urlconf_name", None)
+        if getattr(urlconf, "__name__", urlconf) in BENCHMARK_URLCONFS:
+            routes.update(_walk(pattern.url_patterns, _join_route("", pattern.pattern)))
+
+    return routes
+
+
+def get_route(route: BenchmarkRoute, context: dict) -> tuple[str, str]:
+    path = route.path.format(**context).partition("?")[0]
+    return resolve(path).route, route.method
+
+
+def get_context(size: int, systems: int, seed: int | None = None) -> dict:
+    """
+    Data of the benchmark user for ``size`` measurements per system, seeded on
+    first use and reused by later runs so results stay comparable.
+    """
+    email = BENCHMARK_EMAIL.format(size=size).format(0)
+    user = User.objects.filter(email=email).first()
+    if user is None:
+        [user] = seed_measurements(
+            1,
+            systems,
+            size,
+            email=BENCHMARK_EMAIL.format(size=size),
+            password=BENCHMARK_PASSWORD,
+            seed=seed,
+        )
+
+    system = user.hydroponic_systems.order_by("id").first()
+    device_key = HydroponicDeviceKey.objects.filter(system=system).first()
+    if device_key is None:
+        device_key, _raw_key = create_device_key(system, "Benchmark")
+
+    refresh = RefreshToken.for_user(user)
+    now = timezone.now()
+    return {
+        "email": email,
+        "system": str(system.id),
+        "measurement": str(
+            HydroponicMeasurement.objects.filter(system=system)
+            .order_by("-created_at")
+            .values_list("id", flat=True)
+            .first()
+        ),
+        "device_key": str(device_key.id),
+        "access": str(refresh.access_token),
+        "refresh": str(refresh),
+        "now": now.isoformat(),
+        "day_ago": quote((now - dt.timedelta(days=1)).isoformat()),
+    }
+
+
+def request(client: Client, route: BenchmarkRoute, context: dict) -> tuple:
+    """Serves ``route`` once, returns its status, duration and query count."""
+    headers = {}
+    if route.authenticated:
+        headers["HTTP_AUTHORIZATION"] = f"Bearer {context['access']}"
+    path = route.path.format(**context)
+
+    queries = QueryRecorder()
+    # Rolled back, so writes do not change the data later requests see.
+    with transaction.atomic(), ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(queries))
+
+        started = time.perf_counter()
+        if route.multipart:
+            response = client.post(path, route.body(context), **headers)
+        else:
+            response = client.generic(
+                route.method,
+                path,
+                json.dumps(route.body(context)) if route.body else "",
+                content_type="application/json",
+                **headers,
+            )
+        if response.streaming:
+            b"".join(response.streaming_content)
+        duration = time.perf_counter() - started
+
+        transaction.set_rollback(True)
+
+    return response.status_code, duration, queries.count
+
+
+def benchmark_route(
+    client: Client, route: BenchmarkRoute, context: dict, repeat: int, warmup: int
+) -> dict:
+    for _ in range(warmup):
+        request(client, route, context)
+
+    results = [request(client, route, context) for _ in range(repeat)]
+    durations = [duration * 1000 for _status, duration, _queries in results]
+    quantiles = statistics.quantiles(durations, n=100) if repeat > 1 else durations * 99
+
+    return {
+        "route": route.name,
+        "method": route.method,
+        "status": sorted({status for status, _duration, _queries in results}),
+        "p50_ms": round(quantiles[49], 3),
+        "p99_ms": round(quantiles[98], 3),
+        "queries": max(queries for _status, _duration, queries in results),
+    }
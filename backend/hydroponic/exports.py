@@ -0,0 +1,60 @@
+import csv
+import json
+from collections.abc import Iterator
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+
+from django.conf import settings
+from django.db.models import QuerySet
+
+EXPORT_COLUMNS = ("id", "system_id", "ph", "water_temperature", "tds", "created_at")
+EXPORT_CONTENT_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class _Echo:
+    """File-like object handing rows written by ``csv.writer`` straight back."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _format(value):
+    if isinstance(value, datetime):
+        # Same shape as DRF's DateTimeField output.
+        value = value.isoformat()
+        return value[:-6] + "Z" if value.endswith("+00:00") else value
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+
+    return value
+
+
+def _rows(queryset: QuerySet) -> Iterator[list]:
+    # ``iterator`` streams through a server-side cursor, chunk by chunk.
+    rows = queryset.values_list(*EXPORT_COLUMNS).iterator(
+        chunk_size=settings.HYDROPONIC_EXPORT_CHUNK_SIZE
+    )
+    for row in rows:
+        yield [_format(value) for value in row]
+
+
+def stream_csv(queryset: QuerySet) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in _rows(queryset):
+        yield writer.writerow(row)
+
+
+def stream_ndjson(queryset: QuerySet) -> Iterator[str]:
+    for row in _rows(queryset):
+        yield json.dumps(dict(zip(EXPORT_COLUMNS, row))) + "\n"
+
+
+EXPORT_STREAMS = {
+    "csv": stream_csv,
+    "ndjson": stream_ndjson,
+}
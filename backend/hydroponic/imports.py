@@ -0,0 +1,185 @@
+import csv
+import datetime as dt
+import io
+from collections.abc import Iterable
+from collections.abc import Iterator
+from itertools import islice
+from uuid import UUID
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from hydroponic.ingest import copy_measurements
+from hydroponic.ingest import encode_measurement
+from hydroponic.models import HydroponicMeasurement
+from hydroponic.models import HydroponicSystem
+from hydroponic.queries import MEASUREMENT_METRICS
+from rest_framework.exceptions import ValidationError
+from users.models import User
+
+# Same layout as ``EXPORT_COLUMNS``, the ``id`` column is ignored.
+IMPORT_COLUMNS = MEASUREMENT_METRICS + ("created_at",)
+IMPORT_ERROR_MESSAGES = {
+    "missing_columns": _("Missing columns: {columns}."),
+    "missing_system": _("A system_id column or parameter is required."),
+    "required": _("This field is required."),
+    "invalid_system": _("Hydroponic system not found."),
+    "downsampled": _("Measurements before {date} were already downsampled."),
+}
+
+
+def _batches(reader: csv.DictReader, size: int) -> Iterator[list[tuple[int, dict]]]:
+    rows = ((reader.line_num, row) for row in reader)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def _clean_column(
+    name: str, batch: list[tuple[int, dict]], errors: dict[int, dict]
+) -> list:
+    """
+    Runs one model field's parsing and validators over a column of a batch.
+
+    Empty or missing cells are reported as required, ``field.clean`` would let
+    them through as ``None`` for ``created_at`` as it isn't editable.
+    """
+    field = HydroponicMeasurement._meta.get_field(name)
+    values = []
+    for line, row in batch:
+        value = row.get(name)
+        if value is None or not value.strip():
+            errors.setdefault(line, {})[name] = [IMPORT_ERROR_MESSAGES["required"]]
+            values.append(None)
+            continue
+
+        try:
+            value = field.clean(value, None)
+        except DjangoValidationError as error:
+            errors.setdefault(line, {})[name] = error.messages
+            value = None
+        else:
+            if isinstance(value, dt.datetime) and timezone.is_naive(value):
+                value = timezone.make_aware(value, dt.timezone.utc)
+
+        values.append(value)
+
+    return values
+
+
+class MeasurementImport:
+    """
+    Loads CSV measurements in batches of ``HYDROPONIC_IMPORT_BATCH_SIZE`` rows.
+
+    ``lines`` is consumed lazily and every valid batch is committed with
+    ``COPY`` on its own, so files of any size run in constant memory. Systems
+    are looked up once per distinct id, restricted to ``user`` when given.
+    Invalid lines are skipped and reported by line number, the first
+    ``HYDROPONIC_IMPORT_MAX_ERRORS`` of them in full.
+    """
+
+    def __init__(
+        self, user: User | None = None, system: HydroponicSystem | None = None
+    ):
+        self.user = user
+        self.system = system
+        self.systems: dict[UUID, HydroponicSystem | None] = {}
+        self.imported = 0
+        self.error_count = 0
+        self.errors: list[dict] = []
+
+    def run(self, lines: Iterable[str]) -> dict:
+        reader = csv.DictReader(lines)
+        columns = set(reader.fieldnames or ())
+        missing = [column for column in IMPORT_COLUMNS if column not in columns]
+        if missing:
+            raise ValidationError(
+                {
+                    "file": [
+                        IMPORT_ERROR_MESSAGES["missing_columns"].format(
+                            columns=", ".join(missing)
+                        )
+                    ]
+                }
+            )
+        if self.system is None and "system_id" not in columns:
+            raise ValidationError({"file": [IMPORT_ERROR_MESSAGES["missing_system"]]})
+
+        for batch in _batches(reader, settings.HYDROPONIC_IMPORT_BATCH_SIZE):
+            self.import_batch(batch)
+
+        return {
+            "imported": self.imported,
+            "error_count": self.error_count,
+            "errors": self.errors,
+        }
+
+    def get_systems(self, batch: list[tuple[int, dict]]) -> list:
+        if self.system is not None:
+            return [self.system] * len(batch)
+
+        system_ids = []
+        for _line, row in batch:
+            try:
+                system_ids.append(UUID(row.get("system_id") or ""))
+            except ValueError:
+                system_ids.append(None)
+
+        unknown = {
+            system_id
+            for system_id in system_ids
+            if system_id is not None and system_id not in self.systems
+        }
+        if unknown:
+            queryset = HydroponicSystem.objects.all()
+            if self.user is not None:
+                queryset = queryset.filter(user=self.user)
+            found = queryset.in_bulk(unknown)
+            for system_id in unknown:
+                self.systems[system_id] = found.get(system_id)
+
+        return [self.systems.get(system_id) for system_id in system_ids]
+
+    def import_batch(self, batch: list[tuple[int, dict]]) -> None:
+        errors: dict[int, dict] = {}
+        columns = {name: _clean_column(name, batch, errors) for name in IMPORT_COLUMNS}
+        systems = self.get_systems(batch)
+
+        lines = io.StringIO()
+        for index, (line, _row) in enumerate(batch):
+            system = systems[index]
+            if system is None:
+                errors.setdefault(line, {})["system_id"] = [
+                    IMPORT_ERROR_MESSAGES["invalid_system"]
+                ]
+                continue
+            if line in errors:
+                continue
+
+            created_at = columns["created_at"][index]
+            if system.downsampled_before and created_at < system.downsampled_before:
+                errors[line] = {
+                    "created_at": [
+                        IMPORT_ERROR_MESSAGES["downsampled"].format(
+                            date=system.downsampled_before.isoformat()
+                        )
+                    ]
+                }
+                continue
+
+            measurement = HydroponicMeasurement(
+                system=system,
+                **{metric: columns[metric][index] for metric in MEASUREMENT_METRICS},
+            )
+            measurement.created_at = measurement.updated_at = created_at
+            lines.write(encode_measurement(measurement))
+
+        if lines.tell():
+            lines.seek(0)
+            self.imported += len(copy_measurements(lines))
+
+        self.error_count += len(errors)
+        room = settings.HYDROPONIC_IMPORT_MAX_ERRORS - len(self.errors)
+        self.errors += [
+            {"line": line, "errors": errors[line]} for line in sorted(errors)[:room]
+        ]
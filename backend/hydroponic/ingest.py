@@ -0,0 +1,223 @@
+import csv
+import fcntl
+import io
+import logging
+import math
+import os
+import time
+from collections.abc import Iterable
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO
+
+from django.conf import settings
+from django.db import connection
+from django.db import transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from hydroponic.models import HydroponicMeasurement
+from hydroponic.models import HydroponicSystem
+from hydroponic.queries import mark_measurements_changed
+from hydroponic.rollups import record_measurements
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+logger = logging.getLogger(__name__)
+
+COPY_FIELDS = (
+    "id",
+    "created_at",
+    "updated_at",
+    "system",
+    "ph",
+    "water_temperature",
+    "tds",
+    "readings",
+)
+
+
+class IngestBufferFull(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _("Too many measurements waiting to be stored, retry later.")
+    default_code = "ingest_buffer_full"
+
+    def __init__(self, detail=None, code=None):
+        super().__init__(detail, code)
+        # Sent as ``Retry-After`` by DRF's exception handler.
+        self.wait = math.ceil(settings.HYDROPONIC_INGEST_FLUSH_INTERVAL)
+
+
+def encode_measurement(measurement: HydroponicMeasurement) -> str:
+    """One ``COPY ... (FORMAT csv)`` line with the column values of a measurement."""
+    line = io.StringIO()
+    csv.writer(line, lineterminator="\n").writerow(
+        field.get_db_prep_save(getattr(measurement, field.attname), connection)
+        for field in map(HydroponicMeasurement._meta.get_field, COPY_FIELDS)
+    )
+    return line.getvalue()
+
+
+def copy_measurements(lines: IO[str]) -> list[HydroponicMeasurement]:
+    """
+    Inserts ``encode_measurement`` lines with ``COPY`` and updates the rollups.
+
+    Rows are copied into a temporary table first and moved over with
+    ``ON CONFLICT DO NOTHING``, so replaying a batch that was already stored
+    skips its rows instead of failing or counting them twice. Rows of systems
+    deleted since they were encoded are dropped. Returns the measurements
+    actually inserted.
+    """
+    quote_name = connection.ops.quote_name
+    table = quote_name(HydroponicMeasurement._meta.db_table)
+    system_table = quote_name(HydroponicSystem._meta.db_table)
+    system_key = quote_name(HydroponicSystem._meta.pk.column)
+    system_column = quote_name(HydroponicMeasurement._meta.get_field("system").column)
+    columns = ", ".join(
+        quote_name(HydroponicMeasurement._meta.get_field(name).column)
+        for name in COPY_FIELDS
+    )
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"CREATE TEMPORARY TABLE measurement_copy (LIKE {table})")
+        cursor.copy_expert(
+            f"COPY measurement_copy ({columns}) FROM STDIN WITH (FORMAT csv)", lines
+        )
+        measurements = list(
+            HydroponicMeasurement.objects.raw(
+                f"INSERT INTO {table} ({columns}) "
+                f"SELECT {columns} FROM measurement_copy WHERE EXISTS ("
+                f"SELECT 1 FROM {system_table} "
+                f"WHERE {system_table}.{system_key} = measurement_copy.{system_column}"
+                f") ON CONFLICT DO NOTHING RETURNING *"
+            )
+        )
+        cursor.execute("DROP TABLE measurement_copy")
+        record_measurements(measurements)
+        if measurements:
+            # Imported and spooled rows may be older than ones already listed.
+            mark_measurements_changed(
+                HydroponicSystem.objects.filter(
+                    pk__in={measurement.system_id for measurement in measurements}
+                )
+            )
+
+    return measurements
+
+
+class MeasurementSpool:
+    """
+    Append-only file where measurements wait to be copied into the database.
+
+    Appends are ``fsync``-ed before the client gets its answer, so acknowledged
+    readings survive a crash of the process. Once the file passes
+    ``HYDROPONIC_INGEST_FLUSH_SIZE`` bytes it is renamed to a batch and copied in
+    by the request that filled it; ``manage.py flush_measurement_buffer --loop``
+    flushes it every ``HYDROPONIC_INGEST_FLUSH_INTERVAL`` seconds too. Appends
+    are refused with ``IngestBufferFull`` past ``HYDROPONIC_INGEST_MAX_BUFFER``
+    bytes waiting. Every process of a host shares the spool through ``flock``.
+    Batches that fail to copy are renamed to ``*.failed`` and left for an
+    operator, so they don't hold back the ones after them.
+    """
+
+    active_name = "measurements.spool"
+    batch_pattern = "measurements.*.batch"
+    failed_suffix = ".failed"
+
+    def __init__(self, directory: str | Path | None = None):
+        self.directory = Path(directory or settings.HYDROPONIC_INGEST_SPOOL_DIR)
+
+    @contextmanager
+    def _lock(self, name: str, blocking: bool = True) -> Iterator[bool]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / name, "w") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                yield False
+                return
+
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    @property
+    def active_path(self) -> Path:
+        return self.directory / self.active_name
+
+    def batches(self) -> list[Path]:
+        return sorted(self.directory.glob(self.batch_pattern))
+
+    def size(self) -> int:
+        """Bytes of measurements waiting to be flushed."""
+        size = 0
+        for path in self.batches() + [self.active_path]:
+            try:
+                size += path.stat().st_size
+            except FileNotFoundError:
+                # Not created yet, or flushed since it was listed.
+                pass
+        return size
+
+    def append(self, measurements: Iterable[HydroponicMeasurement]) -> None:
+        payload = "".join(map(encode_measurement, measurements)).encode()
+        with self._lock("append.lock"):
+            if self.size() + len(payload) > settings.HYDROPONIC_INGEST_MAX_BUFFER:
+                raise IngestBufferFull
+
+            fd = os.open(self.active_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT)
+            try:
+                os.write(fd, payload)
+                if settings.HYDROPONIC_INGEST_FSYNC:
+                    os.fsync(fd)
+                active_size = os.fstat(fd).st_size
+            finally:
+                os.close(fd)
+
+        if active_size >= settings.HYDROPONIC_INGEST_FLUSH_SIZE:
+            # Whoever is flushing already will pick this file up as well. The
+            # readings are spooled already, so a failing flush must not fail
+            # the request and make the client send them again.
+            try:
+                self.flush(blocking=False)
+            except Exception:
+                logger.exception("Flushing the measurement spool failed.")
+
+    def rotate(self) -> None:
+        """Turns the active file into a batch, new appends start a fresh one."""
+        with self._lock("append.lock"):
+            if self.active_path.exists() and self.active_path.stat().st_size:
+                self.active_path.rename(
+                    self.directory / f"measurements.{time.time_ns()}.batch"
+                )
+
+    def flush(self, blocking: bool = True) -> int:
+        """Copies every waiting measurement in and returns how many were new."""
+        with self._lock("flush.lock", blocking=blocking) as locked:
+            if not locked:
+                return 0
+
+            self.rotate()
+            flushed = 0
+            for batch in self.batches():
+                try:
+                    with batch.open(newline="") as lines:
+                        flushed += len(copy_measurements(lines))
+                except Exception:
+                    logger.exception("Copying %s failed, quarantining it.", batch)
+                    batch.rename(batch.with_name(batch.name + self.failed_suffix))
+                    continue
+                # A crash before this point replays the batch, which is harmless.
+                batch.unlink()
+
+        return flushed
+
+
+def buffer_measurements(measurements: list[HydroponicMeasurement]) -> None:
+    """Stamps unsaved measurements as received now and spools them."""
+    now = timezone.now()
+    for measurement in measurements:
+        measurement.created_at = measurement.updated_at = now
+
+    MeasurementSpool().append(measurements)
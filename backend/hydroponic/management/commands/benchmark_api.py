@@ -0,0 +1,100 @@
+import json
+import subprocess
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.test import Client
+from django.test.utils import setup_test_environment
+from django.test.utils import teardown_test_environment
+from django.utils import timezone
+from hydroponic.benchmarks import benchmark_route
+from hydroponic.benchmarks import BENCHMARK_ROUTES
+from hydroponic.benchmarks import get_context
+from hydroponic.benchmarks import get_route
+from hydroponic.benchmarks import list_routes
+
+
+def _get_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, check=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures p50/p99 latency and queries per request of every API route at "
+        "several data sizes, in process, and writes the results as JSON. Seeds "
+        "its own users on first run, so point it at a scratch database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=lambda value: [int(size) for size in value.split(",")],
+            default=[1000, 100_000],
+            help="Comma separated numbers of measurements per system.",
+        )
+        parser.add_argument("--systems", type=int, default=5)
+        parser.add_argument("--repeat", type=int, default=50)
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument(
+            "--route", action="append", help="Only benchmark routes with this name."
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", type=Path, default=Path("benchmark.json"))
+
+    def handle(self, *args, sizes: list[int], route: list[str] | None, **options):
+        routes = [item for item in BENCHMARK_ROUTES if not route or item.name in route]
+        if not routes:
+            raise CommandError(f"Unknown routes: {', '.join(route)}")
+
+        if settings.DEBUG:
+            self.stderr.write(
+                self.style.WARNING("DEBUG is on, timings include the debug toolbar.")
+            )
+
+        # Allows the ``testserver`` host of the test client.
+        setup_test_environment()
+        client = Client()
+        results = []
+        try:
+            for size in sizes:
+                context = get_context(size, options["systems"], options["seed"])
+                missing = list_routes() - {get_route(item, context) for item in routes}
+                if missing and not route:
+                    raise CommandError(
+                        "Routes without a benchmark: "
+                        + ", ".join(f"{method} {path}" for path, method in missing)
+                    )
+
+                for item in routes:
+                    result = benchmark_route(
+                        client, item, context, options["repeat"], options["warmup"]
+                    )
+                    results.append({"size": size, **result})
+                    self.stdout.write(
+                        f"{size:>9} {item.method:<6} {item.name:<32} "
+                        f"p50={result['p50_ms']:.1f}ms p99={result['p99_ms']:.1f}ms "
+                        f"queries={result['queries']} status={result['status']}"
+                    )
+        finally:
+            teardown_test_environment()
+
+        options["output"].write_text(
+            json.dumps(
+                {
+                    "commit": _get_commit(),
+                    "created_at": timezone.now().isoformat(),
+                    "systems": options["systems"],
+                    "repeat": options["repeat"],
+                    "results": results,
+                },
+                indent=2,
+            )
+        )
+        self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
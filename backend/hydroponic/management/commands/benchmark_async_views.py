@@ -0,0 +1,130 @@
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+from users.models import User
+
+BENCHMARK_PATHS = {
+    "sync": "/hydroponic/measurements/",
+    "async": "/hydroponic/async/measurements/",
+}
+
+
+async def _request(
+    host: str, port: int, path: str, token: str, client_delay: float
+) -> tuple[int, float]:
+    started = time.perf_counter()
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(
+        f"GET {path} HTTP/1.1\r\nHost: {host}\r\n"
+        f"Authorization: Bearer {token}\r\nConnection: close\r\n".encode()
+    )
+    if client_delay:
+        # A slow sensor: headers trickle in while the connection stays open.
+        await writer.drain()
+        await asyncio.sleep(client_delay)
+
+    writer.write(b"\r\n")
+    await writer.drain()
+    status_line = await reader.readline()
+    await reader.read()
+    writer.close()
+    await writer.wait_closed()
+
+    return int(status_line.split()[1]), time.perf_counter() - started
+
+
+async def _benchmark(
+    host: str,
+    port: int,
+    path: str,
+    token: str,
+    requests: int,
+    concurrency: int,
+    client_delay: float,
+) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one():
+        async with semaphore:
+            return await _request(host, port, path, token, client_delay)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(run_one() for _ in range(requests)), return_exceptions=True
+    )
+    elapsed = time.perf_counter() - started
+
+    latencies = [
+        latency
+        for result in results
+        if not isinstance(result, BaseException)
+        for status, latency in [result]
+        if status == 200
+    ]
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else []
+
+    return {
+        "ok": len(latencies),
+        "errors": requests - len(latencies),
+        "throughput": len(latencies) / elapsed,
+        "p50": quantiles[49] if quantiles else None,
+        "p99": quantiles[98] if quantiles else None,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares sync and async measurement list throughput of a running server. "
+        "Serve the project through config.asgi to measure the async views."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://localhost:8000")
+        parser.add_argument(
+            "--email", required=True, help="User whose measurements are listed."
+        )
+        parser.add_argument("--requests", type=int, default=1000)
+        parser.add_argument("--concurrency", type=int, default=100)
+        parser.add_argument(
+            "--client-delay",
+            type=float,
+            default=0,
+            help="Seconds every client waits before finishing its request.",
+        )
+
+    def handle(self, *args, url: str, email: str, **options):
+        parts = urlsplit(url)
+        if parts.scheme != "http" or not parts.hostname:
+            raise CommandError("Only plain http:// URLs are supported.")
+
+        try:
+            user = User.objects.get(email=email)
+        except User.DoesNotExist:
+            raise CommandError(f"User {email} does not exist.")
+
+        token = str(AccessToken.for_user(user))
+        for name, path in BENCHMARK_PATHS.items():
+            result = asyncio.run(
+                _benchmark(
+                    parts.hostname,
+                    parts.port or 80,
+                    path,
+                    token,
+                    options["requests"],
+                    options["concurrency"],
+                    options["client_delay"],
+                )
+            )
+            latency = " ".join(
+                f"{key}={result[key] * 1000:.1f}ms" if result[key] is not None else ""
+                for key in ("p50", "p99")
+            )
+            self.stdout.write(
+                f"{name:>5}: {result['throughput']:.1f} req/s, {latency} "
+                f"({result['ok']} ok, {result['errors']} failed)"
+            )
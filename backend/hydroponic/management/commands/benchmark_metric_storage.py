@@ -0,0 +1,125 @@
+import statistics
+import time
+
+from common.fields import ScaledDecimalField
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db import transaction
+from hydroponic.models import HydroponicMeasurement
+from hydroponic.queries import MEASUREMENT_METRICS
+from users.models import User
+
+
+def _layouts() -> dict[str, list[str]]:
+    """Select list copying the measurements as stored and with ``numeric`` metrics."""
+    quote_name = connection.ops.quote_name
+    layouts = {"numeric": [], "scaled": []}
+    for field in HydroponicMeasurement._meta.concrete_fields:
+        column = quote_name(field.column)
+        layouts["scaled"].append(column)
+        if isinstance(field, ScaledDecimalField):
+            column = (
+                f"({column} / {field.scale}.0)::numeric"
+                f"({field.max_digits}, {field.decimal_places}) AS {column}"
+            )
+        layouts["numeric"].append(column)
+
+    return layouts
+
+
+def _aggregate_sql(table: str, scaled: bool) -> str:
+    quote_name = connection.ops.quote_name
+    aggregates = []
+    for metric in MEASUREMENT_METRICS:
+        field = HydroponicMeasurement._meta.get_field(metric)
+        for function in ("SUM", "MIN", "MAX"):
+            aggregate = f"{function}({quote_name(metric)})"
+            if scaled and isinstance(field, ScaledDecimalField):
+                # Only the aggregated values are scaled back, once per bucket.
+                aggregate = f"{aggregate}::numeric / {field.scale}"
+            aggregates.append(aggregate)
+
+    return (
+        f"SELECT date_trunc('hour', created_at), {', '.join(aggregates)} "
+        f"FROM {table} GROUP BY 1 ORDER BY 1"
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the size and hourly aggregation time of a user's measurements "
+        "stored with scaled integer metrics and with numeric ones. Both layouts "
+        "are copied into temporary tables, which are dropped afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--email", required=True, help="User whose measurements are copied."
+        )
+        parser.add_argument("--repeat", type=int, default=10)
+
+    def handle(self, *args, email: str, repeat: int, **options):
+        try:
+            user = User.objects.get(email=email)
+        except User.DoesNotExist:
+            raise CommandError(f"User {email} does not exist.")
+
+        system_ids = list(user.hydroponic_systems.values_list("id", flat=True))
+        table = connection.ops.quote_name(HydroponicMeasurement._meta.db_table)
+        metric_columns = [
+            field.column
+            for field in HydroponicMeasurement._meta.concrete_fields
+            if isinstance(field, ScaledDecimalField)
+        ]
+
+        results = {}
+        with transaction.atomic(), connection.cursor() as cursor:
+            for name, columns in _layouts().items():
+                copy = f"measurement_{name}"
+                cursor.execute(
+                    f"CREATE TEMPORARY TABLE {copy} AS SELECT {', '.join(columns)} "
+                    f"FROM {table} WHERE system_id = ANY(%s::uuid[])",
+                    [system_ids],
+                )
+                cursor.execute(f"ANALYZE {copy}")
+                cursor.execute(
+                    f"SELECT COUNT(*), pg_relation_size(%s), "
+                    f"AVG({' + '.join(f'pg_column_size({c})' for c in metric_columns)}) "
+                    f"FROM {copy}",
+                    [copy],
+                )
+                rows, size, metric_size = cursor.fetchone()
+                if not rows:
+                    raise CommandError(f"User {email} has no measurements.")
+
+                durations = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    cursor.execute(_aggregate_sql(copy, name == "scaled"))
+                    buckets = cursor.fetchall()
+                    durations.append(time.perf_counter() - started)
+
+                results[name] = {
+                    "row_size": size / rows,
+                    "metric_size": metric_size,
+                    "duration": statistics.median(durations),
+                    "buckets": buckets,
+                }
+                self.stdout.write(
+                    f"{name:>7}: {rows} measurements, {size / 1024**2:.1f}MiB, "
+                    f"{size / rows:.1f} bytes per row of which {metric_size:.1f} "
+                    f"for {', '.join(metric_columns)}; hourly aggregates "
+                    f"{statistics.median(durations) * 1000:.1f}ms"
+                )
+
+            transaction.set_rollback(True)
+
+        numeric, scaled = results["numeric"], results["scaled"]
+        if numeric["buckets"] != scaled["buckets"]:
+            raise CommandError("Scaled metrics aggregate to different values.")
+
+        self.stdout.write(
+            f"scaled: {1 - scaled['row_size'] / numeric['row_size']:.0%} smaller, "
+            f"aggregates {numeric['duration'] / scaled['duration']:.1f}x faster"
+        )
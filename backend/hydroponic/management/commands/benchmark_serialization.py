@@ -0,0 +1,91 @@
+import statistics
+import time
+from collections.abc import Callable
+
+from common.renderers import ORJSONRenderer
+from common.serializers import get_values_lookups
+from common.serializers import get_values_plan
+from common.serializers import serialize_values
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from hydroponic.models import HydroponicMeasurement
+from hydroponic.serializers import HydroponicMeasurementSerializer
+from rest_framework.renderers import JSONRenderer
+from users.models import User
+
+
+def _measure(func: Callable, repeat: int) -> tuple[float, object]:
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        durations.append(time.perf_counter() - started)
+
+    return statistics.median(durations), result
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares building a page of measurements through "
+        "HydroponicMeasurementSerializer with the .values() path of list views, "
+        "then rendering pages with DRF's JSONRenderer and ORJSONRenderer."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--email", required=True, help="User whose measurements are listed."
+        )
+        parser.add_argument("--rows", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument(
+            "--page-sizes",
+            type=lambda value: [int(size) for size in value.split(",")],
+            default=[20, 100, 1000],
+        )
+
+    def handle(
+        self, *args, email: str, rows: int, repeat: int, page_sizes: list, **options
+    ):
+        try:
+            user = User.objects.get(email=email)
+        except User.DoesNotExist:
+            raise CommandError(f"User {email} does not exist.")
+
+        queryset = HydroponicMeasurement.objects.filter(system__user=user).order_by(
+            "-created_at", "-id"
+        )
+        serializer = HydroponicMeasurementSerializer()
+        plan = get_values_plan(serializer)
+        lookups = get_values_lookups(plan)
+
+        def serialize_instances():
+            measurements = queryset.select_related("system")[:rows]
+            return HydroponicMeasurementSerializer(measurements, many=True).data
+
+        def serialize_rows():
+            return serialize_values(plan, queryset.values(*lookups)[:rows])
+
+        renderer = JSONRenderer()
+        baseline, expected = _measure(serialize_instances, repeat)
+        fast, result = _measure(serialize_rows, repeat)
+        if renderer.render(result) != renderer.render(expected):
+            raise CommandError("The .values() path renders a different response.")
+
+        self.stdout.write(
+            f"{len(result)} measurements: serializer {baseline * 1000:.1f}ms, "
+            f".values() {fast * 1000:.1f}ms, {baseline / fast:.1f}x faster"
+        )
+
+        fast_renderer = ORJSONRenderer()
+        for page_size in page_sizes:
+            page = {"next": None, "previous": None, "results": result[:page_size]}
+            baseline, expected = _measure(lambda: renderer.render(page), repeat)
+            fast, rendered = _measure(lambda: fast_renderer.render(page), repeat)
+            if rendered != expected:
+                raise CommandError("ORJSONRenderer renders a different response.")
+
+            self.stdout.write(
+                f"{len(page['results'])} measurements rendered: JSONRenderer "
+                f"{baseline * 1000:.2f}ms, ORJSONRenderer {fast * 1000:.2f}ms, "
+                f"{baseline / fast:.1f}x faster"
+            )
@@ -0,0 +1,95 @@
+import datetime as dt
+import io
+import time
+from decimal import Decimal
+from uuid import uuid4
+
+from common.models import uuid7
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db import transaction
+from django.utils import timezone
+from hydroponic.ingest import COPY_FIELDS
+from hydroponic.ingest import encode_measurement
+from hydroponic.models import HydroponicMeasurement
+
+KEY_GENERATORS = {"uuid4": uuid4, "uuid7": uuid7}
+
+
+def _batch(size: int, key, start: dt.datetime) -> io.StringIO:
+    lines = io.StringIO()
+    system_id = uuid4()
+    for number in range(size):
+        measurement = HydroponicMeasurement(
+            id=key(),
+            system_id=system_id,
+            ph=Decimal("6.5"),
+            water_temperature=Decimal("21.0"),
+            tds=400,
+        )
+        measurement.created_at = measurement.updated_at = start + dt.timedelta(
+            milliseconds=number
+        )
+        lines.write(encode_measurement(measurement))
+
+    lines.seek(0)
+    return lines
+
+
+def _throughput(durations: list[tuple[int, float]]) -> float:
+    return sum(size for size, _ in durations) / sum(elapsed for _, elapsed in durations)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares ingesting measurements keyed by random uuid4 and time-ordered "
+        "uuid7 keys: COPY throughput and primary key index size. Rows go to "
+        "scratch tables shaped like the measurements table, dropped afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000)
+        parser.add_argument("--batch", type=int, default=10_000)
+
+    def handle(self, *args, rows: int, batch: int, **options):
+        quote_name = connection.ops.quote_name
+        table = quote_name(HydroponicMeasurement._meta.db_table)
+        columns = ", ".join(
+            quote_name(HydroponicMeasurement._meta.get_field(name).column)
+            for name in COPY_FIELDS
+        )
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            for name, key in KEY_GENERATORS.items():
+                scratch = f"benchmark_{name}_keys"
+                cursor.execute(
+                    f"CREATE TABLE {scratch} (LIKE {table} INCLUDING DEFAULTS, "
+                    f"PRIMARY KEY (id))"
+                )
+
+                start = timezone.now()
+                durations = []
+                for offset in range(0, rows, batch):
+                    size = min(batch, rows - offset)
+                    lines = _batch(size, key, start)
+                    started = time.perf_counter()
+                    cursor.copy_expert(
+                        f"COPY {scratch} ({columns}) FROM STDIN WITH (FORMAT csv)",
+                        lines,
+                    )
+                    durations.append((size, time.perf_counter() - started))
+                    start += dt.timedelta(milliseconds=batch)
+
+                cursor.execute("SELECT pg_relation_size(%s)", [f"{scratch}_pkey"])
+                (index_size,) = cursor.fetchone()
+                # The last batches go into the largest index, where random
+                # keys hurt the most.
+                tail = durations[-max(len(durations) // 10, 1) :]
+                self.stdout.write(
+                    f"{name}: {_throughput(durations):,.0f} rows/s overall, "
+                    f"{_throughput(tail):,.0f} rows/s for the last "
+                    f"{len(tail)} batches, primary key index "
+                    f"{index_size / 1024**2:.1f}MiB"
+                )
+
+            transaction.set_rollback(True)
@@ -0,0 +1,64 @@
+import datetime as dt
+from uuid import UUID
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from hydroponic.models import HydroponicSystem
+from hydroponic.retention import downsample_measurements
+from hydroponic.retention import get_retention_cutoff
+
+
+class Command(BaseCommand):
+    help = "Replaces raw measurements past their retention with hourly downsamples."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--system",
+            action="append",
+            dest="systems",
+            type=UUID,
+            help="Enforce only this system's policy, can be repeated.",
+        )
+        parser.add_argument(
+            "--batch-days",
+            type=int,
+            default=settings.HYDROPONIC_RETENTION_BATCH_DAYS,
+            help="Days of raw measurements downsampled per transaction.",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0,
+            help="Seconds to sleep between batches.",
+        )
+
+    def handle(
+        self,
+        *args,
+        systems: list[UUID] | None,
+        batch_days: int,
+        pause: float,
+        **options,
+    ):
+        queryset = HydroponicSystem.objects.select_related("retention_policy").order_by(
+            "id"
+        )
+        if systems:
+            queryset = queryset.filter(id__in=systems)
+
+        now = timezone.now()
+        for system in queryset.iterator():
+            cutoff = get_retention_cutoff(system, now=now)
+            if cutoff is None:
+                continue
+
+            removed, inserted = downsample_measurements(
+                system, cutoff, batch=dt.timedelta(days=batch_days), pause=pause
+            )
+            self.stdout.write(
+                f"System {system.id}: {removed} measurements before "
+                f"{cutoff.isoformat()} downsampled into {inserted}"
+            )
+
+        self.stdout.write(self.style.SUCCESS("Retention enforced."))
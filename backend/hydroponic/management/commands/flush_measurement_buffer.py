@@ -0,0 +1,27 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from hydroponic.ingest import MeasurementSpool
+
+
+class Command(BaseCommand):
+    help = "Copies spooled measurements into the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep flushing every HYDROPONIC_INGEST_FLUSH_INTERVAL seconds.",
+        )
+
+    def handle(self, *args, loop: bool, **options):
+        spool = MeasurementSpool()
+        while True:
+            flushed = spool.flush()
+            if flushed or not loop:
+                self.stdout.write(f"Flushed {flushed} measurements.")
+            if not loop:
+                break
+
+            time.sleep(settings.HYDROPONIC_INGEST_FLUSH_INTERVAL)
@@ -0,0 +1,59 @@
+import json
+import sys
+from uuid import UUID
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from hydroponic.imports import MeasurementImport
+from hydroponic.models import HydroponicSystem
+from rest_framework.exceptions import ValidationError
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = "Imports measurements from a CSV file laid out like the CSV export."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file, - reads standard input.")
+        parser.add_argument(
+            "--system",
+            type=UUID,
+            help="System of every row, for files without a system_id column.",
+        )
+        parser.add_argument(
+            "--user",
+            help="Email of the user whose systems rows may belong to.",
+        )
+
+    def handle(
+        self, *args, path: str, system: UUID | None, user: str | None, **options
+    ):
+        try:
+            owner = User.objects.get(email=user) if user else None
+            systems = HydroponicSystem.objects.all()
+            if owner is not None:
+                systems = systems.filter(user=owner)
+            target = systems.get(pk=system) if system else None
+        except User.DoesNotExist:
+            raise CommandError(f"User {user} does not exist.")
+        except HydroponicSystem.DoesNotExist:
+            raise CommandError(f"System {system} does not exist.")
+
+        importer = MeasurementImport(user=owner, system=target)
+        try:
+            if path == "-":
+                result = importer.run(sys.stdin)
+            else:
+                with open(path, encoding="utf-8-sig", newline="") as lines:
+                    result = importer.run(lines)
+        except ValidationError as error:
+            raise CommandError(json.dumps(error.detail))
+
+        for error in result["errors"]:
+            self.stderr.write(f"Line {error['line']}: {json.dumps(error['errors'])}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {result['imported']} measurements, "
+                f"{result['error_count']} lines rejected."
+            )
+        )
@@ -0,0 +1,75 @@
+import datetime as dt
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from hydroponic.partitions import create_partition
+from hydroponic.partitions import detach_partition
+from hydroponic.partitions import list_default_partition_months
+from hydroponic.partitions import list_partitions
+from hydroponic.partitions import month_start
+from hydroponic.partitions import next_month
+
+
+class Command(BaseCommand):
+    help = (
+        "Creates monthly measurement partitions ahead of time, and for past "
+        "months found in the default partition with --backfill, and detaches "
+        "partitions holding only data older than a given date."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=3,
+            help="Number of future months to create partitions for.",
+        )
+        parser.add_argument(
+            "--backfill",
+            action="store_true",
+            help=(
+                "Also create partitions for the months of rows in the default "
+                "partition, e.g. imported or late spooled measurements."
+            ),
+        )
+        parser.add_argument(
+            "--detach-before",
+            type=dt.date.fromisoformat,
+            help="Detach partitions of months ending on or before this date.",
+        )
+        parser.add_argument(
+            "--drop",
+            action="store_true",
+            help="Drop detached partitions instead of keeping them as tables.",
+        )
+
+    def handle(
+        self,
+        *args,
+        months_ahead: int,
+        backfill: bool,
+        detach_before,
+        drop: bool,
+        **options,
+    ):
+        months = []
+        if backfill:
+            months += list_default_partition_months()
+        month = month_start(timezone.now())
+        for _ in range(months_ahead + 1):
+            months.append(month)
+            month = next_month(month)
+
+        for month in months:
+            if create_partition(month):
+                self.stdout.write(f"Created partition for {month:%Y-%m}")
+
+        if detach_before is not None:
+            for name, month in sorted(list_partitions().items()):
+                if next_month(month).date() <= detach_before:
+                    detach_partition(name, drop=drop)
+                    self.stdout.write(
+                        f"{'Dropped' if drop else 'Detached'} partition {name}"
+                    )
+
+        self.stdout.write(self.style.SUCCESS("Measurement partitions are up to date."))
@@ -0,0 +1,51 @@
+import datetime as dt
+from argparse import ArgumentTypeError
+from uuid import UUID
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from hydroponic.models import HydroponicSystem
+from hydroponic.rollups import rebuild_rollups
+
+
+def aware_datetime(value: str) -> dt.datetime:
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ArgumentTypeError(f"Invalid datetime: {value}")
+
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, dt.timezone.utc)
+
+    return parsed
+
+
+class Command(BaseCommand):
+    help = "Backfills or rebuilds hourly and daily measurement rollups."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--system",
+            action="append",
+            dest="systems",
+            type=UUID,
+            help="Rebuild only this system, can be repeated. Defaults to all.",
+        )
+        parser.add_argument(
+            "--since",
+            type=aware_datetime,
+            help="Rebuild buckets starting at this day only.",
+        )
+
+    def handle(self, *args, systems: list[UUID] | None, since, **options):
+        if not systems:
+            systems = HydroponicSystem.objects.order_by("id").values_list(
+                "id", flat=True
+            )
+
+        # One short transaction per system keeps ingestion waits bounded.
+        for system_id in systems:
+            rebuild_rollups(system_id, since=since)
+            self.stdout.write(f"Rebuilt rollups of system {system_id}")
+
+        self.stdout.write(self.style.SUCCESS("Rollups rebuilt."))
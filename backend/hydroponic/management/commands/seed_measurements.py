@@ -0,0 +1,65 @@
+import datetime as dt
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from hydroponic.seeds import seed_measurements
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates users, hydroponic systems and their measurements in bulk, "
+        "for load tests and benchmarks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10)
+        parser.add_argument(
+            "--systems", type=int, default=5, help="Number of systems per user."
+        )
+        parser.add_argument(
+            "--measurements",
+            type=int,
+            default=100_000,
+            help="Number of measurements per system.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=60,
+            help="Seconds between two measurements of a system.",
+        )
+        parser.add_argument(
+            "--email",
+            default="seed-{}@hydroponic.local",
+            help="Email of the seeded users, formatted with their number.",
+        )
+        parser.add_argument("--password", default="hydroponic")
+        parser.add_argument(
+            "--seed", type=int, help="Makes the generated readings repeatable."
+        )
+
+    def handle(self, *args, email: str, **options):
+        emails = [email.format(number) for number in range(options["users"])]
+        existing = User.objects.filter(email__in=emails).values_list("email", flat=True)
+        if existing:
+            raise CommandError(f"Users already exist: {', '.join(sorted(existing))}")
+
+        started = time.perf_counter()
+        seed_measurements(
+            options["users"],
+            options["systems"],
+            options["measurements"],
+            interval=dt.timedelta(seconds=options["interval"]),
+            email=email,
+            password=options["password"],
+            seed=options["seed"],
+        )
+        total = options["users"] * options["systems"] * options["measurements"]
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {total} measurements in {time.perf_counter() - started:.1f}s."
+            )
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 4.1 on 2026-10-18 16:15
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("hydroponic", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="hydroponicmeasurement",
+            index=models.Index(
+                fields=["created_at", "id"], name="measurement_created_at_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,121 @@
+# Generated by Django 4.1 on 2026-10-18 16:17
+import django.db.models.deletion
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("hydroponic", "0002_measurement_created_at_id_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="HydroponicMeasurementHourlyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("bucket", models.DateTimeField()),
+                ("readings", models.PositiveIntegerField()),
+                ("sum_ph", models.DecimalField(decimal_places=1, max_digits=15)),
+                ("min_ph", models.DecimalField(decimal_places=1, max_digits=3)),
+                ("max_ph", models.DecimalField(decimal_places=1, max_digits=3)),
+                (
+                    "sum_water_temperature",
+                    models.DecimalField(decimal_places=1, max_digits=16),
+                ),
+                (
+                    "min_water_temperature",
+                    models.DecimalField(decimal_places=1, max_digits=4),
+                ),
+                (
+                    "max_water_temperature",
+                    models.DecimalField(decimal_places=1, max_digits=4),
+                ),
+                ("sum_tds", models.BigIntegerField()),
+                ("min_tds", models.PositiveSmallIntegerField()),
+                ("max_tds", models.PositiveSmallIntegerField()),
+                (
+                    "system",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="hydroponic.hydroponicsystem",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "HydroponicMeasurementHourlyRollup",
+                "verbose_name_plural": "HydroponicMeasurementHourlyRollups",
+                "abstract": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="HydroponicMeasurementDailyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("bucket", models.DateTimeField()),
+                ("readings", models.PositiveIntegerField()),
+                ("sum_ph", models.DecimalField(decimal_places=1, max_digits=15)),
+                ("min_ph", models.DecimalField(decimal_places=1, max_digits=3)),
+                ("max_ph", models.DecimalField(decimal_places=1, max_digits=3)),
+                (
+                    "sum_water_temperature",
+                    models.DecimalField(decimal_places=1, max_digits=16),
+                ),
+                (
+                    "min_water_temperature",
+                    models.DecimalField(decimal_places=1, max_digits=4),
+                ),
+                (
+                    "max_water_temperature",
+                    models.DecimalField(decimal_places=1, max_digits=4),
+                ),
+                ("sum_tds", models.BigIntegerField()),
+                ("min_tds", models.PositiveSmallIntegerField()),
+                ("max_tds", models.PositiveSmallIntegerField()),
+                (
+                    "system",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="hydroponic.hydroponicsystem",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "HydroponicMeasurementDailyRollup",
+                "verbose_name_plural": "HydroponicMeasurementDailyRollups",
+                "abstract": False,
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="hydroponicmeasurementhourlyrollup",
+            constraint=models.UniqueConstraint(
+                fields=("system", "bucket"),
+                name="hydroponicmeasurementhourlyrollup_system_bucket_uniq",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="hydroponicmeasurementdailyrollup",
+            constraint=models.UniqueConstraint(
+                fields=("system", "bucket"),
+                name="hydroponicmeasurementdailyrollup_system_bucket_uniq",
+            ),
+        ),
+    ]
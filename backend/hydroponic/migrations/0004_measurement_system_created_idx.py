@@ -0,0 +1,19 @@
+# Generated by Django 4.1 on 2026-10-18 16:19
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("hydroponic", "0003_measurement_rollups"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="hydroponicmeasurement",
+            index=models.Index(
+                fields=["system", "created_at", "id"],
+                name="measurement_system_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,97 @@
+import datetime as dt
+
+from django.db import migrations
+
+TABLE = "hydroponic_hydroponicmeasurement"
+DETACHED_TABLE = f"{TABLE}_unpartitioned"
+
+
+def _months(first: dt.datetime, last: dt.datetime):
+    month = dt.datetime(first.year, first.month, 1, tzinfo=dt.timezone.utc)
+    while month <= last:
+        following = (month + dt.timedelta(days=32)).replace(day=1)
+        yield month, following
+        month = following
+
+
+def _table_definitions(cursor) -> list[str]:
+    """Secondary indexes and foreign keys of the measurements table, as DDL."""
+    cursor.execute(
+        "SELECT indexdef FROM pg_indexes "
+        "WHERE schemaname = current_schema() AND tablename = %s AND indexname <> %s",
+        [TABLE, f"{TABLE}_pkey"],
+    )
+    statements = [
+        indexdef.replace(" ON ONLY ", " ON ") for indexdef, in cursor.fetchall()
+    ]
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype = 'f'",
+        [TABLE],
+    )
+    statements += [
+        f'ALTER TABLE {TABLE} ADD CONSTRAINT "{name}" {definition}'
+        for name, definition in cursor.fetchall()
+    ]
+    return statements
+
+
+def partition_measurements(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        statements = _table_definitions(cursor)
+        cursor.execute(f"SELECT MIN(created_at) FROM {TABLE}")
+        (first,) = cursor.fetchone()
+
+        cursor.execute(f"ALTER TABLE {TABLE} RENAME TO {DETACHED_TABLE}")
+        cursor.execute(
+            f"CREATE TABLE {TABLE} (LIKE {DETACHED_TABLE} "
+            f"INCLUDING DEFAULTS INCLUDING CONSTRAINTS) PARTITION BY RANGE (created_at)"
+        )
+        cursor.execute(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT")
+        # Months with existing data only, later ones come from the
+        # ``manage_measurement_partitions`` command.
+        last = dt.datetime.now(dt.timezone.utc)
+        for start, end in _months(first, last) if first else ():
+            cursor.execute(
+                f"CREATE TABLE {TABLE}_p{start:%Y_%m} PARTITION OF {TABLE} "
+                f"FOR VALUES FROM (%s) TO (%s)",
+                [start, end],
+            )
+
+        cursor.execute(f"INSERT INTO {TABLE} SELECT * FROM {DETACHED_TABLE}")
+        cursor.execute(f"DROP TABLE {DETACHED_TABLE}")
+        # The partition key has to be part of every unique constraint.
+        cursor.execute(
+            f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey "
+            f"PRIMARY KEY (id, created_at)"
+        )
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def unpartition_measurements(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        statements = _table_definitions(cursor)
+
+        cursor.execute(f"ALTER TABLE {TABLE} RENAME TO {DETACHED_TABLE}")
+        cursor.execute(
+            f"CREATE TABLE {TABLE} (LIKE {DETACHED_TABLE} "
+            f"INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+        cursor.execute(f"INSERT INTO {TABLE} SELECT * FROM {DETACHED_TABLE}")
+        cursor.execute(f"DROP TABLE {DETACHED_TABLE}")
+        cursor.execute(
+            f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY (id)"
+        )
+        for statement in statements:
+            cursor.execute(statement)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("hydroponic", "0004_measurement_system_created_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_measurements, unpartition_measurements),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.1 on 2026-10-18 16:24
+import uuid
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("hydroponic", "0005_partition_measurements"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="hydroponicmeasurement",
+            name="readings",
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name="hydroponicsystem",
+            name="downsampled_before",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name="HydroponicRetentionPolicy",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "raw_retention_days",
+                    models.PositiveIntegerField(
+                        blank=True,
+                        null=True,
+                        validators=[django.core.validators.MinValueValidator(1)],
+                    ),
+                ),
+                (
+                    "system",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="retention_policy",
+                        to="hydroponic.hydroponicsystem",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "HydroponicRetentionPolicy",
+                "verbose_name_plural": "HydroponicRetentionPolicies",
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.1 on 2026-10-18 16:34
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("hydroponic", "0006_retention_policies"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="HydroponicDeviceKey",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("name", models.CharField(max_length=150)),
+                ("prefix", models.CharField(editable=False, max_length=12)),
+                (
+                    "digest",
+                    models.CharField(editable=False, max_length=64, unique=True),
+                ),
+                ("revoked_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "system",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="device_keys",
+                        to="hydroponic.hydroponicsystem",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "HydroponicDeviceKey",
+                "verbose_name_plural": "HydroponicDeviceKeys",
+            },
+        ),
+    ]
@@ -0,0 +1,103 @@
+import common.fields
+import django.core.validators
+from django.db import migrations
+
+MEASUREMENTS = "hydroponic_hydroponicmeasurement"
+ROLLUPS = (
+    "hydroponic_hydroponicmeasurementhourlyrollup",
+    "hydroponic_hydroponicmeasurementdailyrollup",
+)
+# Column, scaled integer type and the numeric type it replaces.
+MEASUREMENT_COLUMNS = (
+    ("ph", "smallint", "numeric(3, 1)"),
+    ("water_temperature", "smallint", "numeric(4, 1)"),
+)
+ROLLUP_COLUMNS = (
+    ("sum_ph", "bigint", "numeric(15, 1)"),
+    ("min_ph", "smallint", "numeric(3, 1)"),
+    ("max_ph", "smallint", "numeric(3, 1)"),
+    ("sum_water_temperature", "bigint", "numeric(16, 1)"),
+    ("min_water_temperature", "smallint", "numeric(4, 1)"),
+    ("max_water_temperature", "smallint", "numeric(4, 1)"),
+)
+ROLLUP_FIELDS = {
+    "sum_ph": {"max_digits": 15, "decimal_places": 1},
+    "min_ph": {"max_digits": 3, "decimal_places": 1},
+    "max_ph": {"max_digits": 3, "decimal_places": 1},
+    "sum_water_temperature": {"max_digits": 16, "decimal_places": 1},
+    "min_water_temperature": {"max_digits": 4, "decimal_places": 1},
+    "max_water_temperature": {"max_digits": 4, "decimal_places": 1},
+}
+
+
+def _alter(table: str, columns: tuple, reverse: bool = False) -> str:
+    # One statement per table, so each one is rewritten a single time. The
+    # measurements table is partitioned, the change reaches every partition.
+    if reverse:
+        changes = (
+            f"ALTER COLUMN {column} TYPE {numeric} USING {column} / 10.0"
+            for column, _scaled, numeric in columns
+        )
+    else:
+        changes = (
+            f"ALTER COLUMN {column} TYPE {scaled} USING round({column} * 10)"
+            for column, scaled, _numeric in columns
+        )
+
+    return f"ALTER TABLE {table} {', '.join(changes)}"
+
+
+def _alter_fields(model_name: str, fields: dict) -> list:
+    return [
+        migrations.AlterField(
+            model_name=model_name,
+            name=name,
+            field=common.fields.ScaledDecimalField(**options),
+        )
+        for name, options in fields.items()
+    ]
+
+
+class Migration(migrations.Migration):
+    """
+    Stores pH and water temperature in tenths, as ``smallint`` and ``bigint``.
+
+    Every table is rewritten under an ``ACCESS EXCLUSIVE`` lock, plan a
+    maintenance window on large installs. Flush the ingest spool beforehand
+    (``manage.py flush_measurement_buffer``): spooled lines hold the old decimal
+    form, which ``COPY`` no longer accepts.
+    """
+
+    dependencies = [
+        ("hydroponic", "0007_device_keys"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    _alter(table, columns), reverse_sql=_alter(table, columns, True)
+                )
+                for table, columns in [(MEASUREMENTS, MEASUREMENT_COLUMNS)]
+                + [(table, ROLLUP_COLUMNS) for table in ROLLUPS]
+            ],
+            state_operations=[
+                *_alter_fields(
+                    "hydroponicmeasurement",
+                    {
+                        "ph": {
+                            "max_digits": 3,
+                            "decimal_places": 1,
+                            "validators": [
+                                django.core.validators.MinValueValidator(0),
+                                django.core.validators.MaxValueValidator(14),
+                            ],
+                        },
+                        "water_temperature": {"max_digits": 4, "decimal_places": 1},
+                    },
+                ),
+                *_alter_fields("hydroponicmeasurementhourlyrollup", ROLLUP_FIELDS),
+                *_alter_fields("hydroponicmeasurementdailyrollup", ROLLUP_FIELDS),
+            ],
+        ),
+    ]
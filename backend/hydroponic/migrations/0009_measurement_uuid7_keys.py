@@ -0,0 +1,23 @@
+# Generated by Django 4.1 on 2026-10-18 16:53
+import common.models
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("hydroponic", "0008_scaled_metrics"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="hydroponicmeasurement",
+            name="id",
+            field=models.UUIDField(
+                default=common.models.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+    ]
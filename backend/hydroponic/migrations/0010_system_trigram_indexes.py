@@ -0,0 +1,38 @@
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently, outside of a transaction.
+    atomic = False
+
+    dependencies = [
+        ("hydroponic", "0009_measurement_uuid7_keys"),
+        # Creates the pg_trgm extension.
+        ("users", "0002_user_email_trigram_index"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="hydroponicsystem",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"),
+                    name="gin_trgm_ops",
+                ),
+                name="system_name_trgm_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="hydroponicsystem",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("description"),
+                    name="gin_trgm_ops",
+                ),
+                name="system_description_trgm_idx",
+            ),
+        ),
+    ]
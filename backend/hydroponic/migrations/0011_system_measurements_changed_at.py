@@ -0,0 +1,17 @@
+# Generated by Django 4.1 on 2026-10-18 17:23
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("hydroponic", "0010_system_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="hydroponicsystem",
+            name="measurements_changed_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -1,7 +1,11 @@
+from datetime import datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
+from common.fields import ScaledDecimalField
 from common.models import DateTimeUUIDMixin
+from common.models import TimeOrderedDateTimeUUIDMixin
+from common.models import trigram_index
 from django.core.validators import MaxValueValidator
 from django.core.validators import MinValueValidator
 from django.db import models
@@ -16,20 +20,34 @@ class HydroponicSystem(DateTimeUUIDMixin):
     user: "User" = models.ForeignKey(
         "users.User", on_delete=models.CASCADE, related_name="hydroponic_systems"
     )
+    # Older raw measurements were replaced by hourly downsamples.
+    downsampled_before: datetime | None = models.DateTimeField(
+        null=True, blank=True, editable=False
+    )
+    # Last change to the measurements that their newest ``created_at`` doesn't
+    # date, such as backdated inserts or deletes.
+    measurements_changed_at: datetime | None = models.DateTimeField(
+        null=True, blank=True, editable=False
+    )
 
     class Meta:
         verbose_name = "HydroponicSystem"
         verbose_name_plural = "HydroponicSystems"
+        indexes = [
+            trigram_index("name", name="system_name_trgm_idx"),
+            trigram_index("description", name="system_description_trgm_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.name
 
 
-class HydroponicMeasurement(DateTimeUUIDMixin):
+class HydroponicMeasurement(TimeOrderedDateTimeUUIDMixin):
     system: HydroponicSystem = models.ForeignKey(
         HydroponicSystem, on_delete=models.CASCADE, related_name="measurements"
     )
-    ph: int = models.DecimalField(
+    # Metrics with decimals are stored in tenths, see ``ScaledDecimalField``.
+    ph: int = ScaledDecimalField(
         max_digits=3,
         decimal_places=1,
         validators=[
@@ -37,11 +55,106 @@ class HydroponicMeasurement(DateTimeUUIDMixin):
             MaxValueValidator(14),
         ],
     )
-    water_temperature: Decimal = models.DecimalField(
+    water_temperature: Decimal = ScaledDecimalField(
         max_digits=4, decimal_places=1
     )  # Unit: Celsius degrees
     tds: int = models.PositiveSmallIntegerField()  # Unit: ppm
+    # Number of raw readings averaged into a downsampled row.
+    readings: int = models.PositiveIntegerField(default=1, editable=False)
 
     class Meta:
         verbose_name = "HydroponicMeasurement"
         verbose_name_plural = "HydroponicMeasurements"
+        indexes = [
+            models.Index(
+                fields=["created_at", "id"], name="measurement_created_at_id_idx"
+            ),
+            models.Index(
+                fields=["system", "created_at", "id"],
+                name="measurement_system_created_idx",
+            ),
+        ]
+
+
+class HydroponicDeviceKey(DateTimeUUIDMixin):
+    """Long-lived credential a sensor uses to send one system's measurements."""
+
+    system: HydroponicSystem = models.ForeignKey(
+        HydroponicSystem, on_delete=models.CASCADE, related_name="device_keys"
+    )
+    name: str = models.CharField(max_length=150)
+    # Leading characters of the key, enough to tell keys apart.
+    prefix: str = models.CharField(max_length=12, editable=False)
+    digest: str = models.CharField(max_length=64, unique=True, editable=False)
+    revoked_at: datetime | None = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "HydroponicDeviceKey"
+        verbose_name_plural = "HydroponicDeviceKeys"
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.prefix}...)"
+
+
+class HydroponicRetentionPolicy(DateTimeUUIDMixin):
+    """Overrides ``HYDROPONIC_RAW_RETENTION_DAYS`` for a single system."""
+
+    system: HydroponicSystem = models.OneToOneField(
+        HydroponicSystem, on_delete=models.CASCADE, related_name="retention_policy"
+    )
+    # Empty keeps raw measurements of the system forever.
+    raw_retention_days: int | None = models.PositiveIntegerField(
+        null=True, blank=True, validators=[MinValueValidator(1)]
+    )
+
+    class Meta:
+        verbose_name = "HydroponicRetentionPolicy"
+        verbose_name_plural = "HydroponicRetentionPolicies"
+
+    def __str__(self) -> str:
+        return f"{self.system}: {self.raw_retention_days or '-'}"
+
+
+class HydroponicMeasurementRollup(models.Model):
+    """Running aggregates of one system's measurements within a time bucket."""
+
+    bucket_kind: str
+
+    system: HydroponicSystem = models.ForeignKey(
+        HydroponicSystem, on_delete=models.CASCADE, related_name="+"
+    )
+    bucket: datetime = models.DateTimeField()
+    readings: int = models.PositiveIntegerField()
+    sum_ph: Decimal = ScaledDecimalField(max_digits=15, decimal_places=1)
+    min_ph: Decimal = ScaledDecimalField(max_digits=3, decimal_places=1)
+    max_ph: Decimal = ScaledDecimalField(max_digits=3, decimal_places=1)
+    sum_water_temperature: Decimal = ScaledDecimalField(max_digits=16, decimal_places=1)
+    min_water_temperature: Decimal = ScaledDecimalField(max_digits=4, decimal_places=1)
+    max_water_temperature: Decimal = ScaledDecimalField(max_digits=4, decimal_places=1)
+    sum_tds: int = models.BigIntegerField()
+    min_tds: int = models.PositiveSmallIntegerField()
+    max_tds: int = models.PositiveSmallIntegerField()
+
+    class Meta:
+        abstract = True
+        constraints = [
+            models.UniqueConstraint(
+                fields=["system", "bucket"], name="%(class)s_system_bucket_uniq"
+            ),
+        ]
+
+
+class HydroponicMeasurementHourlyRollup(HydroponicMeasurementRollup):
+    bucket_kind = "hour"
+
+    class Meta(HydroponicMeasurementRollup.Meta):
+        verbose_name = "HydroponicMeasurementHourlyRollup"
+        verbose_name_plural = "HydroponicMeasurementHourlyRollups"
+
+
+class HydroponicMeasurementDailyRollup(HydroponicMeasurementRollup):
+    bucket_kind = "day"
+
+    class Meta(HydroponicMeasurementRollup.Meta):
+        verbose_name = "HydroponicMeasurementDailyRollup"
+        verbose_name_plural = "HydroponicMeasurementDailyRollups"
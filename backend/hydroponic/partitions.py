@@ -0,0 +1,97 @@
+import datetime as dt
+
+from django.db import connection
+from django.db import transaction
+from hydroponic.models import HydroponicMeasurement
+from hydroponic.models import HydroponicSystem
+from hydroponic.queries import mark_measurements_changed
+
+PARTITIONED_TABLE = HydroponicMeasurement._meta.db_table
+DEFAULT_PARTITION = f"{PARTITIONED_TABLE}_default"
+
+
+def month_start(value: dt.date) -> dt.datetime:
+    return dt.datetime(value.year, value.month, 1, tzinfo=dt.timezone.utc)
+
+
+def next_month(value: dt.date) -> dt.datetime:
+    return month_start(month_start(value) + dt.timedelta(days=32))
+
+
+def partition_name(month: dt.date) -> str:
+    return f"{PARTITIONED_TABLE}_p{month:%Y_%m}"
+
+
+def list_partitions() -> dict[str, dt.datetime]:
+    """Monthly partitions of the measurements table, keyed by name."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = %s AND child.relname <> %s",
+            [PARTITIONED_TABLE, DEFAULT_PARTITION],
+        )
+        names = [name for name, in cursor.fetchall()]
+
+    return {
+        name: dt.datetime.strptime(name[-7:], "%Y_%m").replace(tzinfo=dt.timezone.utc)
+        for name in names
+    }
+
+
+def list_default_partition_months() -> list[dt.datetime]:
+    """Months with rows stuck in the default partition, such as imported history."""
+    quote_name = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT DISTINCT date_trunc('month', created_at AT TIME ZONE 'UTC') "
+            f"FROM {quote_name(DEFAULT_PARTITION)} ORDER BY 1"
+        )
+        return [month_start(month) for month, in cursor.fetchall()]
+
+
+def create_partition(month: dt.date) -> bool:
+    """
+    Creates the partition holding ``month`` unless it already exists.
+
+    Rows that already landed in the default partition for that month are moved
+    over first, otherwise Postgres refuses to attach the new range.
+    """
+    name = partition_name(month)
+    if name in list_partitions():
+        return False
+
+    quote_name = connection.ops.quote_name
+    start, end = month_start(month), next_month(month)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TABLE {quote_name(name)} (LIKE {quote_name(PARTITIONED_TABLE)} "
+            f"INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {quote_name(DEFAULT_PARTITION)} "
+            f"WHERE created_at >= %s AND created_at < %s RETURNING *) "
+            f"INSERT INTO {quote_name(name)} SELECT * FROM moved",
+            [start, end],
+        )
+        cursor.execute(
+            f"ALTER TABLE {quote_name(PARTITIONED_TABLE)} "
+            f"ATTACH PARTITION {quote_name(name)} FOR VALUES FROM (%s) TO (%s)",
+            [start, end],
+        )
+
+    return True
+
+
+def detach_partition(name: str, drop: bool = False) -> None:
+    """Removes a month of raw measurements without a row-by-row ``DELETE``."""
+    quote_name = connection.ops.quote_name
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"ALTER TABLE {quote_name(PARTITIONED_TABLE)} "
+            f"DETACH PARTITION {quote_name(name)}"
+        )
+        if drop:
+            cursor.execute(f"DROP TABLE {quote_name(name)}")
+        mark_measurements_changed(HydroponicSystem.objects.all())
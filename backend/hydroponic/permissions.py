@@ -0,0 +1,16 @@
+from hydroponic.models import HydroponicDeviceKey
+from rest_framework.permissions import BasePermission
+
+
+class DeviceKeyScope(BasePermission):
+    """
+    Limits requests made with a device key to the view's ``device_key_actions``,
+    viewset actions or lowercase HTTP methods for plain views.
+    """
+
+    def has_permission(self, request, view) -> bool:
+        if not isinstance(request.auth, HydroponicDeviceKey):
+            return True
+
+        action = getattr(view, "action", None) or request.method.lower()
+        return action in getattr(view, "device_key_actions", ())
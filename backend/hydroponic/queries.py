@@ -0,0 +1,115 @@
+from collections import defaultdict
+from collections.abc import Iterable
+from uuid import UUID
+
+from common.fields import ScaledDecimalField
+from django.db import connection
+from django.db.models import DecimalField
+from django.db.models import ExpressionWrapper
+from django.db.models import F
+from django.db.models import Field
+from django.db.models import Max
+from django.db.models import Min
+from django.db.models import QuerySet
+from django.db.models import Sum
+from django.db.models.functions import Cast
+from django.db.models.functions import Trunc
+from django.db.models.query import RawQuerySet
+from django.utils import timezone
+from hydroponic.models import HydroponicMeasurement
+from hydroponic.models import HydroponicSystem
+
+MEASUREMENT_METRICS = ("ph", "water_temperature", "tds")
+AGGREGATE_BUCKETS = ("hour", "day")
+
+
+def mark_measurements_changed(systems: QuerySet) -> None:
+    """
+    Dates a change to the measurements of ``systems`` that leaves their newest
+    ``created_at`` alone, so conditional GETs of measurement lists notice it.
+    """
+    systems.update(measurements_changed_at=timezone.now())
+
+
+def _average(total: Sum, field: Field) -> ExpressionWrapper:
+    # Sums of a ``ScaledDecimalField`` are in its steps, so is their average
+    # and the field reads it back unscaled.
+    if not isinstance(field, ScaledDecimalField):
+        field = DecimalField()
+
+    return ExpressionWrapper(
+        Cast(total, DecimalField(max_digits=20, decimal_places=1)) / Sum("readings"),
+        output_field=field,
+    )
+
+
+def aggregate_measurements(queryset: QuerySet, bucket: str) -> QuerySet:
+    """
+    Groups measurements into ``bucket`` wide time slots in a single query.
+
+    Downsampled rows are weighted by the raw readings they stand for, their
+    minimum and maximum are the hourly averages.
+    """
+    aggregates = {"count": Sum("readings")}
+    for metric in MEASUREMENT_METRICS:
+        aggregates[f"{metric}_min"] = Min(metric)
+        aggregates[f"{metric}_max"] = Max(metric)
+        aggregates[f"{metric}_avg"] = _average(
+            Sum(F(metric) * F("readings")),
+            HydroponicMeasurement._meta.get_field(metric),
+        )
+
+    return (
+        queryset.annotate(bucket=Trunc("created_at", bucket))
+        .values("bucket")
+        .annotate(**aggregates)
+        .order_by("bucket")
+    )
+
+
+def aggregate_rollups(queryset: QuerySet, group_by: str = "bucket") -> QuerySet:
+    """
+    Same output as ``aggregate_measurements``, computed from rollup rows.
+
+    Rows are grouped by ``group_by`` instead of their bucket when given, such as
+    ``system_id`` to sum up a time range per system.
+    """
+    aggregates = {"count": Sum("readings")}
+    for metric in MEASUREMENT_METRICS:
+        aggregates[f"{metric}_min"] = Min(f"min_{metric}")
+        aggregates[f"{metric}_max"] = Max(f"max_{metric}")
+        aggregates[f"{metric}_avg"] = _average(
+            Sum(f"sum_{metric}"), queryset.model._meta.get_field(f"sum_{metric}")
+        )
+
+    return queryset.values(group_by).annotate(**aggregates).order_by(group_by)
+
+
+def latest_measurements(system_ids: Iterable[UUID], limit: int) -> RawQuerySet:
+    """
+    The newest ``limit`` measurements of every system in a single query.
+
+    A ``LATERAL`` subquery per system walks the ``(system, created_at, id)`` index
+    backwards and stops after ``limit`` rows, however long the history is.
+    """
+    table = connection.ops.quote_name(HydroponicMeasurement._meta.db_table)
+    return HydroponicMeasurement.objects.raw(
+        f"SELECT latest.* FROM unnest(%s::uuid[]) AS systems(id) "
+        f"CROSS JOIN LATERAL (SELECT * FROM {table} WHERE system_id = systems.id "
+        f"ORDER BY created_at DESC, id DESC LIMIT %s) AS latest "
+        f"ORDER BY latest.system_id, latest.created_at DESC, latest.id DESC",
+        [list(system_ids), limit],
+    )
+
+
+def prefetch_latest_measurements(
+    systems: Iterable[HydroponicSystem], limit: int
+) -> None:
+    """Stores the newest measurements on each system as ``latest_measurements``."""
+    systems = list(systems)
+    latest = defaultdict(list)
+    for measurement in latest_measurements([system.id for system in systems], limit):
+        latest[measurement.system_id].append(measurement)
+
+    for system in systems:
+        system.latest_measurements = latest[system.id]
@@ -0,0 +1,113 @@
+import datetime as dt
+import time
+
+from common.models import get_uuid_sql
+from django.conf import settings
+from django.db import connection
+from django.db import transaction
+from django.utils import timezone
+from hydroponic.models import HydroponicMeasurement
+from hydroponic.models import HydroponicRetentionPolicy
+from hydroponic.models import HydroponicSystem
+from hydroponic.queries import MEASUREMENT_METRICS
+from hydroponic.rollups import truncate
+
+
+def get_raw_retention_days(system: HydroponicSystem) -> int | None:
+    try:
+        return system.retention_policy.raw_retention_days
+    except HydroponicRetentionPolicy.DoesNotExist:
+        return settings.HYDROPONIC_RAW_RETENTION_DAYS
+
+
+def get_retention_cutoff(
+    system: HydroponicSystem, now: dt.datetime | None = None
+) -> dt.datetime | None:
+    """
+    Start of the oldest day whose raw measurements are still kept.
+
+    Cutoffs are whole UTC days, so daily rollups never straddle raw and
+    downsampled data and can still be rebuilt from the raw side.
+    """
+    days = get_raw_retention_days(system)
+    if days is None:
+        return None
+
+    return truncate((now or timezone.now()) - dt.timedelta(days=days), "day")
+
+
+def _downsample(system: HydroponicSystem, start: dt.datetime, end: dt.datetime):
+    quote_name = connection.ops.quote_name
+    table = quote_name(HydroponicMeasurement._meta.db_table)
+    # Every metric column holds integers, ``ScaledDecimalField`` ones included.
+    averages = [
+        f"ROUND(SUM({quote_name(metric)} * readings)::numeric / SUM(readings))"
+        for metric in MEASUREMENT_METRICS
+    ]
+
+    columns = ("id", "created_at", "updated_at", "system_id") + MEASUREMENT_METRICS
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"WITH removed AS (DELETE FROM {table} WHERE system_id = %s "
+            f"AND created_at >= %s AND created_at < %s RETURNING *), "
+            f"inserted AS (INSERT INTO {table} "
+            f"({', '.join(map(quote_name, columns + ('readings',)))}) "
+            f"SELECT {get_uuid_sql(HydroponicMeasurement, 'now()')}, "
+            f"date_trunc('hour', created_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC', "
+            f"now(), system_id, {', '.join(averages)}, SUM(readings) "
+            f"FROM removed GROUP BY 2, system_id RETURNING 1) "
+            f"SELECT (SELECT COUNT(*) FROM removed), (SELECT COUNT(*) FROM inserted)",
+            [system.pk, start, end],
+        )
+        return cursor.fetchone()
+
+
+def downsample_measurements(
+    system: HydroponicSystem,
+    cutoff: dt.datetime,
+    batch: dt.timedelta = dt.timedelta(days=1),
+    pause: float = 0,
+) -> tuple[int, int]:
+    """
+    Replaces ``system``'s raw measurements older than ``cutoff`` with hourly
+    averages and returns how many rows were removed and inserted.
+
+    Each ``batch`` wide window is swapped in its own short transaction together
+    with the new ``downsampled_before`` boundary, so an interrupted run resumes
+    where it stopped, locks stay brief and ``pause`` lets replicas and WAL
+    archiving catch up between windows. Rollups keep their exact aggregates.
+    """
+    removed = inserted = 0
+    start = system.downsampled_before
+    if start is not None and start >= cutoff:
+        return removed, inserted
+
+    while True:
+        pending = system.measurements.filter(created_at__lt=cutoff)
+        if start is not None:
+            pending = pending.filter(created_at__gte=start)
+
+        first = (
+            pending.order_by("created_at").values_list("created_at", flat=True).first()
+        )
+        if first is None:
+            break
+
+        start = truncate(first, "day")
+        end = min(start + batch, cutoff)
+        with transaction.atomic():
+            batch_removed, batch_inserted = _downsample(system, start, end)
+            HydroponicSystem.objects.filter(pk=system.pk).update(
+                downsampled_before=end, measurements_changed_at=timezone.now()
+            )
+
+        removed += batch_removed
+        inserted += batch_inserted
+        start = end
+        if pause:
+            time.sleep(pause)
+
+    HydroponicSystem.objects.filter(pk=system.pk).update(downsampled_before=cutoff)
+    system.downsampled_before = cutoff
+
+    return removed, inserted
@@ -0,0 +1,276 @@
+import datetime as dt
+from collections.abc import Iterable
+from uuid import UUID
+
+from django.conf import settings
+from django.db import connection
+from django.db import transaction
+from django.db.models import Max
+from django.db.models import Q
+from django.db.models import QuerySet
+from django.utils import timezone
+from hydroponic.models import HydroponicMeasurement
+from hydroponic.models import HydroponicMeasurementDailyRollup
+from hydroponic.models import HydroponicMeasurementHourlyRollup
+from hydroponic.models import HydroponicMeasurementRollup
+from hydroponic.models import HydroponicSystem
+from hydroponic.queries import aggregate_rollups
+from hydroponic.queries import MEASUREMENT_METRICS
+from users.models import User
+
+ROLLUP_MODELS: dict[str, type[HydroponicMeasurementRollup]] = {
+    "hour": HydroponicMeasurementHourlyRollup,
+    "day": HydroponicMeasurementDailyRollup,
+}
+ROLLUP_COLUMNS = ("readings",) + tuple(
+    f"{aggregate}_{metric}"
+    for metric in MEASUREMENT_METRICS
+    for aggregate in ("sum", "min", "max")
+)
+BUCKET_WIDTHS = {"hour": dt.timedelta(hours=1), "day": dt.timedelta(days=1)}
+
+
+def truncate(value: dt.datetime, kind: str) -> dt.datetime:
+    """Python twin of ``date_trunc`` in UTC, used to key rollup buckets."""
+    value = value.astimezone(dt.timezone.utc).replace(minute=0, second=0, microsecond=0)
+    if kind == "day":
+        value = value.replace(hour=0)
+
+    return value
+
+
+def record_measurements(measurements: Iterable[HydroponicMeasurement]) -> None:
+    """
+    Folds freshly inserted measurements into the hourly and daily rollups.
+
+    Every bucket is upserted with ``ON CONFLICT DO UPDATE`` adding to the stored
+    aggregates, so concurrent writers never overwrite each other. Rows are sorted
+    to take row locks in a stable order and avoid deadlocks between batches.
+    """
+    measurements = list(measurements)
+    if not measurements:
+        return
+
+    for model in ROLLUP_MODELS.values():
+        buckets = {}
+        for measurement in measurements:
+            key = (
+                measurement.system_id,
+                truncate(measurement.created_at, model.bucket_kind),
+            )
+            rollup = buckets.get(key)
+            if rollup is None:
+                rollup = buckets[key] = {"readings": 0}
+                for metric in MEASUREMENT_METRICS:
+                    value = getattr(measurement, metric)
+                    rollup[f"sum_{metric}"] = 0
+                    rollup[f"min_{metric}"] = value
+                    rollup[f"max_{metric}"] = value
+
+            rollup["readings"] += 1
+            for metric in MEASUREMENT_METRICS:
+                value = getattr(measurement, metric)
+                rollup[f"sum_{metric}"] += value
+                rollup[f"min_{metric}"] = min(rollup[f"min_{metric}"], value)
+                rollup[f"max_{metric}"] = max(rollup[f"max_{metric}"], value)
+
+        _upsert(model, buckets)
+
+
+def _upsert(model: type[HydroponicMeasurementRollup], buckets: dict) -> None:
+    quote_name = connection.ops.quote_name
+    table = quote_name(model._meta.db_table)
+    columns = ("system_id", "bucket") + ROLLUP_COLUMNS
+
+    updates = []
+    for column in ROLLUP_COLUMNS:
+        name = quote_name(column)
+        if column == "readings" or column.startswith("sum_"):
+            updates.append(f"{name} = {table}.{name} + EXCLUDED.{name}")
+        elif column.startswith("min_"):
+            updates.append(f"{name} = LEAST({table}.{name}, EXCLUDED.{name})")
+        else:
+            updates.append(f"{name} = GREATEST({table}.{name}, EXCLUDED.{name})")
+
+    fields = [model._meta.get_field(column) for column in ROLLUP_COLUMNS]
+    params = []
+    for (system_id, bucket), rollup in sorted(buckets.items()):
+        params += [system_id, bucket] + [
+            field.get_db_prep_save(rollup[field.name], connection) for field in fields
+        ]
+
+    row = "(" + ", ".join(["%s"] * len(columns)) + ")"
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} ({', '.join(map(quote_name, columns))}) "
+            f"VALUES {', '.join([row] * len(buckets))} "
+            f"ON CONFLICT (system_id, bucket) DO UPDATE SET {', '.join(updates)}",
+            params,
+        )
+
+
+def rebuild_rollups(system_id: UUID, since: dt.datetime | None = None) -> None:
+    """
+    Recomputes one system's rollups from raw measurements.
+
+    Buckets before the system's ``downsampled_before`` boundary are left alone as
+    their raw readings are gone. The rollup tables are locked in ``EXCLUSIVE``
+    mode, which still allows reads but makes concurrent ingestion wait, so no
+    reading is counted twice or lost while its buckets are being replaced.
+    """
+    quote_name = connection.ops.quote_name
+    measurements = quote_name(HydroponicMeasurement._meta.db_table)
+    aggregates = ["COUNT(*)"]
+    for metric in MEASUREMENT_METRICS:
+        column = quote_name(metric)
+        aggregates += [f"SUM({column})", f"MIN({column})", f"MAX({column})"]
+
+    downsampled_before = (
+        HydroponicSystem.objects.filter(pk=system_id)
+        .values_list("downsampled_before", flat=True)
+        .first()
+    )
+    if downsampled_before is not None:
+        since = max(since or downsampled_before, downsampled_before)
+
+    bucket_where = created_where = "system_id = %s"
+    params = [system_id]
+    if since is not None:
+        # Whole days, so the first daily bucket is not rebuilt from a partial day.
+        bucket_where += " AND bucket >= %s"
+        created_where += " AND created_at >= %s"
+        params.append(truncate(since, "day"))
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        for model in ROLLUP_MODELS.values():
+            table = quote_name(model._meta.db_table)
+            columns = ("system_id", "bucket") + ROLLUP_COLUMNS
+
+            cursor.execute(f"LOCK TABLE {table} IN EXCLUSIVE MODE")
+            cursor.execute(f"DELETE FROM {table} WHERE {bucket_where}", params)
+            cursor.execute(
+                f"INSERT INTO {table} ({', '.join(map(quote_name, columns))}) "
+                f"SELECT system_id, "
+                f"date_trunc(%s, created_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC', "
+                f"{', '.join(aggregates)} FROM {measurements} "
+                f"WHERE {created_where} GROUP BY 1, 2",
+                [model.bucket_kind] + params,
+            )
+
+
+def get_whole_buckets(
+    bucket: str, filters: dict
+) -> tuple[dt.datetime | None, dt.datetime | None]:
+    """
+    Range of the ``bucket`` wide slots lying entirely inside the ``created_at``
+    bounds of cleaned ``HydroponicMeasurementFilter`` data: the start of the
+    first one and the end of the last one, ``None`` for an unbounded side.
+    """
+    first = last = None
+    lower = filters.get("created_at__gte")
+    if lower is not None:
+        first = truncate(lower, bucket)
+        if first != lower:
+            first += BUCKET_WIDTHS[bucket]
+    # A reading right at an exclusive lower bound would fall in its bucket.
+    lower = filters.get("created_at__gt")
+    if lower is not None:
+        after = truncate(lower, bucket) + BUCKET_WIDTHS[bucket]
+        first = after if first is None else max(first, after)
+    # Buckets starting before an upper bound may hold readings past it.
+    for lookup in ("lt", "lte"):
+        upper = filters.get(f"created_at__{lookup}")
+        if upper is not None:
+            before = truncate(upper, bucket)
+            last = before if last is None else min(last, before)
+
+    return first, last
+
+
+def get_partial_buckets_filter(bucket: str, filters: dict) -> Q | None:
+    """
+    Readings of the buckets a ``created_at`` range only covers in part, which
+    ``get_rollup_queryset`` leaves out and the raw table has to answer.
+    """
+    first, last = get_whole_buckets(bucket, filters)
+    partial = Q()
+    if first is not None and first != filters.get("created_at__gte"):
+        partial |= Q(created_at__lt=first)
+    if last is not None and last != filters.get("created_at__lt"):
+        partial |= Q(created_at__gte=last)
+
+    return partial or None
+
+
+def get_rollup_queryset(user: User, bucket: str, filters: dict) -> QuerySet | None:
+    """
+    Returns the rollups answering cleaned ``HydroponicMeasurementFilter`` data.
+
+    ``None`` means the raw table has to be queried instead: either a filter on
+    measurement values is present or the time range is shorter than
+    ``HYDROPONIC_ROLLUP_MIN_RANGE`` and only covers raw, not downsampled,
+    measurements. Only buckets lying entirely inside the range are returned,
+    the partial ones at its edges match ``get_partial_buckets_filter``.
+    """
+    if filters.get("created_at") is not None or any(
+        value is not None
+        for name, value in filters.items()
+        if name.split("__")[0] in MEASUREMENT_METRICS
+    ):
+        return None
+
+    start = filters.get("created_at__gte") or filters.get("created_at__gt")
+    end = (
+        filters.get("created_at__lte")
+        or filters.get("created_at__lt")
+        or timezone.now()
+    )
+    system: HydroponicSystem | None = filters.get("system_id")
+    if start is not None and end - start <= settings.HYDROPONIC_ROLLUP_MIN_RANGE:
+        if system is not None:
+            downsampled_before = system.downsampled_before
+        else:
+            downsampled_before = HydroponicSystem.objects.filter(user=user).aggregate(
+                downsampled_before=Max("downsampled_before")
+            )["downsampled_before"]
+
+        if downsampled_before is None or start >= downsampled_before:
+            return None
+
+    first, last = get_whole_buckets(bucket, filters)
+    if first is not None and last is not None and first >= last:
+        return None
+
+    queryset = ROLLUP_MODELS[bucket].objects.filter(system__user=user)
+    if first is not None:
+        queryset = queryset.filter(bucket__gte=first)
+    if last is not None:
+        queryset = queryset.filter(bucket__lt=last)
+    if system is not None:
+        queryset = queryset.filter(system=system)
+
+    return queryset
+
+
+def prefetch_recent_aggregates(
+    systems: Iterable[HydroponicSystem], since: dt.datetime
+) -> None:
+    """
+    Stores aggregates of each system's readings since ``since`` as
+    ``recent_aggregates``, ``None`` for systems without any.
+
+    One query over the hourly rollups answers for every system, so ``since`` is
+    rounded down to the start of its hour.
+    """
+    systems = list(systems)
+    aggregates = aggregate_rollups(
+        HydroponicMeasurementHourlyRollup.objects.filter(
+            system__in=[system.id for system in systems],
+            bucket__gte=truncate(since, "hour"),
+        ),
+        group_by="system_id",
+    )
+    by_system = {row["system_id"]: row for row in aggregates}
+
+    for system in systems:
+        system.recent_aggregates = by_system.get(system.id)
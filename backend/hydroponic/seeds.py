@@ -0,0 +1,114 @@
+import datetime as dt
+import random
+
+from common.models import get_uuid_sql
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.db import transaction
+from django.utils import timezone
+from hydroponic.models import HydroponicMeasurement
+from hydroponic.models import HydroponicSystem
+from hydroponic.partitions import create_partition
+from hydroponic.partitions import month_start
+from hydroponic.partitions import next_month
+from hydroponic.rollups import rebuild_rollups
+from users.models import User
+
+# Readings are generated by Postgres itself: baselines drawn per system, a daily
+# cycle on pH and temperature, a weekly one on TDS and noise on all of them. pH
+# and temperature are stored in tenths, see ``ScaledDecimalField``.
+READINGS_SQL = """
+INSERT INTO {table} (
+    id, created_at, updated_at, system_id, ph, water_temperature, tds, readings
+)
+SELECT
+    {uuid}, reading.at, reading.at, %(system)s,
+    round(10 * least(greatest(
+        %(ph)s + 0.3 * sin(2 * pi() * reading.day) + (random() - 0.5) * 0.2, 0
+    ), 14))::smallint,
+    round(10 * (
+        %(water_temperature)s + 2.5 * sin(2 * pi() * reading.day)
+        + (random() - 0.5) * 0.4
+    ))::smallint,
+    greatest(round(
+        %(tds)s + 60 * sin(2 * pi() * reading.day / 7) + (random() - 0.5) * 20
+    ), 0)::integer,
+    1
+FROM generate_series(0, %(count)s - 1) AS step,
+LATERAL (
+    SELECT
+        %(end)s::timestamptz - step * %(interval)s::interval AS at,
+        extract(epoch FROM step * %(interval)s::interval) / 86400 AS day
+) AS reading
+"""
+
+
+def seed_measurements(
+    users: int,
+    systems: int,
+    measurements: int,
+    interval: dt.timedelta = dt.timedelta(minutes=1),
+    email: str = "seed-{}@hydroponic.local",
+    password: str = "hydroponic",
+    seed: int | None = None,
+) -> list[User]:
+    """
+    Creates ``users`` users owning ``systems`` systems with ``measurements``
+    readings each, taken every ``interval`` up to now.
+
+    Users and systems are created with ``bulk_create`` and readings with one
+    ``INSERT ... SELECT generate_series`` per system, so no row travels through
+    Python. Missing monthly partitions are created beforehand and rollups
+    rebuilt afterwards. ``email`` is formatted with the user's number.
+    """
+    rng = random.Random(seed)
+    # Hashing is slow by design, every seeded user shares the same hash.
+    password = make_password(password)
+    created = User.objects.bulk_create(
+        User(
+            email=email.format(number), username=email.format(number), password=password
+        )
+        for number in range(users)
+    )
+    owned = HydroponicSystem.objects.bulk_create(
+        HydroponicSystem(
+            user=user,
+            name=f"System {number}",
+            description=f"Seeded system {number} of {user.email}",
+        )
+        for user in created
+        for number in range(systems)
+    )
+
+    end = timezone.now().replace(microsecond=0)
+    if measurements:
+        month = month_start(end - interval * (measurements - 1))
+        while month <= end:
+            create_partition(month)
+            month = next_month(month)
+
+    table = connection.ops.quote_name(HydroponicMeasurement._meta.db_table)
+    for system in owned:
+        with transaction.atomic(), connection.cursor() as cursor:
+            if seed is not None:
+                cursor.execute("SELECT setseed(%s)", [rng.uniform(-1, 1)])
+            cursor.execute(
+                READINGS_SQL.format(
+                    table=table, uuid=get_uuid_sql(HydroponicMeasurement, "reading.at")
+                ),
+                {
+                    "system": system.id,
+                    "ph": rng.uniform(5.5, 6.5),
+                    "water_temperature": rng.uniform(18, 24),
+                    "tds": rng.randint(400, 900),
+                    "count": measurements,
+                    "end": end,
+                    "interval": interval,
+                },
+            )
+        rebuild_rollups(system.id)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {table}")
+
+    return created
@@ -1,13 +1,31 @@
+import datetime as dt
+import io
 from collections import OrderedDict
 
 from common.decorators import context_user_required
+from django.conf import settings
+from django.db import transaction
 from django.utils.translation import gettext_lazy as _
+from hydroponic.authentication import create_device_key
+from hydroponic.exports import EXPORT_STREAMS
+from hydroponic.imports import MeasurementImport
+from hydroponic.ingest import buffer_measurements
+from hydroponic.models import HydroponicDeviceKey
 from hydroponic.models import HydroponicMeasurement
 from hydroponic.models import HydroponicSystem
+from hydroponic.queries import AGGREGATE_BUCKETS
+from hydroponic.rollups import record_measurements
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
 
+def get_context_device_key(
+    serializer: serializers.BaseSerializer,
+) -> HydroponicDeviceKey | None:
+    auth = getattr(serializer.context.get("request"), "auth", None)
+    return auth if isinstance(auth, HydroponicDeviceKey) else None
+
+
 class MeasurementsForSystemSerializer(serializers.ModelSerializer):
     class Meta:
         model = HydroponicMeasurement
@@ -28,12 +46,20 @@ class HydroponicSystemSerializer(serializers.ModelSerializer):
 class HydroponicSystemDetailsSerializer(serializers.ModelSerializer):
     measurements = serializers.SerializerMethodField()
 
+    measurements_limit = 10
+
     class Meta:
         model = HydroponicSystem
         fields = ("id", "name", "description", "measurements")
 
     def get_measurements(self, obj: HydroponicSystem) -> HydroponicMeasurement:
-        measurements = obj.measurements.all().order_by("-created_at")[:10]
+        # Filled in by ``prefetch_latest_measurements`` when the view plans it.
+        measurements = getattr(obj, "latest_measurements", None)
+        if measurements is None:
+            measurements = obj.measurements.order_by("-created_at", "-id")[
+                : self.measurements_limit
+            ]
+
         return MeasurementsForSystemSerializer(measurements, many=True).data
 
 
@@ -50,14 +76,234 @@ class HydroponicMeasurementSerializer(serializers.ModelSerializer):
         model = HydroponicMeasurement
         fields = ("id", "system_id", "system", "ph", "water_temperature", "tds")
 
+    def get_fields(self) -> dict:
+        fields = super().get_fields()
+        if get_context_device_key(self) is not None:
+            # The key already names the system, no lookup needed.
+            fields["system_id"] = serializers.UUIDField(write_only=True, required=False)
+
+        return fields
+
     def validate_system_id(
         self, value: HydroponicSystem
     ) -> HydroponicSystem | ValidationError:
-        if value.user != self.context_user:
+        device_key = get_context_device_key(self)
+        if device_key is not None:
+            if value != device_key.system_id:
+                self.fail("invalid_system")
+
+            return device_key.system
+
+        if value.user_id != self.context_user.pk:
             self.fail("invalid_system")
 
         return value
 
+    def validate(self, attrs: OrderedDict) -> OrderedDict:
+        device_key = get_context_device_key(self)
+        if device_key is not None:
+            attrs.setdefault("system_id", device_key.system)
+
+        return attrs
+
     def create(self, validated_data: OrderedDict, **kwargs) -> HydroponicSystem:
         system = validated_data.pop("system_id")
-        return HydroponicMeasurement.objects.create(system=system, **validated_data)
+        if settings.HYDROPONIC_INGEST_BUFFER:
+            measurement = HydroponicMeasurement(system=system, **validated_data)
+            buffer_measurements([measurement])
+            return measurement
+
+        with transaction.atomic():
+            return HydroponicMeasurement.objects.create(system=system, **validated_data)
+
+
+class HydroponicMeasurementBulkItemSerializer(serializers.ModelSerializer):
+    """Validates a single reading without touching the database."""
+
+    system_id = serializers.UUIDField()
+
+    class Meta:
+        model = HydroponicMeasurement
+        fields = ("system_id", "ph", "water_temperature", "tds")
+
+
+@context_user_required
+class HydroponicMeasurementBulkSerializer(serializers.Serializer):
+    measurements = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=settings.HYDROPONIC_BULK_MAX_MEASUREMENTS,
+    )
+
+    default_error_messages = {"invalid_system": _("Hydroponic system not found.")}
+
+    def create(self, validated_data: OrderedDict, **kwargs) -> dict:
+        device_key = get_context_device_key(self)
+        errors = []
+        rows = []
+        for index, data in enumerate(validated_data["measurements"]):
+            if device_key is not None:
+                data.setdefault("system_id", device_key.system_id)
+            item = HydroponicMeasurementBulkItemSerializer(data=data)
+            if item.is_valid():
+                rows.append((index, item.validated_data))
+            else:
+                errors.append({"index": index, "errors": item.errors})
+
+        if device_key is not None:
+            systems = {device_key.system_id: device_key.system}
+        else:
+            # Ownership is checked once per distinct system, not once per reading.
+            systems = HydroponicSystem.objects.filter(
+                user=self.context_user,
+                id__in={row["system_id"] for _, row in rows},
+            ).in_bulk()
+
+        indexes = []
+        measurements = []
+        for index, row in rows:
+            system = systems.get(row.pop("system_id"))
+            if system is None:
+                errors.append(
+                    {
+                        "index": index,
+                        "errors": {
+                            "system_id": [self.error_messages["invalid_system"]]
+                        },
+                    }
+                )
+                continue
+
+            indexes.append(index)
+            measurements.append(HydroponicMeasurement(system=system, **row))
+
+        if settings.HYDROPONIC_INGEST_BUFFER:
+            buffer_measurements(measurements)
+        else:
+            with transaction.atomic():
+                HydroponicMeasurement.objects.bulk_create(measurements)
+                record_measurements(measurements)
+
+        return {
+            "created": [
+                {"index": index, "id": measurement.id}
+                for index, measurement in zip(indexes, measurements)
+            ],
+            "errors": sorted(errors, key=lambda error: error["index"]),
+        }
+
+
+@context_user_required
+class HydroponicDeviceKeySerializer(serializers.ModelSerializer):
+    system_id = serializers.PrimaryKeyRelatedField(
+        queryset=HydroponicSystem.objects.all(), source="system"
+    )
+    # Only present in the response creating the key.
+    key = serializers.CharField(read_only=True)
+
+    default_error_messages = {"invalid_system": _("Hydroponic system not found.")}
+
+    class Meta:
+        model = HydroponicDeviceKey
+        fields = (
+            "id",
+            "system_id",
+            "name",
+            "prefix",
+            "created_at",
+            "revoked_at",
+            "key",
+        )
+        read_only_fields = ("revoked_at",)
+
+    def validate_system_id(self, value: HydroponicSystem) -> HydroponicSystem:
+        if value.user_id != self.context_user.pk:
+            self.fail("invalid_system")
+
+        return value
+
+    def create(self, validated_data: OrderedDict, **kwargs) -> HydroponicDeviceKey:
+        device_key, device_key.key = create_device_key(**validated_data)
+        return device_key
+
+
+class HydroponicMeasurementAggregateQuerySerializer(serializers.Serializer):
+    bucket = serializers.ChoiceField(choices=AGGREGATE_BUCKETS, default="hour")
+
+
+class HydroponicMeasurementAggregateSerializer(serializers.Serializer):
+    bucket = serializers.DateTimeField()
+    count = serializers.IntegerField()
+    ph_min = serializers.DecimalField(max_digits=3, decimal_places=1)
+    ph_max = serializers.DecimalField(max_digits=3, decimal_places=1)
+    ph_avg = serializers.DecimalField(max_digits=4, decimal_places=2)
+    water_temperature_min = serializers.DecimalField(max_digits=4, decimal_places=1)
+    water_temperature_max = serializers.DecimalField(max_digits=4, decimal_places=1)
+    water_temperature_avg = serializers.DecimalField(max_digits=5, decimal_places=2)
+    tds_min = serializers.IntegerField()
+    tds_max = serializers.IntegerField()
+    tds_avg = serializers.DecimalField(max_digits=7, decimal_places=2)
+
+
+class HydroponicMeasurementSummarySerializer(HydroponicMeasurementAggregateSerializer):
+    bucket = None
+
+
+class HydroponicLatestMeasurementSerializer(MeasurementsForSystemSerializer):
+    class Meta(MeasurementsForSystemSerializer.Meta):
+        fields = MeasurementsForSystemSerializer.Meta.fields + ("created_at",)
+
+
+class HydroponicSystemDashboardSerializer(serializers.ModelSerializer):
+    """
+    A system with its newest reading and the aggregates of the last ``window``.
+
+    Both are read from attributes set by ``prefetch_latest_measurements`` and
+    ``prefetch_recent_aggregates``, so no query runs per system.
+    """
+
+    latest_measurement = serializers.SerializerMethodField()
+    last_24h = HydroponicMeasurementSummarySerializer(
+        source="recent_aggregates", read_only=True
+    )
+
+    window = dt.timedelta(hours=24)
+
+    class Meta:
+        model = HydroponicSystem
+        fields = ("id", "name", "description", "latest_measurement", "last_24h")
+
+    def get_latest_measurement(self, obj: HydroponicSystem) -> dict | None:
+        if not obj.latest_measurements:
+            return None
+
+        return HydroponicLatestMeasurementSerializer(obj.latest_measurements[0]).data
+
+
+@context_user_required
+class HydroponicMeasurementImportSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    system_id = serializers.PrimaryKeyRelatedField(
+        queryset=HydroponicSystem.objects.all(), required=False
+    )
+
+    default_error_messages = {"invalid_system": _("Hydroponic system not found.")}
+
+    def validate_system_id(self, value: HydroponicSystem) -> HydroponicSystem:
+        if value.user_id != self.context_user.pk:
+            self.fail("invalid_system")
+
+        return value
+
+    def create(self, validated_data: OrderedDict, **kwargs) -> dict:
+        # Decoded as it is read, the upload is never loaded into memory at once.
+        lines = io.TextIOWrapper(
+            validated_data["file"].file, encoding="utf-8-sig", newline=""
+        )
+        return MeasurementImport(
+            user=self.context_user, system=validated_data.get("system_id")
+        ).run(lines)
+
+
+class HydroponicMeasurementExportQuerySerializer(serializers.Serializer):
+    file_format = serializers.ChoiceField(choices=tuple(EXPORT_STREAMS), default="csv")
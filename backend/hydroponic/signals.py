@@ -0,0 +1,50 @@
+from django.core.cache import cache
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from hydroponic.authentication import forget_device_keys
+from hydroponic.authentication import get_device_key_cache_key
+from hydroponic.models import HydroponicDeviceKey
+from hydroponic.models import HydroponicMeasurement
+from hydroponic.models import HydroponicSystem
+from hydroponic.rollups import record_measurements
+from users.models import User
+
+
+@receiver(post_save, sender=HydroponicMeasurement)
+def record_measurement_rollups(
+    sender, instance: HydroponicMeasurement, created: bool, raw: bool, **kwargs
+):
+    # bulk_create skips signals, so batched paths call record_measurements directly.
+    if created and not raw:
+        record_measurements([instance])
+
+
+@receiver(post_save, sender=HydroponicDeviceKey)
+@receiver(post_delete, sender=HydroponicDeviceKey)
+def forget_device_key(sender, instance: HydroponicDeviceKey, **kwargs):
+    cache.delete(get_device_key_cache_key(instance.digest))
+
+
+@receiver(post_save, sender=HydroponicSystem)
+def forget_system_device_keys(
+    sender, instance: HydroponicSystem, created: bool, update_fields, **kwargs
+):
+    # Cached keys hold their system and its user, which may have changed.
+    if created or (
+        update_fields is not None and not {"user", "user_id"} & update_fields
+    ):
+        return
+
+    forget_device_keys(HydroponicDeviceKey.objects.filter(system=instance))
+
+
+@receiver(post_save, sender=User)
+def forget_user_device_keys(
+    sender, instance: User, created: bool, update_fields, **kwargs
+):
+    # Logins save ``last_login`` alone, only deactivations matter to keys.
+    if created or (update_fields is not None and "is_active" not in update_fields):
+        return
+
+    forget_device_keys(HydroponicDeviceKey.objects.filter(system__user=instance))
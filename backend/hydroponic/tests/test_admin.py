@@ -0,0 +1,138 @@
+import pytest
+from common.admin import estimate_count
+from common.admin import EstimatedCountPaginator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from hydroponic.models import HydroponicMeasurement
+
+pytestmark = pytest.mark.django_db
+
+CHANGELIST_URL = reverse("admin:hydroponic_hydroponicmeasurement_changelist")
+
+
+@pytest.fixture(autouse=True)
+def static_storage(settings):
+    # The manifest only exists once ``collectstatic`` ran.
+    settings.STATICFILES_STORAGE = (
+        "django.contrib.staticfiles.storage.StaticFilesStorage"
+    )
+
+
+def _analyze():
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {HydroponicMeasurement._meta.db_table}")
+
+
+def test_estimate_count_reads_table_statistics(hydroponic_measurement_factory):
+    hydroponic_measurement_factory.create_batch(5)
+    _analyze()
+
+    with CaptureQueriesContext(connection) as queries:
+        assert estimate_count(HydroponicMeasurement.objects.all()) == 5
+
+    assert "pg_class" in queries[0]["sql"]
+
+
+def test_estimate_count_explains_filtered_querysets(hydroponic_measurement_factory):
+    measurement = hydroponic_measurement_factory()
+    _analyze()
+
+    with CaptureQueriesContext(connection) as queries:
+        estimate_count(HydroponicMeasurement.objects.filter(system=measurement.system))
+
+    assert queries[0]["sql"].startswith("EXPLAIN")
+
+
+def test_paginator_counts_small_results_exactly(
+    monkeypatch, hydroponic_measurement_factory
+):
+    hydroponic_measurement_factory.create_batch(3)
+    queryset = HydroponicMeasurement.objects.order_by("-created_at", "-id")
+
+    # Before ANALYZE the statistics know of no rows.
+    assert EstimatedCountPaginator(queryset, 2).count == 3
+
+    _analyze()
+    monkeypatch.setattr(EstimatedCountPaginator, "exact_count_threshold", 1)
+    with CaptureQueriesContext(connection) as queries:
+        assert EstimatedCountPaginator(queryset, 2).count == 3
+
+    assert not any("COUNT(" in query["sql"] for query in queries)
+
+
+class TestHydroponicMeasurementAdmin:
+    def test_case_changelist_does_not_count_or_scan_dates(
+        self, admin_client, monkeypatch, hydroponic_measurement_factory
+    ):
+        hydroponic_measurement_factory.create_batch(3)
+        _analyze()
+        monkeypatch.setattr(EstimatedCountPaginator, "exact_count_threshold", 0)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.get(CHANGELIST_URL)
+
+        assert response.status_code == 200
+        assert len(response.context["cl"].result_list) == 3
+        sql = " ".join(query["sql"] for query in queries)
+        assert "COUNT(" not in sql
+        assert "DISTINCT" not in sql
+
+    def test_case_filters_only_load_the_selected_objects(
+        self,
+        admin_client,
+        hydroponic_system_factory,
+        hydroponic_measurement_factory,
+    ):
+        systems = hydroponic_system_factory.create_batch(3)
+        for system in systems:
+            hydroponic_measurement_factory(system=system)
+        selected = systems[0]
+
+        response = admin_client.get(
+            CHANGELIST_URL,
+            {
+                "system__id__exact": selected.id,
+                "system__user__id__exact": selected.user_id,
+            },
+        )
+
+        assert response.status_code == 200
+        assert [
+            measurement.system for measurement in response.context["cl"].result_list
+        ] == [selected]
+        content = response.content.decode()
+        assert "admin-autocomplete" in content
+        assert selected.name in content
+        assert systems[1].name not in content
+
+    def test_case_date_hierarchy_spans_the_first_and_last_rows(
+        self, admin_client, freezer, hydroponic_measurement_factory
+    ):
+        freezer.move_to("2024-01-30 12:00:00")
+        hydroponic_measurement_factory()
+        freezer.move_to("2024-03-02 12:00:00")
+        hydroponic_measurement_factory()
+
+        hierarchy = (
+            admin_client.get(CHANGELIST_URL, {"created_at__year": 2024})
+            .context["cl"]
+            .get_date_hierarchy()
+        )
+
+        assert [choice["title"] for choice in hierarchy["choices"]] == [
+            "January 2024",
+            "February 2024",
+            "March 2024",
+        ]
+
+        hierarchy = (
+            admin_client.get(
+                CHANGELIST_URL, {"created_at__year": 2024, "created_at__month": 3}
+            )
+            .context["cl"]
+            .get_date_hierarchy()
+        )
+
+        assert hierarchy["choices"][0]["title"] == "March 2"
+        assert len(hierarchy["choices"]) == 1
@@ -0,0 +1,51 @@
+import datetime as dt
+
+import pytest
+from django.test import Client
+from hydroponic.benchmarks import benchmark_route
+from hydroponic.benchmarks import BENCHMARK_ROUTES
+from hydroponic.benchmarks import get_context
+from hydroponic.benchmarks import get_route
+from hydroponic.benchmarks import list_routes
+from hydroponic.models import HydroponicMeasurement
+from hydroponic.models import HydroponicMeasurementDailyRollup
+from hydroponic.models import HydroponicSystem
+from hydroponic.seeds import seed_measurements
+
+pytestmark = pytest.mark.django_db
+
+
+def test_seed_measurements_generates_readings_of_every_system():
+    users = seed_measurements(
+        2, 3, 120, interval=dt.timedelta(minutes=30), email="seed-{}@test.local"
+    )
+
+    assert [user.email for user in users] == ["seed-0@test.local", "seed-1@test.local"]
+    assert HydroponicSystem.objects.filter(user__in=users).count() == 6
+    assert HydroponicMeasurement.objects.count() == 720
+    assert all(
+        0 <= measurement.ph <= 14 and measurement.tds >= 0
+        for measurement in HydroponicMeasurement.objects.all()
+    )
+    assert (
+        sum(HydroponicMeasurementDailyRollup.objects.values_list("readings", flat=True))
+        == 720
+    )
+
+
+def test_every_route_has_a_benchmark():
+    context = get_context(10, 1)
+
+    assert {get_route(route, context) for route in BENCHMARK_ROUTES} == list_routes()
+
+
+def test_benchmark_route_leaves_data_unchanged():
+    context = get_context(10, 1)
+    route = next(route for route in BENCHMARK_ROUTES if route.name == "systems-destroy")
+
+    result = benchmark_route(Client(), route, context, repeat=3, warmup=0)
+
+    assert result["status"] == [204]
+    assert result["queries"] > 0
+    assert result["p50_ms"] <= result["p99_ms"]
+    assert HydroponicSystem.objects.filter(pk=context["system"]).exists()
@@ -0,0 +1,54 @@
+import logging
+
+import pytest
+from common.budgets import QueryBudgetExceeded
+from hydroponic.views import HydroponicSystemViewSet
+from rest_framework import status
+
+pytestmark = pytest.mark.django_db
+
+ENDPOINT = "/hydroponic/systems/"
+
+
+@pytest.fixture
+def tight_budget(mocker):
+    mocker.patch.object(HydroponicSystemViewSet, "query_budgets", {"list": 1})
+
+
+def test_exceeded_budget_raises(api_client, user, settings, tight_budget):
+    settings.QUERY_BUDGET_MODE = "raise"
+    api_client.force_authenticate(user=user)
+
+    with pytest.raises(QueryBudgetExceeded, match="systems-list ran 2 queries"):
+        api_client.get(ENDPOINT)
+
+
+def test_exceeded_budget_is_logged(api_client, user, settings, tight_budget, caplog):
+    settings.QUERY_BUDGET_MODE = "log"
+    api_client.force_authenticate(user=user)
+
+    with caplog.at_level(logging.WARNING, logger="common.budgets"):
+        response = api_client.get(ENDPOINT)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert caplog.messages == ["systems-list ran 2 queries, its budget is 1."]
+
+
+def test_budgets_can_be_turned_off(api_client, user, settings, tight_budget, caplog):
+    settings.QUERY_BUDGET_MODE = "off"
+    api_client.force_authenticate(user=user)
+
+    response = api_client.get(ENDPOINT)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not caplog.records
+
+
+def test_actions_without_budget_are_unbounded(api_client, user, settings, mocker):
+    settings.QUERY_BUDGET_MODE = "raise"
+    mocker.patch.object(HydroponicSystemViewSet, "query_budgets", {"retrieve": 0})
+    api_client.force_authenticate(user=user)
+
+    response = api_client.get(ENDPOINT)
+
+    assert response.status_code == status.HTTP_200_OK
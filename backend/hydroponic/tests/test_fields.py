@@ -0,0 +1,93 @@
+from decimal import Decimal
+
+import pytest
+from common.fields import ScaledAvg
+from common.fields import ScaledDecimalField
+from django.db import connection
+from django.db.models import ExpressionWrapper
+from django.db.models import F
+from hydroponic.models import HydroponicMeasurement
+from hydroponic.models import HydroponicMeasurementHourlyRollup
+from hydroponic.queries import aggregate_measurements
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.mark.parametrize(
+    "max_digits, db_type", [(3, "smallint"), (9, "integer"), (16, "bigint")]
+)
+def test_scaled_decimal_column_is_the_smallest_integer_fitting(max_digits, db_type):
+    field = ScaledDecimalField(max_digits=max_digits, decimal_places=1)
+
+    assert field.db_type(connection) == db_type
+
+
+def test_scaled_decimal_rejects_more_digits_than_bigint_holds():
+    field = ScaledDecimalField(max_digits=19, decimal_places=1)
+    field.set_attributes_from_name("value")
+
+    assert [error.id for error in field.check()] == ["common.E001"]
+
+
+def test_metrics_are_stored_as_scaled_integers(hydroponic_measurement_factory):
+    measurement = hydroponic_measurement_factory(
+        ph=Decimal("6.5"), water_temperature=Decimal("-0.5")
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT ph, water_temperature FROM hydroponic_hydroponicmeasurement "
+            "WHERE id = %s",
+            [measurement.id],
+        )
+        assert cursor.fetchone() == (65, -5)
+        cursor.execute(
+            "SELECT sum_ph, min_water_temperature "
+            "FROM hydroponic_hydroponicmeasurementhourlyrollup"
+        )
+        assert cursor.fetchone() == (65, -5)
+
+    stored = HydroponicMeasurement.objects.values("ph", "water_temperature").get()
+    assert stored == {"ph": Decimal("6.5"), "water_temperature": Decimal("-0.5")}
+    assert str(stored["ph"]) == "6.5"
+    assert HydroponicMeasurementHourlyRollup.objects.get().sum_ph == Decimal("6.5")
+
+
+@pytest.mark.parametrize(
+    "lookup, expected",
+    [
+        ({"ph__gt": "6.55"}, ["6.6"]),
+        ({"ph__gte": "6.5"}, ["6.5", "6.6"]),
+        ({"ph__lt": 6.55}, ["6.5"]),
+        ({"ph": Decimal("6.6")}, ["6.6"]),
+    ],
+)
+def test_lookups_compare_unscaled_values(
+    hydroponic_measurement_factory, lookup, expected
+):
+    for ph in ("6.5", "6.6"):
+        hydroponic_measurement_factory(ph=Decimal(ph))
+
+    values = HydroponicMeasurement.objects.filter(**lookup).order_by("ph")
+
+    assert [str(ph) for ph in values.values_list("ph", flat=True)] == expected
+
+
+def test_averages_and_arithmetic_return_unscaled_values(
+    hydroponic_measurement_factory,
+):
+    for ph in ("6.5", "7.5"):
+        hydroponic_measurement_factory(ph=Decimal(ph))
+    queryset = HydroponicMeasurement.objects.all()
+    field = HydroponicMeasurement._meta.get_field("ph")
+
+    assert queryset.aggregate(ph=ScaledAvg("ph"))["ph"] == Decimal("7.0")
+    doubled = queryset.annotate(
+        doubled=ExpressionWrapper(F("ph") * 2, output_field=field)
+    ).order_by("doubled")
+    assert list(doubled.values_list("doubled", flat=True)) == [
+        Decimal("13.0"),
+        Decimal("15.0"),
+    ]
+    buckets = aggregate_measurements(queryset, "day")
+    assert [bucket["ph_avg"] for bucket in buckets] == [Decimal("7.0")]
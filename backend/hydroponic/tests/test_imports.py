@@ -0,0 +1,177 @@
+import datetime
+import io
+from decimal import Decimal
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from hydroponic.models import HydroponicMeasurement
+from hydroponic.models import HydroponicMeasurementDailyRollup
+from rest_framework import status
+
+pytestmark = pytest.mark.django_db
+
+ENDPOINT = "/hydroponic/measurements/import/"
+
+
+def upload(content: str) -> SimpleUploadedFile:
+    return SimpleUploadedFile("measurements.csv", content.encode(), "text/csv")
+
+
+def test_upload_imports_valid_lines_and_reports_the_rest(
+    api_client, hydroponic_system, hydroponic_system_factory, settings
+):
+    settings.HYDROPONIC_IMPORT_BATCH_SIZE = 2
+    other_system = hydroponic_system_factory()
+    api_client.force_authenticate(user=hydroponic_system.user)
+    content = (
+        "system_id,ph,water_temperature,tds,created_at\n"
+        f"{hydroponic_system.id},6.5,21.0,400,2023-01-01T10:00:00Z\n"
+        f"{hydroponic_system.id},15,21.0,400,2023-01-01T11:00:00Z\n"
+        f"{other_system.id},6.5,21.0,400,2023-01-01T12:00:00Z\n"
+        f"{hydroponic_system.id},7.0,22.5,-1,yesterday\n"
+        f"{hydroponic_system.id},7.5,23.0,410,2023-01-02 10:00:00\n"
+    )
+
+    response = api_client.post(ENDPOINT, {"file": upload(content)}, format="multipart")
+    result = response.json()
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert result["imported"] == 2
+    assert result["error_count"] == 3
+    assert [error["line"] for error in result["errors"]] == [3, 4, 5]
+    assert result["errors"][0]["errors"] == {
+        "ph": ["Ensure this value is less than or equal to 14."]
+    }
+    assert result["errors"][1]["errors"] == {
+        "system_id": ["Hydroponic system not found."]
+    }
+    assert set(result["errors"][2]["errors"]) == {"tds", "created_at"}
+    assert list(
+        HydroponicMeasurement.objects.order_by("created_at").values_list(
+            "system_id", "ph", "created_at__date"
+        )
+    ) == [
+        (hydroponic_system.id, Decimal("6.5"), datetime.date(2023, 1, 1)),
+        (hydroponic_system.id, Decimal("7.5"), datetime.date(2023, 1, 2)),
+    ]
+    assert HydroponicMeasurementDailyRollup.objects.count() == 2
+
+
+def test_upload_with_truncated_lines_reports_required_columns(
+    api_client, hydroponic_system
+):
+    api_client.force_authenticate(user=hydroponic_system.user)
+    content = (
+        "system_id,ph,water_temperature,tds,created_at\n"
+        f"{hydroponic_system.id},6.5,21.0,400\n"
+        f"{hydroponic_system.id},6.5,,400,\n"
+        f"{hydroponic_system.id},7.0,22.5,410,2023-01-01T10:00:00Z\n"
+    )
+
+    response = api_client.post(ENDPOINT, {"file": upload(content)}, format="multipart")
+    result = response.json()
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert result["imported"] == 1
+    assert result["errors"] == [
+        {"line": 2, "errors": {"created_at": ["This field is required."]}},
+        {
+            "line": 3,
+            "errors": {
+                "water_temperature": ["This field is required."],
+                "created_at": ["This field is required."],
+            },
+        },
+    ]
+    assert HydroponicMeasurement.objects.get().ph == Decimal("7.0")
+
+
+def test_upload_with_system_parameter_needs_no_system_column(
+    api_client, hydroponic_system
+):
+    api_client.force_authenticate(user=hydroponic_system.user)
+
+    response = api_client.post(
+        ENDPOINT,
+        {
+            "file": upload(
+                "ph,water_temperature,tds,created_at\n6.5,21,400,2023-01-01\n"
+            ),
+            "system_id": str(hydroponic_system.id),
+        },
+        format="multipart",
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert HydroponicMeasurement.objects.get().system == hydroponic_system
+
+
+def test_upload_with_not_owned_system_return_error(
+    api_client, user, hydroponic_system_factory
+):
+    api_client.force_authenticate(user=user)
+
+    response = api_client.post(
+        ENDPOINT,
+        {
+            "file": upload("ph,water_temperature,tds,created_at\n"),
+            "system_id": str(hydroponic_system_factory().id),
+        },
+        format="multipart",
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {"system_id": ["Hydroponic system not found."]}
+
+
+def test_upload_with_missing_columns_return_error(api_client, user):
+    api_client.force_authenticate(user=user)
+
+    response = api_client.post(
+        ENDPOINT, {"file": upload("ph,tds\n7,100\n")}, format="multipart"
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {
+        "file": ["Missing columns: water_temperature, created_at."]
+    }
+
+
+def test_command_imports_file(hydroponic_system, tmp_path):
+    path = tmp_path / "measurements.csv"
+    path.write_text(
+        "id,system_id,ph,water_temperature,tds,created_at\n"
+        f"ignored,{hydroponic_system.id},6.5,21.0,400,2023-01-01T10:00:00Z\n"
+        f"ignored,{hydroponic_system.id},6.5,21.0,,2023-01-01T10:00:00Z\n"
+    )
+    stdout, stderr = io.StringIO(), io.StringIO()
+
+    call_command(
+        "import_measurements",
+        str(path),
+        "--user",
+        hydroponic_system.user.email,
+        stdout=stdout,
+        stderr=stderr,
+    )
+
+    assert HydroponicMeasurement.objects.count() == 1
+    assert "Imported 1 measurements, 1 lines rejected." in stdout.getvalue()
+    assert stderr.getvalue().startswith("Line 3:")
+
+
+def test_command_with_unknown_system_fails(user, tmp_path, hydroponic_system_factory):
+    path = tmp_path / "measurements.csv"
+    path.write_text("ph,water_temperature,tds,created_at\n")
+
+    with pytest.raises(CommandError):
+        call_command(
+            "import_measurements",
+            str(path),
+            "--user",
+            user.email,
+            "--system",
+            str(hydroponic_system_factory().id),
+        )
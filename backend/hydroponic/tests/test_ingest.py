@@ -0,0 +1,162 @@
+import io
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from hydroponic.ingest import copy_measurements
+from hydroponic.ingest import encode_measurement
+from hydroponic.ingest import MeasurementSpool
+from hydroponic.models import HydroponicMeasurement
+from hydroponic.models import HydroponicMeasurementHourlyRollup
+from rest_framework import status
+
+pytestmark = pytest.mark.django_db
+
+ENDPOINT = "/hydroponic/measurements/"
+
+
+@pytest.fixture
+def buffered(settings, tmp_path):
+    settings.HYDROPONIC_INGEST_BUFFER = True
+    settings.HYDROPONIC_INGEST_SPOOL_DIR = tmp_path
+    settings.HYDROPONIC_INGEST_FSYNC = False
+    return MeasurementSpool(tmp_path)
+
+
+def payload(system, ph="6.5") -> dict:
+    return {
+        "system_id": str(system.id),
+        "ph": ph,
+        "water_temperature": "21.0",
+        "tds": 400,
+    }
+
+
+def test_copy_measurements_skips_rows_already_stored(hydroponic_system):
+    measurement = HydroponicMeasurement(
+        system=hydroponic_system,
+        ph=Decimal("6.5"),
+        water_temperature=Decimal("21.0"),
+        tds=400,
+    )
+    measurement.created_at = measurement.updated_at = "2024-05-31T10:25:00Z"
+    lines = encode_measurement(measurement)
+
+    inserted = copy_measurements(io.StringIO(lines))
+    replayed = copy_measurements(io.StringIO(lines))
+
+    assert [row.id for row in inserted] == [measurement.id]
+    assert inserted[0].ph == Decimal("6.5")
+    assert replayed == []
+    assert HydroponicMeasurementHourlyRollup.objects.get().readings == 1
+
+
+def test_created_measurement_is_acknowledged_before_insert(
+    api_client, hydroponic_system, buffered
+):
+    api_client.force_authenticate(user=hydroponic_system.user)
+
+    response = api_client.post(ENDPOINT, payload(hydroponic_system), format="json")
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert not HydroponicMeasurement.objects.exists()
+    assert buffered.size() > 0
+
+    call_command("flush_measurement_buffer")
+
+    measurement = HydroponicMeasurement.objects.get()
+    assert str(measurement.id) == response.json()["id"]
+    assert measurement.ph == Decimal("6.5")
+    assert buffered.size() == 0
+    assert HydroponicMeasurementHourlyRollup.objects.get().readings == 1
+
+
+def test_bulk_created_measurements_are_spooled(api_client, hydroponic_system, buffered):
+    api_client.force_authenticate(user=hydroponic_system.user)
+
+    response = api_client.post(
+        f"{ENDPOINT}bulk/",
+        {"measurements": [payload(hydroponic_system)] * 3},
+        format="json",
+    )
+    buffered.flush()
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert HydroponicMeasurement.objects.count() == 3
+
+
+def test_spool_is_flushed_once_size_threshold_is_reached(
+    api_client, hydroponic_system, buffered, settings
+):
+    settings.HYDROPONIC_INGEST_FLUSH_SIZE = 1
+    api_client.force_authenticate(user=hydroponic_system.user)
+
+    response = api_client.post(ENDPOINT, payload(hydroponic_system), format="json")
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert HydroponicMeasurement.objects.count() == 1
+    assert buffered.size() == 0
+
+
+def test_full_spool_rejects_measurements(
+    api_client, hydroponic_system, buffered, settings
+):
+    settings.HYDROPONIC_INGEST_MAX_BUFFER = 200
+    api_client.force_authenticate(user=hydroponic_system.user)
+
+    accepted = api_client.post(ENDPOINT, payload(hydroponic_system), format="json")
+    rejected = api_client.post(ENDPOINT, payload(hydroponic_system), format="json")
+
+    assert accepted.status_code == status.HTTP_202_ACCEPTED
+    assert rejected.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert rejected["Retry-After"] == "1"
+
+    buffered.flush()
+    retried = api_client.post(ENDPOINT, payload(hydroponic_system), format="json")
+
+    assert retried.status_code == status.HTTP_202_ACCEPTED
+
+
+def test_copy_measurements_drops_rows_of_deleted_systems(hydroponic_system):
+    measurement = HydroponicMeasurement(
+        system=hydroponic_system,
+        ph=Decimal("6.5"),
+        water_temperature=Decimal("21.0"),
+        tds=400,
+    )
+    measurement.created_at = measurement.updated_at = "2024-05-31T10:25:00Z"
+    lines = encode_measurement(measurement)
+    hydroponic_system.delete()
+
+    assert copy_measurements(io.StringIO(lines)) == []
+    assert not HydroponicMeasurement.objects.exists()
+
+
+def test_failing_batch_is_quarantined_and_later_batches_flushed(
+    api_client, hydroponic_system, buffered
+):
+    api_client.force_authenticate(user=hydroponic_system.user)
+    (buffered.directory / "measurements.1.batch").write_text("not,a,measurement\n")
+
+    response = api_client.post(ENDPOINT, payload(hydroponic_system), format="json")
+    flushed = buffered.flush()
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert flushed == 1
+    assert HydroponicMeasurement.objects.count() == 1
+    assert buffered.batches() == []
+    assert (buffered.directory / "measurements.1.batch.failed").exists()
+    assert buffered.size() == 0
+
+
+def test_failing_size_triggered_flush_still_accepts_measurement(
+    api_client, hydroponic_system, buffered, settings, mocker
+):
+    settings.HYDROPONIC_INGEST_FLUSH_SIZE = 1
+    mocker.patch.object(MeasurementSpool, "rotate", side_effect=OSError)
+    api_client.force_authenticate(user=hydroponic_system.user)
+
+    response = api_client.post(ENDPOINT, payload(hydroponic_system), format="json")
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert buffered.size() > 0
@@ -0,0 +1,59 @@
+import datetime as dt
+import io
+import uuid
+from collections import OrderedDict
+from decimal import Decimal
+
+import pytest
+from common.parsers import ORJSONParser
+from common.renderers import ORJSONRenderer
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+DATA = [
+    None,
+    {"id": uuid.UUID("6f1c0e0a-7a4e-4d4b-9a55-1f1e1f1e1f1e"), "ph": Decimal("6.5")},
+    OrderedDict(results=[1, 2.5, True, "Ünïcode", "line\u2028separator\u2029"]),
+    {"at": dt.datetime(2024, 5, 31, 10, 25, 0, 123456, tzinfo=dt.timezone.utc)},
+    {"at": dt.datetime(2024, 5, 31, 10, 25, tzinfo=dt.timezone(dt.timedelta(hours=2)))},
+    {"at": dt.datetime(2024, 5, 31, 10, 25), "day": dt.date(2024, 5, 31)},
+    {"at": dt.time(10, 25, 0, 500)},
+    {"detail": _("Not found."), 1: [], "empty": {}},
+    {"big": 2**70},
+]
+
+
+@pytest.mark.parametrize("data", DATA)
+@pytest.mark.parametrize("media_type", [None, "application/json; indent=2"])
+def test_renderer_output_matches_json_renderer(data, media_type):
+    assert ORJSONRenderer().render(data, media_type) == (
+        JSONRenderer().render(data, media_type)
+    )
+
+
+def test_renderer_falls_back_for_other_indents():
+    data = {"results": [{"ph": "6.5"}]}
+
+    assert ORJSONRenderer().render(data, renderer_context={"indent": 4}) == (
+        JSONRenderer().render(data, renderer_context={"indent": 4})
+    )
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b'{"ph": "6.5", "tds": 400, "list": [1.5, null]}',
+        b'{"big": 1180591620717411303424}',
+    ],
+)
+def test_parser_output_matches_json_parser(body):
+    assert ORJSONParser().parse(io.BytesIO(body)) == (
+        JSONParser().parse(io.BytesIO(body))
+    )
+
+
+def test_parser_rejects_invalid_json():
+    with pytest.raises(ParseError, match="JSON parse error"):
+        ORJSONParser().parse(io.BytesIO(b'{"ph": NaN}'))
@@ -0,0 +1,97 @@
+import logging
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from prometheus_client import REGISTRY
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+pytestmark = pytest.mark.django_db
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_requests_are_recorded_per_viewset_action(api_client, hydroponic_system):
+    api_client.force_authenticate(user=hydroponic_system.user)
+    labels = {"view": "systems-retrieve"}
+    requests = sample("http_requests_total", method="GET", status="200", **labels)
+    queries = sample("http_request_db_queries_sum", **labels)
+    sizes = sample("http_response_size_bytes_count", **labels)
+
+    response = api_client.get(f"/hydroponic/systems/{hydroponic_system.id}/")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert sample("http_requests_total", method="GET", status="200", **labels) == (
+        requests + 1
+    )
+    assert sample("http_request_db_queries_sum", **labels) > queries
+    assert sample("http_response_size_bytes_count", **labels) == sizes + 1
+    assert sample("http_request_duration_seconds_count", method="GET", **labels) >= 1
+
+
+def test_asgi_requests_pass_async_middleware(hydroponic_measurement, settings, caplog):
+    # Django only logs middleware adapted to the handler's mode when debugging.
+    settings.DEBUG = True
+    user = hydroponic_measurement.system.user
+    client = AsyncClient(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+    labels = {"view": "hydroponic:measurements-async"}
+    queries = sample("http_request_db_queries_sum", **labels)
+
+    async def get():
+        return await client.get("/hydroponic/async/measurements/")
+
+    with caplog.at_level(logging.DEBUG, logger="django.request"):
+        response = async_to_sync(get)()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not [
+        record.getMessage()
+        for record in caplog.records
+        if "adapted" in record.getMessage()
+    ]
+    assert sample("http_request_db_queries_sum", **labels) > queries
+
+
+def test_unmatched_requests_share_one_label(api_client):
+    before = sample("http_requests_total", view="unmatched", method="GET", status="404")
+
+    api_client.get("/does-not-exist/")
+
+    assert sample(
+        "http_requests_total", view="unmatched", method="GET", status="404"
+    ) == (before + 1)
+
+
+def test_metrics_are_exposed_in_prometheus_format(api_client, hydroponic_system):
+    api_client.force_authenticate(user=hydroponic_system.user)
+    api_client.get("/hydroponic/measurements/")
+
+    response = api_client.get("/metrics")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"].startswith("text/plain")
+    assert (
+        'http_request_db_queries_count{view="measurements-list"}'
+        in response.content.decode()
+    )
+
+
+def test_metrics_are_hidden_from_other_networks(api_client):
+    response = api_client.get("/metrics", REMOTE_ADDR="203.0.113.7")
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_metrics_require_configured_token(api_client, settings):
+    settings.METRICS_TOKEN = "scraper-token"
+
+    missing = api_client.get("/metrics")
+    wrong = api_client.get("/metrics", HTTP_AUTHORIZATION="Bearer other")
+    response = api_client.get("/metrics", HTTP_AUTHORIZATION="Bearer scraper-token")
+
+    assert missing.status_code == status.HTTP_403_FORBIDDEN
+    assert wrong.status_code == status.HTTP_403_FORBIDDEN
+    assert response.status_code == status.HTTP_200_OK
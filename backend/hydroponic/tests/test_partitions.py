@@ -0,0 +1,85 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from hydroponic.models import HydroponicMeasurement
+from hydroponic.models import HydroponicMeasurementDailyRollup
+from hydroponic.partitions import DEFAULT_PARTITION
+from hydroponic.partitions import list_partitions
+
+pytestmark = pytest.mark.django_db
+
+
+def partition_of(measurement: HydroponicMeasurement) -> str:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT tableoid::regclass::text FROM "
+            f"{HydroponicMeasurement._meta.db_table} WHERE id = %s",
+            [measurement.id],
+        )
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.freeze_time("2024-05-31T10:25:00Z")
+def test_command_creates_partitions_and_moves_default_rows(hydroponic_measurement):
+    assert partition_of(hydroponic_measurement) == DEFAULT_PARTITION
+
+    call_command("manage_measurement_partitions", "--months-ahead", "2")
+
+    assert partition_of(hydroponic_measurement).endswith("_p2024_05")
+    assert {name[-7:] for name in list_partitions() if name[-7:] >= "2024_05"} >= {
+        "2024_05",
+        "2024_06",
+        "2024_07",
+    }
+
+
+@pytest.mark.freeze_time("2024-05-31T10:25:00Z")
+def test_filtered_queries_are_pruned_to_matching_partitions(hydroponic_measurement):
+    call_command("manage_measurement_partitions")
+
+    queryset = HydroponicMeasurement.objects.filter(
+        created_at__gte="2024-05-02T00:00:00Z", created_at__lt="2024-05-03T00:00:00Z"
+    )
+    plan = queryset.explain()
+
+    assert "_p2024_05" in plan
+    assert "_p2024_06" not in plan
+    assert DEFAULT_PARTITION not in plan
+
+
+def test_command_detaches_old_partitions(
+    hydroponic_measurement_factory, hydroponic_system, freezer
+):
+    freezer.move_to("2024-04-15T10:00:00Z")
+    old_measurement = hydroponic_measurement_factory(system=hydroponic_system)
+    call_command("manage_measurement_partitions", "--months-ahead", "0")
+    freezer.move_to("2024-05-15T10:00:00Z")
+    measurement = hydroponic_measurement_factory(system=hydroponic_system)
+    call_command(
+        "manage_measurement_partitions",
+        "--detach-before",
+        "2024-05-01",
+        "--drop",
+    )
+
+    assert not HydroponicMeasurement.objects.filter(id=old_measurement.id).exists()
+    assert HydroponicMeasurement.objects.filter(id=measurement.id).exists()
+    assert HydroponicMeasurementDailyRollup.objects.filter(
+        bucket="2024-04-15T00:00:00Z"
+    ).exists()
+
+
+def test_command_backfills_months_left_in_default_partition(
+    hydroponic_measurement_factory, hydroponic_system, freezer
+):
+    freezer.move_to("2024-05-15T10:00:00Z")
+    call_command("manage_measurement_partitions", "--months-ahead", "0")
+    freezer.move_to("2023-11-20T10:00:00Z")
+    old_measurement = hydroponic_measurement_factory(system=hydroponic_system)
+    freezer.move_to("2024-05-15T10:00:00Z")
+
+    call_command("manage_measurement_partitions", "--months-ahead", "0")
+    assert partition_of(old_measurement) == DEFAULT_PARTITION
+
+    call_command("manage_measurement_partitions", "--months-ahead", "0", "--backfill")
+    assert partition_of(old_measurement).endswith("_p2023_11")
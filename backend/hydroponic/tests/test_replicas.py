@@ -0,0 +1,151 @@
+import pytest
+from asgiref.sync import async_to_sync
+from asgiref.sync import sync_to_async
+from common import routers as common_routers
+from common.checks import check_replica_cache
+from common.middleware import ReplicaRoutingMiddleware
+from common.routers import ReplicaRouter
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory
+from hydroponic.models import HydroponicMeasurement
+from hydroponic.views import HydroponicMeasurementViewSet
+from users.views import CurrentUserView
+
+AUTHORIZATION = "Bearer token"
+
+
+@pytest.fixture
+def replicas(settings, tmp_path):
+    settings.DATABASE_REPLICAS = ["replica_0"]
+    # Pins must reach every process, a per-process cache disables replicas.
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": tmp_path,
+        }
+    }
+
+
+def serve(
+    method: str, view, status: int = 200, authorization: str = AUTHORIZATION
+) -> str:
+    """Runs ``view`` through the middleware, returns the alias it read from."""
+    used = []
+
+    def get_response(request):
+        middleware.process_view(request, view, (), {})
+        used.append(ReplicaRouter().db_for_read(HydroponicMeasurement))
+        return HttpResponse(status=status)
+
+    middleware = ReplicaRoutingMiddleware(get_response)
+    request = RequestFactory().generic(method, "/", HTTP_AUTHORIZATION=authorization)
+    middleware(request)
+
+    return used[0]
+
+
+def aserve(method: str, view, status: int = 200) -> str:
+    """``serve`` under ASGI, hooks and queries run in threads as Django runs them."""
+    used = []
+
+    async def get_response(request):
+        await sync_to_async(middleware.process_view)(request, view, (), {})
+        used.append(
+            await sync_to_async(ReplicaRouter().db_for_read)(HydroponicMeasurement)
+        )
+        return HttpResponse(status=status)
+
+    middleware = ReplicaRoutingMiddleware(get_response)
+    request = RequestFactory().generic(method, "/", HTTP_AUTHORIZATION=AUTHORIZATION)
+    async_to_sync(middleware)(request)
+
+    return used[0]
+
+
+def test_safe_requests_read_from_replica(replicas):
+    list_view = HydroponicMeasurementViewSet.as_view({"get": "list"})
+
+    assert serve("GET", list_view) == "replica_0"
+    assert serve("GET", CurrentUserView.as_view()) == "replica_0"
+    assert ReplicaRouter().db_for_read(HydroponicMeasurement) == "default"
+
+
+def test_other_views_read_from_primary(replicas):
+    def view(request):
+        return HttpResponse()
+
+    assert serve("GET", view) == "default"
+
+
+def test_unsafe_requests_read_from_primary(replicas):
+    create_view = HydroponicMeasurementViewSet.as_view({"post": "create"})
+
+    assert serve("POST", create_view, status=201) == "default"
+
+
+def test_client_is_pinned_to_primary_after_write(replicas):
+    list_view = HydroponicMeasurementViewSet.as_view({"get": "list"})
+    create_view = HydroponicMeasurementViewSet.as_view({"post": "create"})
+
+    serve("POST", create_view, status=201)
+
+    assert serve("GET", list_view) == "default"
+    assert serve("GET", list_view, authorization="Bearer other") == "replica_0"
+
+    cache.clear()
+
+    assert serve("GET", list_view) == "replica_0"
+
+
+def test_failed_write_does_not_pin_client(replicas):
+    list_view = HydroponicMeasurementViewSet.as_view({"get": "list"})
+    create_view = HydroponicMeasurementViewSet.as_view({"post": "create"})
+
+    serve("POST", create_view, status=400)
+
+    assert serve("GET", list_view) == "replica_0"
+
+
+def test_async_requests_are_routed_and_pinned(replicas):
+    list_view = HydroponicMeasurementViewSet.as_view({"get": "list"})
+    create_view = HydroponicMeasurementViewSet.as_view({"post": "create"})
+
+    assert aserve("GET", list_view) == "replica_0"
+    assert common_routers.replica_alias.get() is None
+    assert aserve("POST", create_view, status=201) == "default"
+    assert aserve("GET", list_view) == "default"
+
+
+def test_without_replicas_everything_reads_from_primary(settings):
+    settings.DATABASE_REPLICAS = []
+    list_view = HydroponicMeasurementViewSet.as_view({"get": "list"})
+
+    assert serve("GET", list_view) == "default"
+
+
+def test_process_local_cache_keeps_reads_on_primary(settings):
+    settings.DATABASE_REPLICAS = ["replica_0"]
+    list_view = HydroponicMeasurementViewSet.as_view({"get": "list"})
+
+    assert serve("GET", list_view) == "default"
+    assert [error.id for error in check_replica_cache(None)] == ["common.E002"]
+
+
+def test_shared_cache_passes_replica_check(replicas):
+    assert check_replica_cache(None) == []
+
+
+@pytest.mark.django_db
+def test_router_keeps_writes_and_transactions_on_primary(replicas):
+    router = ReplicaRouter()
+    token = common_routers.replica_alias.set("replica_0")
+    try:
+        assert router.db_for_write(HydroponicMeasurement) == "default"
+        with transaction.atomic():
+            assert router.db_for_read(HydroponicMeasurement) == "default"
+    finally:
+        common_routers.replica_alias.reset(token)
+
+    assert router.allow_migrate("replica_0", "hydroponic") is False
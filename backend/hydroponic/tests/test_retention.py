@@ -0,0 +1,188 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from hydroponic.models import HydroponicMeasurement
+from hydroponic.models import HydroponicMeasurementHourlyRollup
+from hydroponic.models import HydroponicRetentionPolicy
+from rest_framework import status
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def measurements(hydroponic_system, hydroponic_measurement_factory, freezer):
+    readings = [
+        ("2024-05-01T10:05:00Z", "6.0", "20.0", 100),
+        ("2024-05-01T10:45:00Z", "7.0", "21.0", 201),
+        ("2024-05-02T11:10:00Z", "8.0", "24.0", 300),
+        ("2024-05-30T09:00:00Z", "5.5", "19.5", 150),
+    ]
+    for created_at, ph, water_temperature, tds in readings:
+        freezer.move_to(created_at)
+        hydroponic_measurement_factory(
+            system=hydroponic_system,
+            ph=Decimal(ph),
+            water_temperature=Decimal(water_temperature),
+            tds=tds,
+        )
+
+    freezer.move_to("2024-05-31T12:00:00Z")
+    return hydroponic_system
+
+
+def test_command_downsamples_measurements_past_retention(measurements, settings):
+    settings.HYDROPONIC_RAW_RETENTION_DAYS = 10
+    hourly = list(HydroponicMeasurementHourlyRollup.objects.values())
+
+    call_command("enforce_measurement_retention")
+    measurements.refresh_from_db()
+
+    assert list(
+        HydroponicMeasurement.objects.order_by("created_at").values_list(
+            "created_at", "ph", "water_temperature", "tds", "readings"
+        )
+    ) == [
+        (
+            datetime.datetime(2024, 5, 1, 10, tzinfo=datetime.timezone.utc),
+            Decimal("6.5"),
+            Decimal("20.5"),
+            151,
+            2,
+        ),
+        (
+            datetime.datetime(2024, 5, 2, 11, tzinfo=datetime.timezone.utc),
+            Decimal("8.0"),
+            Decimal("24.0"),
+            300,
+            1,
+        ),
+        (
+            datetime.datetime(2024, 5, 30, 9, tzinfo=datetime.timezone.utc),
+            Decimal("5.5"),
+            Decimal("19.5"),
+            150,
+            1,
+        ),
+    ]
+    assert measurements.downsampled_before == datetime.datetime(
+        2024, 5, 21, tzinfo=datetime.timezone.utc
+    )
+    assert list(HydroponicMeasurementHourlyRollup.objects.values()) == hourly
+
+
+def test_command_is_idempotent(measurements, settings):
+    settings.HYDROPONIC_RAW_RETENTION_DAYS = 10
+
+    call_command("enforce_measurement_retention")
+    call_command("enforce_measurement_retention")
+
+    assert HydroponicMeasurement.objects.count() == 3
+
+
+def test_system_policy_overrides_global_retention(measurements, settings):
+    settings.HYDROPONIC_RAW_RETENTION_DAYS = 10
+    HydroponicRetentionPolicy.objects.create(
+        system=measurements, raw_retention_days=None
+    )
+
+    call_command("enforce_measurement_retention")
+    measurements.refresh_from_db()
+
+    assert HydroponicMeasurement.objects.filter(readings=1).count() == 4
+    assert measurements.downsampled_before is None
+
+
+def test_rebuild_keeps_rollups_of_downsampled_days(measurements, settings):
+    settings.HYDROPONIC_RAW_RETENTION_DAYS = 10
+    call_command("enforce_measurement_retention")
+    hourly = list(
+        HydroponicMeasurementHourlyRollup.objects.order_by("bucket").values_list(
+            "bucket", "readings", "min_tds", "max_tds"
+        )
+    )
+
+    call_command("rebuild_measurement_rollups")
+
+    assert (
+        list(
+            HydroponicMeasurementHourlyRollup.objects.order_by("bucket").values_list(
+                "bucket", "readings", "min_tds", "max_tds"
+            )
+        )
+        == hourly
+    )
+
+
+def test_list_serves_downsampled_measurements(api_client, measurements, settings):
+    settings.HYDROPONIC_RAW_RETENTION_DAYS = 10
+    call_command("enforce_measurement_retention")
+    api_client.force_authenticate(user=measurements.user)
+
+    response = api_client.get(
+        "/hydroponic/measurements/",
+        {"created_at__lt": "2024-05-02T00:00:00Z"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [
+        (row["ph"], row["water_temperature"], row["tds"])
+        for row in response.json()["results"]
+    ] == [("6.5", "20.5", 151)]
+
+
+def test_short_range_aggregation_of_downsampled_days_reads_rollups(
+    api_client, measurements, settings
+):
+    settings.HYDROPONIC_RAW_RETENTION_DAYS = 10
+    call_command("enforce_measurement_retention")
+    api_client.force_authenticate(user=measurements.user)
+
+    response = api_client.get(
+        "/hydroponic/measurements/aggregate/",
+        {
+            "bucket": "hour",
+            "created_at__gte": "2024-05-01T00:00:00Z",
+            "created_at__lt": "2024-05-02T00:00:00Z",
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [
+        {
+            "bucket": "2024-05-01T10:00:00Z",
+            "count": 2,
+            "ph_min": "6.0",
+            "ph_max": "7.0",
+            "ph_avg": "6.50",
+            "water_temperature_min": "20.0",
+            "water_temperature_max": "21.0",
+            "water_temperature_avg": "20.50",
+            "tds_min": 100,
+            "tds_max": 201,
+            "tds_avg": "150.50",
+        }
+    ]
+
+
+def test_filtered_aggregation_weights_downsampled_measurements(
+    api_client, measurements, settings
+):
+    settings.HYDROPONIC_RAW_RETENTION_DAYS = 10
+    call_command("enforce_measurement_retention")
+    api_client.force_authenticate(user=measurements.user)
+
+    response = api_client.get(
+        "/hydroponic/measurements/aggregate/",
+        {"bucket": "day", "tds__gte": 150},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [
+        (row["bucket"], row["count"], row["tds_avg"]) for row in response.json()
+    ] == [
+        ("2024-05-01T00:00:00Z", 2, "151.00"),
+        ("2024-05-02T00:00:00Z", 1, "300.00"),
+        ("2024-05-30T00:00:00Z", 1, "150.00"),
+    ]
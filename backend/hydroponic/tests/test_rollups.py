@@ -0,0 +1,192 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from hydroponic.models import HydroponicMeasurementDailyRollup
+from hydroponic.models import HydroponicMeasurementHourlyRollup
+from rest_framework import status
+
+pytestmark = pytest.mark.django_db
+
+
+def rollup_values(model) -> list[dict]:
+    return list(
+        model.objects.order_by("system_id", "bucket").values(
+            "system_id",
+            "bucket",
+            "readings",
+            "sum_ph",
+            "min_ph",
+            "max_ph",
+            "sum_water_temperature",
+            "min_water_temperature",
+            "max_water_temperature",
+            "sum_tds",
+            "min_tds",
+            "max_tds",
+        )
+    )
+
+
+@pytest.fixture
+def measurements(hydroponic_system, hydroponic_measurement_factory, freezer):
+    readings = [
+        ("2024-05-30T10:05:00Z", "6.0", "20.0", 100),
+        ("2024-05-30T10:45:00Z", "7.0", "22.0", 200),
+        ("2024-05-31T11:10:00Z", "8.0", "24.0", 300),
+    ]
+    for created_at, ph, water_temperature, tds in readings:
+        freezer.move_to(created_at)
+        hydroponic_measurement_factory(
+            system=hydroponic_system,
+            ph=Decimal(ph),
+            water_temperature=Decimal(water_temperature),
+            tds=tds,
+        )
+
+    return hydroponic_system
+
+
+def test_created_measurements_are_folded_into_rollups(measurements):
+    hourly = rollup_values(HydroponicMeasurementHourlyRollup)
+    daily = rollup_values(HydroponicMeasurementDailyRollup)
+
+    assert [(row["bucket"].isoformat(), row["readings"]) for row in hourly] == [
+        ("2024-05-30T10:00:00+00:00", 2),
+        ("2024-05-31T11:00:00+00:00", 1),
+    ]
+    assert daily[0]["bucket"] == datetime.datetime(
+        2024, 5, 30, tzinfo=datetime.timezone.utc
+    )
+    assert daily[0]["sum_ph"] == Decimal("13.0")
+    assert daily[0]["min_water_temperature"] == Decimal("20.0")
+    assert daily[0]["max_tds"] == 200
+
+
+def test_bulk_created_measurements_are_folded_into_rollups(
+    api_client, measurements, freezer
+):
+    freezer.move_to("2024-05-31T11:40:00Z")
+    api_client.force_authenticate(user=measurements.user)
+
+    response = api_client.post(
+        "/hydroponic/measurements/bulk/",
+        {
+            "measurements": [
+                {
+                    "system_id": str(measurements.id),
+                    "ph": "5.0",
+                    "water_temperature": "30.0",
+                    "tds": 50,
+                }
+            ]
+            * 2
+        },
+        format="json",
+    )
+    rollup = HydroponicMeasurementHourlyRollup.objects.get(
+        bucket="2024-05-31T11:00:00Z"
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert rollup.readings == 3
+    assert rollup.sum_ph == Decimal("18.0")
+    assert rollup.min_ph == Decimal("5.0")
+    assert rollup.max_water_temperature == Decimal("30.0")
+    assert rollup.min_tds == 50
+
+
+def test_rebuild_command_restores_rollups(measurements):
+    hourly = rollup_values(HydroponicMeasurementHourlyRollup)
+    daily = rollup_values(HydroponicMeasurementDailyRollup)
+    HydroponicMeasurementHourlyRollup.objects.all().delete()
+    HydroponicMeasurementDailyRollup.objects.update(readings=100)
+
+    call_command("rebuild_measurement_rollups", stdout=None)
+
+    assert rollup_values(HydroponicMeasurementHourlyRollup) == hourly
+    assert rollup_values(HydroponicMeasurementDailyRollup) == daily
+
+
+def test_rebuild_command_since_keeps_older_rollups(measurements):
+    HydroponicMeasurementDailyRollup.objects.update(readings=100)
+
+    call_command(
+        "rebuild_measurement_rollups",
+        "--system",
+        str(measurements.id),
+        "--since",
+        "2024-05-31T12:00:00",
+    )
+
+    assert list(
+        HydroponicMeasurementDailyRollup.objects.order_by("bucket").values_list(
+            "readings", flat=True
+        )
+    ) == [100, 1]
+
+
+def test_long_range_aggregation_reads_rollups_only(api_client, measurements, settings):
+    settings.HYDROPONIC_ROLLUP_MIN_RANGE = datetime.timedelta(days=1)
+    api_client.force_authenticate(user=measurements.user)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(
+            "/hydroponic/measurements/aggregate/",
+            {
+                "bucket": "day",
+                "created_at__gte": "2024-05-01T00:00:00Z",
+                "created_at__lt": "2024-06-01T00:00:00Z",
+            },
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [
+        (row["bucket"], row["count"], row["ph_avg"]) for row in response.json()
+    ] == [
+        ("2024-05-30T00:00:00Z", 2, "6.50"),
+        ("2024-05-31T00:00:00Z", 1, "8.00"),
+    ]
+    assert not any(
+        '"hydroponic_hydroponicmeasurement"' in query["sql"] for query in queries
+    )
+
+
+@pytest.mark.parametrize(
+    "bounds, expected",
+    [
+        (
+            {
+                "created_at__gte": "2024-05-30T10:30:00Z",
+                "created_at__lt": "2024-06-01T00:00:00Z",
+            },
+            [("2024-05-30T00:00:00Z", 1, "7.00"), ("2024-05-31T00:00:00Z", 1, "8.00")],
+        ),
+        (
+            {
+                "created_at__gt": "2024-05-29T00:00:00Z",
+                "created_at__lte": "2024-05-31T11:00:00Z",
+            },
+            [("2024-05-30T00:00:00Z", 2, "6.50")],
+        ),
+    ],
+)
+def test_rollups_and_raw_readings_agree_on_unaligned_ranges(
+    api_client, measurements, settings, bounds, expected
+):
+    api_client.force_authenticate(user=measurements.user)
+    responses = []
+    for min_range in (datetime.timedelta(days=1), datetime.timedelta(days=30)):
+        settings.HYDROPONIC_ROLLUP_MIN_RANGE = min_range
+        response = api_client.get(
+            "/hydroponic/measurements/aggregate/", {"bucket": "day", **bounds}
+        )
+        responses.append(
+            [(row["bucket"], row["count"], row["ph_avg"]) for row in response.json()]
+        )
+
+    rollups, raw = responses
+    assert rollups == raw == expected
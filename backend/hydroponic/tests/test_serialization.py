@@ -0,0 +1,45 @@
+from decimal import Decimal
+
+import pytest
+from common.serializers import get_fast_representation
+from common.serializers import get_values_lookups
+from common.serializers import get_values_plan
+from django.core.exceptions import ImproperlyConfigured
+from hydroponic.serializers import HydroponicMeasurementSerializer
+from hydroponic.serializers import HydroponicSystemDetailsSerializer
+from rest_framework import serializers
+
+
+def test_values_plan_follows_nested_serializers():
+    plan = get_values_plan(HydroponicMeasurementSerializer())
+
+    assert [column.key for column in plan] == [
+        "id",
+        "system",
+        "ph",
+        "water_temperature",
+        "tds",
+    ]
+    assert get_values_lookups(plan) == [
+        "id",
+        "system__id",
+        "system__name",
+        "system__description",
+        "ph",
+        "water_temperature",
+        "tds",
+    ]
+
+
+def test_values_plan_rejects_computed_fields():
+    with pytest.raises(ImproperlyConfigured, match="measurements"):
+        get_values_plan(HydroponicSystemDetailsSerializer())
+
+
+@pytest.mark.parametrize(
+    "value", [Decimal("6.5"), Decimal("6"), Decimal("6.55"), Decimal("-0.0"), 7.25]
+)
+def test_fast_decimal_representation_matches_field(value):
+    field = serializers.DecimalField(max_digits=4, decimal_places=1)
+
+    assert get_fast_representation(field)(value) == field.to_representation(value)
@@ -0,0 +1,58 @@
+import datetime as dt
+from uuid import UUID
+
+import pytest
+from common.models import get_uuid_sql
+from common.models import uuid7
+from django.db import connection
+from hydroponic.models import HydroponicMeasurement
+from hydroponic.models import HydroponicSystem
+from hydroponic.seeds import seed_measurements
+
+
+def test_uuid7_embeds_its_creation_time():
+    at = dt.datetime(2024, 5, 31, 10, 25, 0, 123000, tzinfo=dt.timezone.utc)
+
+    key = uuid7(at)
+
+    assert key.version == 7
+    assert key.variant == "specified in RFC 4122"
+    assert key.int >> 80 == int(at.timestamp() * 1000)
+
+
+def test_uuid7_keys_sort_by_creation_time():
+    start = dt.datetime(2024, 5, 31, tzinfo=dt.timezone.utc)
+    keys = [uuid7(start + dt.timedelta(milliseconds=step)) for step in range(100)]
+
+    assert sorted(keys) == keys
+    assert len(set(keys)) == len(keys)
+
+
+def test_only_opted_in_models_generate_uuid7_keys_in_sql():
+    assert get_uuid_sql(HydroponicSystem, "now()") == "gen_random_uuid()"
+    assert "now()" in get_uuid_sql(HydroponicMeasurement, "now()")
+
+
+@pytest.mark.django_db
+def test_sql_and_python_uuid7_keys_match():
+    at = dt.datetime(2024, 5, 31, 10, 25, tzinfo=dt.timezone.utc)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT {get_uuid_sql(HydroponicMeasurement, '%s')}", [at])
+        (key,) = cursor.fetchone()
+
+    key = UUID(str(key))
+    assert key.version == 7
+    assert key.int >> 80 == uuid7(at).int >> 80
+
+
+@pytest.mark.django_db
+def test_measurement_keys_follow_creation_time(hydroponic_measurement_factory):
+    seed_measurements(users=1, systems=1, measurements=50, seed=1)
+    created = hydroponic_measurement_factory()
+
+    ordered = HydroponicMeasurement.objects.order_by("created_at", "id")
+    assert list(ordered.values_list("id", flat=True)) == sorted(
+        ordered.values_list("id", flat=True)
+    )
+    assert ordered.last() == created
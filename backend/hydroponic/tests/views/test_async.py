@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+from hydroponic.models import HydroponicMeasurement
+from hydroponic.views import HydroponicMeasurementAsyncView
+from hydroponic.views import HydroponicSystemAsyncView
+from rest_framework import status
+
+pytestmark = pytest.mark.django_db
+
+
+class TestHydroponicSystemAsyncView:
+    ENDPOINT: str = "/hydroponic/async/systems/"
+
+    def test_case_view_is_coroutine(self):
+        assert asyncio.iscoroutinefunction(HydroponicSystemAsyncView.as_view())
+
+    def test_case_not_authorized_return_error(self, api_client, hydroponic_system):
+        response = api_client.get(f"{self.ENDPOINT}{hydroponic_system.id}/")
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_case_retrieve_return_same_data_as_sync_view(
+        self, api_client, hydroponic_system, hydroponic_measurement_factory
+    ):
+        hydroponic_measurement_factory.create_batch(3, system=hydroponic_system)
+        api_client.force_authenticate(user=hydroponic_system.user)
+
+        response = api_client.get(f"{self.ENDPOINT}{hydroponic_system.id}/")
+        sync_response = api_client.get(f"/hydroponic/systems/{hydroponic_system.id}/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == sync_response.json()
+        assert len(response.json()["measurements"]) == 3
+
+    def test_case_not_owned_system_return_error(
+        self, api_client, user, hydroponic_system_factory
+    ):
+        api_client.force_authenticate(user=user)
+        system = hydroponic_system_factory()
+
+        response = api_client.get(f"{self.ENDPOINT}{system.id}/")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+class TestHydroponicMeasurementAsyncView:
+    ENDPOINT: str = "/hydroponic/async/measurements/"
+
+    def test_case_view_is_coroutine(self):
+        assert asyncio.iscoroutinefunction(HydroponicMeasurementAsyncView.as_view())
+
+    def test_case_not_authorized_return_error(self, api_client):
+        response = api_client.get(self.ENDPOINT)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_case_list_return_same_pages_as_sync_view(
+        self, api_client, user, hydroponic_measurement_factory
+    ):
+        hydroponic_measurement_factory.create_batch(5, system__user=user)
+        hydroponic_measurement_factory.create_batch(2)
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(self.ENDPOINT, {"page_size": 3})
+        sync_response = api_client.get("/hydroponic/measurements/", {"page_size": 3})
+        next_page = api_client.get(response.json()["next"])
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["results"] == sync_response.json()["results"]
+        assert len(next_page.json()["results"]) == 2
+        assert next_page.json()["next"] is None
+
+    def test_case_invalid_filter_return_error(self, api_client, user):
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(self.ENDPOINT, {"created_at__gt": "yesterday"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "created_at__gt" in response.json()
+
+    def test_case_create_measurement_return_success_data(
+        self, api_client, hydroponic_system
+    ):
+        api_client.force_authenticate(user=hydroponic_system.user)
+
+        response = api_client.post(
+            self.ENDPOINT,
+            {
+                "system_id": str(hydroponic_system.id),
+                "ph": "6.5",
+                "water_temperature": "21.0",
+                "tds": 400,
+            },
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["ph"] == "6.5"
+        assert HydroponicMeasurement.objects.filter(id=response.json()["id"]).exists()
+
+    def test_case_create_measurement_with_not_owned_system_return_error(
+        self, api_client, user, hydroponic_system_factory
+    ):
+        api_client.force_authenticate(user=user)
+        system = hydroponic_system_factory()
+
+        response = api_client.post(
+            self.ENDPOINT,
+            {
+                "system_id": str(system.id),
+                "ph": "6.5",
+                "water_temperature": "21.0",
+                "tds": 400,
+            },
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {"system_id": ["Hydroponic system not found."]}
+
+    def test_case_unsupported_method_return_error(self, api_client, user):
+        api_client.force_authenticate(user=user)
+
+        response = api_client.delete(self.ENDPOINT)
+
+        assert response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
@@ -0,0 +1,227 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from hydroponic.authentication import create_device_key
+from hydroponic.models import HydroponicDeviceKey
+from hydroponic.models import HydroponicMeasurement
+from rest_framework import status
+from users.models import User
+
+pytestmark = pytest.mark.django_db
+
+MEASUREMENT = {"ph": "6.5", "water_temperature": "21.0", "tds": 400}
+
+
+class TestHydroponicDeviceKeyViewSet:
+    ENDPOINT: str = "/hydroponic/device-keys/"
+
+    def test_case_not_authorized_return_error(self, api_client):
+        response = api_client.get(self.ENDPOINT)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_case_create_key_return_raw_key_once(self, api_client, hydroponic_system):
+        api_client.force_authenticate(user=hydroponic_system.user)
+
+        response = api_client.post(
+            self.ENDPOINT,
+            {"system_id": str(hydroponic_system.id), "name": "Tank sensor"},
+            format="json",
+        )
+        listed = api_client.get(self.ENDPOINT).json()["results"]
+        device_key = HydroponicDeviceKey.objects.get()
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["key"].startswith(device_key.prefix)
+        assert response.json()["key"] not in device_key.digest
+        assert [row["id"] for row in listed] == [str(device_key.id)]
+        assert "key" not in listed[0]
+
+    def test_case_create_key_for_not_owned_system_return_error(
+        self, api_client, user, hydroponic_system_factory
+    ):
+        api_client.force_authenticate(user=user)
+
+        response = api_client.post(
+            self.ENDPOINT,
+            {"system_id": str(hydroponic_system_factory().id), "name": "Sensor"},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {"system_id": ["Hydroponic system not found."]}
+
+    def test_case_revoked_key_is_rejected(self, api_client, hydroponic_system):
+        device_key, raw_key = create_device_key(hydroponic_system, "Sensor")
+        api_client.credentials(HTTP_AUTHORIZATION=f"Device {raw_key}")
+        accepted = api_client.post(
+            "/hydroponic/measurements/", MEASUREMENT, format="json"
+        )
+        api_client.force_authenticate(user=hydroponic_system.user)
+
+        response = api_client.delete(f"{self.ENDPOINT}{device_key.id}/")
+        api_client.force_authenticate(user=None)
+        rejected = api_client.post(
+            "/hydroponic/measurements/", MEASUREMENT, format="json"
+        )
+        device_key.refresh_from_db()
+
+        assert accepted.status_code == status.HTTP_201_CREATED
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert device_key.revoked_at is not None
+        assert rejected.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+class TestDeviceKeyIngestion:
+    ENDPOINT: str = "/hydroponic/measurements/"
+
+    @pytest.fixture
+    def device_client(self, api_client, hydroponic_system):
+        _device_key, raw_key = create_device_key(hydroponic_system, "Sensor")
+        api_client.credentials(HTTP_AUTHORIZATION=f"Device {raw_key}")
+        return api_client
+
+    def test_case_create_measurement_without_system_lookup(
+        self, device_client, hydroponic_system, settings, tmp_path
+    ):
+        # Keys are only cached in a cache shared by every process.
+        settings.CACHES = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": tmp_path,
+            }
+        }
+        device_client.post(self.ENDPOINT, MEASUREMENT, format="json")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = device_client.post(self.ENDPOINT, MEASUREMENT, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert (
+            HydroponicMeasurement.objects.filter(system=hydroponic_system).count() == 2
+        )
+        assert not any(
+            query["sql"].startswith("SELECT") for query in queries.captured_queries
+        )
+
+    def test_case_create_measurement_for_other_system_return_error(
+        self, device_client, hydroponic_system_factory
+    ):
+        other_system = hydroponic_system_factory()
+
+        response = device_client.post(
+            self.ENDPOINT,
+            {"system_id": str(other_system.id), **MEASUREMENT},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {"system_id": ["Hydroponic system not found."]}
+
+    def test_case_bulk_create_measurements(self, device_client, hydroponic_system):
+        response = device_client.post(
+            f"{self.ENDPOINT}bulk/",
+            {"measurements": [MEASUREMENT, {**MEASUREMENT, "system_id": "x"}]},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert [row["index"] for row in response.json()["created"]] == [0]
+        assert [row["index"] for row in response.json()["errors"]] == [1]
+
+    def test_case_async_create_measurement(self, device_client, hydroponic_system):
+        response = device_client.post(
+            "/hydroponic/async/measurements/", MEASUREMENT, format="json"
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert HydroponicMeasurement.objects.get().system == hydroponic_system
+
+    @pytest.mark.parametrize(
+        "path",
+        [
+            "/hydroponic/measurements/",
+            "/hydroponic/measurements/aggregate/",
+            "/hydroponic/async/measurements/",
+            "/hydroponic/systems/",
+        ],
+    )
+    def test_case_key_cannot_read(self, device_client, path):
+        response = device_client.get(path)
+
+        assert response.status_code in (
+            status.HTTP_401_UNAUTHORIZED,
+            status.HTTP_403_FORBIDDEN,
+        )
+
+    def test_case_key_revoked_by_other_process_is_rejected(self, device_client):
+        device_client.post(self.ENDPOINT, MEASUREMENT, format="json")
+        # ``update`` sends no signal, like a save in another process whose
+        # per-process cache isn't seen here.
+        HydroponicDeviceKey.objects.update(revoked_at=timezone.now())
+
+        response = device_client.post(self.ENDPOINT, MEASUREMENT, format="json")
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_case_key_of_deactivated_user_is_rejected(
+        self, device_client, hydroponic_system
+    ):
+        device_client.post(self.ENDPOINT, MEASUREMENT, format="json")
+        User.objects.filter(pk=hydroponic_system.user_id).update(is_active=False)
+
+        response = device_client.post(self.ENDPOINT, MEASUREMENT, format="json")
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_case_key_follows_system_owner(
+        self, device_client, hydroponic_system, user_factory, settings, tmp_path
+    ):
+        settings.CACHES = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": tmp_path,
+            }
+        }
+        device_client.post(self.ENDPOINT, MEASUREMENT, format="json")
+        hydroponic_system.user = user_factory(is_active=False)
+        hydroponic_system.save()
+
+        response = device_client.post(self.ENDPOINT, MEASUREMENT, format="json")
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_case_key_of_user_deactivated_by_save_is_rejected(
+        self, device_client, hydroponic_system, settings, tmp_path
+    ):
+        settings.CACHES = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": tmp_path,
+            }
+        }
+        device_client.post(self.ENDPOINT, MEASUREMENT, format="json")
+        user = hydroponic_system.user
+        user.is_active = False
+        user.save(update_fields=["is_active"])
+
+        response = device_client.post(self.ENDPOINT, MEASUREMENT, format="json")
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_case_unrelated_saves_keep_cached_keys(
+        self, device_client, hydroponic_system, django_assert_num_queries
+    ):
+        user = hydroponic_system.user
+
+        with django_assert_num_queries(2):
+            user.save(update_fields=["last_login"])
+            hydroponic_system.save(update_fields=["name"])
+
+    def test_case_invalid_key_is_rejected(self, api_client):
+        api_client.credentials(HTTP_AUTHORIZATION="Device hyd_invalid")
+
+        response = api_client.post(self.ENDPOINT, MEASUREMENT, format="json")
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -1,9 +1,18 @@
 import datetime
+import json
 from decimal import Decimal
 
 import pytest
+from common import mixins
+from common.pagination import KeysetCursorPagination
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from hydroponic.models import HydroponicMeasurement
+from hydroponic.serializers import HydroponicMeasurementSerializer
+from hydroponic.views import HydroponicMeasurementViewSet
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 
 pytestmark = pytest.mark.django_db
 
@@ -354,3 +363,577 @@ class TestHydroponicSystemViewSet:
         response = api_client.delete(f"{self.ENDPOINT}{hydroponic_measurement.id}/")
 
         assert response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+
+
+class TestHydroponicMeasurementBulkCreate:
+    ENDPOINT: str = "/hydroponic/measurements/bulk/"
+
+    def test_case_not_authorized_return_error(self, api_client):
+        response = api_client.post(self.ENDPOINT, {"measurements": []}, format="json")
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_case_valid_measurements_then_create_all(
+        self, api_client, user, hydroponic_system_factory
+    ):
+        systems = hydroponic_system_factory.create_batch(2, user=user)
+        api_client.force_authenticate(user=user)
+
+        response = api_client.post(
+            self.ENDPOINT,
+            {
+                "measurements": [
+                    {
+                        "system_id": str(system.id),
+                        "ph": "6.5",
+                        "water_temperature": "21.5",
+                        "tds": 300,
+                    }
+                    for system in systems * 3
+                ]
+            },
+            format="json",
+        )
+        result = response.json()
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert result["errors"] == []
+        assert [row["index"] for row in result["created"]] == list(range(6))
+        assert HydroponicMeasurement.objects.filter(system__user=user).count() == 6
+
+    def test_case_partially_invalid_measurements_then_return_errors_per_row(
+        self, api_client, user, hydroponic_system_factory
+    ):
+        system = hydroponic_system_factory(user=user)
+        not_owned_system = hydroponic_system_factory()
+        api_client.force_authenticate(user=user)
+
+        response = api_client.post(
+            self.ENDPOINT,
+            {
+                "measurements": [
+                    {
+                        "system_id": str(system.id),
+                        "ph": "7.0",
+                        "water_temperature": "20.0",
+                        "tds": 100,
+                    },
+                    {
+                        "system_id": str(system.id),
+                        "ph": "15.5",
+                        "water_temperature": "20.0",
+                        "tds": 100,
+                    },
+                    {
+                        "system_id": str(not_owned_system.id),
+                        "ph": "7.0",
+                        "water_temperature": "20.0",
+                        "tds": 100,
+                    },
+                ]
+            },
+            format="json",
+        )
+        result = response.json()
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert [row["index"] for row in result["created"]] == [0]
+        assert result["errors"] == [
+            {
+                "index": 1,
+                "errors": {"ph": ["Ensure this value is less than or equal to 14."]},
+            },
+            {"index": 2, "errors": {"system_id": ["Hydroponic system not found."]}},
+        ]
+        assert HydroponicMeasurement.objects.count() == 1
+
+    def test_case_no_valid_measurements_then_return_error(
+        self, api_client, user, hydroponic_system_factory
+    ):
+        not_owned_system = hydroponic_system_factory()
+        api_client.force_authenticate(user=user)
+
+        response = api_client.post(
+            self.ENDPOINT,
+            {
+                "measurements": [
+                    {
+                        "system_id": str(not_owned_system.id),
+                        "ph": "7.0",
+                        "water_temperature": "20.0",
+                        "tds": 100,
+                    }
+                ]
+            },
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["created"] == []
+        assert not HydroponicMeasurement.objects.exists()
+
+    def test_case_too_many_measurements_then_return_error(
+        self, api_client, user, hydroponic_system, settings
+    ):
+        api_client.force_authenticate(user=hydroponic_system.user)
+
+        response = api_client.post(
+            self.ENDPOINT,
+            {
+                "measurements": [
+                    {
+                        "system_id": str(hydroponic_system.id),
+                        "ph": "7.0",
+                        "water_temperature": "20.0",
+                        "tds": 100,
+                    }
+                ]
+                * (settings.HYDROPONIC_BULK_MAX_MEASUREMENTS + 1)
+            },
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "measurements" in response.json()
+        assert not HydroponicMeasurement.objects.exists()
+
+    @pytest.mark.parametrize("size", [1, 20])
+    def test_case_bulk_stays_within_query_budget(
+        self, api_client, user, hydroponic_system_factory, assert_query_budget, size
+    ):
+        systems = hydroponic_system_factory.create_batch(size, user=user)
+        api_client.force_authenticate(user=user)
+
+        with assert_query_budget(HydroponicMeasurementViewSet, "bulk"):
+            response = api_client.post(
+                self.ENDPOINT,
+                {
+                    "measurements": [
+                        {
+                            "system_id": str(system.id),
+                            "ph": "6.5",
+                            "water_temperature": "21.5",
+                            "tds": 300,
+                        }
+                        for system in systems
+                    ]
+                },
+                format="json",
+            )
+
+        assert response.status_code == status.HTTP_201_CREATED
+
+
+class TestHydroponicMeasurementPagination:
+    ENDPOINT: str = "/hydroponic/measurements/"
+
+    def _collect_pages(self, api_client, params: dict, direction: str = "next"):
+        pages = []
+        response = api_client.get(self.ENDPOINT, params)
+        while True:
+            assert response.status_code == status.HTTP_200_OK
+            result = response.json()
+            pages.append([m["id"] for m in result["results"]])
+            if not result[direction]:
+                return pages
+
+            response = api_client.get(result[direction])
+
+    def test_case_cursor_pages_return_every_measurement_once(
+        self, api_client, user, hydroponic_measurement_factory
+    ):
+        measurements = hydroponic_measurement_factory.create_batch(5, system__user=user)
+        api_client.force_authenticate(user=user)
+
+        pages = self._collect_pages(api_client, {"page_size": 2})
+
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert [m_id for page in pages for m_id in page] == [
+            str(m.id)
+            for m in sorted(
+                measurements, key=lambda m: (m.created_at, m.id), reverse=True
+            )
+        ]
+
+    def test_case_cursor_pages_with_ordering_ties_return_every_measurement_once(
+        self, api_client, user, hydroponic_measurement_factory
+    ):
+        measurements = hydroponic_measurement_factory.create_batch(
+            4, system__user=user, ph=7
+        ) + hydroponic_measurement_factory.create_batch(2, system__user=user, ph=5)
+        api_client.force_authenticate(user=user)
+
+        pages = self._collect_pages(api_client, {"page_size": 4, "order_by": "ph"})
+        ids = [m_id for page in pages for m_id in page]
+
+        assert [len(page) for page in pages] == [4, 2]
+        assert sorted(ids) == sorted(str(m.id) for m in measurements)
+        assert set(ids[:2]) == {str(m.id) for m in measurements[4:]}
+
+    def test_case_previous_cursor_return_previous_page(
+        self, api_client, user, hydroponic_measurement_factory
+    ):
+        hydroponic_measurement_factory.create_batch(3, system__user=user)
+        api_client.force_authenticate(user=user)
+
+        first_page = api_client.get(self.ENDPOINT, {"page_size": 2}).json()
+        second_page = api_client.get(first_page["next"]).json()
+        response = api_client.get(second_page["previous"])
+        result = response.json()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert first_page["previous"] is None
+        assert result["results"] == first_page["results"]
+        assert result["previous"] is None
+
+    def test_case_page_size_above_limit_return_capped_page(
+        self, api_client, user, hydroponic_measurement_factory, mocker
+    ):
+        mocker.patch.object(KeysetCursorPagination, "max_page_size", 2)
+        hydroponic_measurement_factory.create_batch(3, system__user=user)
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(self.ENDPOINT, {"page_size": 1000000})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()["results"]) == 2
+
+    def test_case_invalid_cursor_return_error(self, api_client, user):
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(self.ENDPOINT, {"cursor": "definitely-not-cursor"})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_case_list_does_not_count_measurements(
+        self, api_client, user, hydroponic_measurement_factory
+    ):
+        hydroponic_measurement_factory.create_batch(3, system__user=user)
+        api_client.force_authenticate(user=user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(self.ENDPOINT)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert not any("COUNT(" in query["sql"] for query in queries)
+
+    def test_case_list_renders_like_serializer(
+        self, api_client, user, hydroponic_measurement_factory
+    ):
+        hydroponic_measurement_factory.create_batch(5, system__user=user)
+        hydroponic_measurement_factory(
+            system__user=user, ph=Decimal("0.0"), water_temperature=Decimal("-5.5")
+        )
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(self.ENDPOINT)
+        measurements = HydroponicMeasurement.objects.order_by("-created_at", "-id")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert JSONRenderer().render(response.data["results"]) == (
+            JSONRenderer().render(
+                HydroponicMeasurementSerializer(measurements, many=True).data
+            )
+        )
+
+    @pytest.mark.parametrize("size", [1, 30])
+    def test_case_list_stays_within_query_budget(
+        self,
+        api_client,
+        user,
+        hydroponic_system_factory,
+        hydroponic_measurement_factory,
+        assert_query_budget,
+        size,
+    ):
+        for system in hydroponic_system_factory.create_batch(size, user=user):
+            hydroponic_measurement_factory(system=system)
+        api_client.force_authenticate(user=user)
+
+        with assert_query_budget(HydroponicMeasurementViewSet, "list"):
+            response = api_client.get(self.ENDPOINT, {"page_size": size})
+
+        assert response.status_code == status.HTTP_200_OK
+
+
+class TestHydroponicMeasurementAggregate:
+    ENDPOINT: str = "/hydroponic/measurements/aggregate/"
+
+    @pytest.fixture
+    def measurements(self, user, hydroponic_system_factory, freezer):
+        system = hydroponic_system_factory(user=user)
+        other_system = hydroponic_system_factory(user=user)
+        readings = [
+            ("2024-05-31T10:05:00Z", system, "6.0", "20.0", 100),
+            ("2024-05-31T10:45:00Z", system, "7.0", "22.0", 200),
+            ("2024-05-31T11:10:00Z", system, "8.0", "24.0", 300),
+            ("2024-05-31T11:20:00Z", other_system, "5.0", "18.0", 400),
+        ]
+        for created_at, reading_system, ph, water_temperature, tds in readings:
+            freezer.move_to(created_at)
+            HydroponicMeasurement.objects.create(
+                system=reading_system,
+                ph=Decimal(ph),
+                water_temperature=Decimal(water_temperature),
+                tds=tds,
+            )
+
+        return system
+
+    def test_case_not_authorized_return_error(self, api_client):
+        response = api_client.get(self.ENDPOINT)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_case_hour_buckets_return_row_per_hour(
+        self, api_client, user, measurements
+    ):
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(
+            self.ENDPOINT, {"bucket": "hour", "system_id": str(measurements.id)}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [
+            {
+                "bucket": "2024-05-31T10:00:00Z",
+                "count": 2,
+                "ph_min": "6.0",
+                "ph_max": "7.0",
+                "ph_avg": "6.50",
+                "water_temperature_min": "20.0",
+                "water_temperature_max": "22.0",
+                "water_temperature_avg": "21.00",
+                "tds_min": 100,
+                "tds_max": 200,
+                "tds_avg": "150.00",
+            },
+            {
+                "bucket": "2024-05-31T11:00:00Z",
+                "count": 1,
+                "ph_min": "8.0",
+                "ph_max": "8.0",
+                "ph_avg": "8.00",
+                "water_temperature_min": "24.0",
+                "water_temperature_max": "24.0",
+                "water_temperature_avg": "24.00",
+                "tds_min": 300,
+                "tds_max": 300,
+                "tds_avg": "300.00",
+            },
+        ]
+
+    def test_case_day_bucket_with_time_range_return_filtered_rows(
+        self, api_client, user, measurements
+    ):
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(
+            self.ENDPOINT,
+            {
+                "bucket": "day",
+                "created_at__gte": "2024-05-31T10:30:00Z",
+                "order_by": "-ph",
+            },
+        )
+        result = response.json()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(result) == 1
+        assert result[0]["bucket"] == "2024-05-31T00:00:00Z"
+        assert result[0]["count"] == 3
+        assert result[0]["ph_min"] == "5.0"
+
+    def test_case_measurements_of_other_users_are_not_aggregated(
+        self, api_client, measurements, user_factory
+    ):
+        api_client.force_authenticate(user=user_factory())
+
+        response = api_client.get(self.ENDPOINT)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == []
+
+    def test_case_invalid_bucket_return_error(self, api_client, user):
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(self.ENDPOINT, {"bucket": "century"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "bucket" in response.json()
+
+
+class TestHydroponicMeasurementConditionalGet:
+    ENDPOINT: str = "/hydroponic/measurements/"
+
+    def test_case_unchanged_list_return_not_modified(
+        self, api_client, user, hydroponic_measurement_factory, mocker
+    ):
+        hydroponic_measurement_factory.create_batch(
+            2, system__user=user, ph=Decimal("7.0")
+        )
+        api_client.force_authenticate(user=user)
+        response = api_client.get(self.ENDPOINT, {"ph__gte": 0})
+        serialize_values = mocker.spy(mixins, "serialize_values")
+
+        cached_response = api_client.get(
+            self.ENDPOINT, {"ph__gte": 0}, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        other_filters_response = api_client.get(
+            self.ENDPOINT, {"ph__gte": 1}, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert cached_response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert other_filters_response.status_code == status.HTTP_200_OK
+        assert serialize_values.call_count == 1
+
+    def test_case_if_modified_since_return_not_modified(
+        self, api_client, user, hydroponic_measurement_factory
+    ):
+        hydroponic_measurement_factory(system__user=user)
+        api_client.force_authenticate(user=user)
+        response = api_client.get(self.ENDPOINT)
+
+        response = api_client.get(
+            self.ENDPOINT, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_case_new_measurement_change_list_etag(
+        self, api_client, user, hydroponic_measurement_factory
+    ):
+        hydroponic_measurement_factory(system__user=user)
+        api_client.force_authenticate(user=user)
+        response = api_client.get(self.ENDPOINT)
+
+        hydroponic_measurement_factory(system__user=user)
+        response = api_client.get(self.ENDPOINT, HTTP_IF_NONE_MATCH=response["ETag"])
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()["results"]) == 2
+
+    def test_case_backdated_import_change_list_etag(
+        self, api_client, user, hydroponic_measurement_factory
+    ):
+        measurement = hydroponic_measurement_factory(system__user=user)
+        api_client.force_authenticate(user=user)
+        response = api_client.get(self.ENDPOINT)
+
+        content = (
+            "system_id,ph,water_temperature,tds,created_at\n"
+            f"{measurement.system_id},6.5,21.0,400,2023-01-01T10:00:00Z\n"
+        )
+        upload = SimpleUploadedFile("measurements.csv", content.encode(), "text/csv")
+        api_client.post(f"{self.ENDPOINT}import/", {"file": upload}, format="multipart")
+        response = api_client.get(self.ENDPOINT, HTTP_IF_NONE_MATCH=response["ETag"])
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()["results"]) == 2
+
+    def test_case_deleted_system_change_list_etag(
+        self, api_client, user, hydroponic_measurement_factory, freezer
+    ):
+        freezer.move_to("2024-05-30T10:00:00Z")
+        older = hydroponic_measurement_factory(system__user=user)
+        freezer.move_to("2024-05-31T10:00:00Z")
+        hydroponic_measurement_factory(system__user=user)
+        api_client.force_authenticate(user=user)
+        response = api_client.get(self.ENDPOINT)
+
+        older.system.delete()
+        response = api_client.get(self.ENDPOINT, HTTP_IF_NONE_MATCH=response["ETag"])
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()["results"]) == 1
+
+    @pytest.mark.parametrize("detail", (False, True))
+    def test_case_renamed_system_change_etag(
+        self, api_client, user, hydroponic_measurement_factory, freezer, detail
+    ):
+        freezer.move_to("2024-05-30T10:00:00Z")
+        measurement = hydroponic_measurement_factory(system__user=user)
+        endpoint = f"{self.ENDPOINT}{measurement.id}/" if detail else self.ENDPOINT
+        api_client.force_authenticate(user=user)
+        response = api_client.get(endpoint)
+
+        freezer.move_to("2024-05-31T10:00:00Z")
+        measurement.system.name = "Renamed"
+        measurement.system.save()
+        response = api_client.get(endpoint, HTTP_IF_NONE_MATCH=response["ETag"])
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json() if detail else response.json()["results"][0]
+        assert data["system"]["name"] == "Renamed"
+
+    def test_case_etag_is_not_shared_between_users(
+        self, api_client, user, hydroponic_measurement_factory, user_factory
+    ):
+        measurement = hydroponic_measurement_factory(system__user=user)
+        api_client.force_authenticate(user=user)
+        response = api_client.get(f"{self.ENDPOINT}{measurement.id}/")
+
+        api_client.force_authenticate(user=user_factory())
+        response = api_client.get(
+            f"{self.ENDPOINT}{measurement.id}/", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+class TestHydroponicMeasurementExport:
+    ENDPOINT: str = "/hydroponic/measurements/export/"
+
+    def test_case_not_authorized_return_error(self, api_client):
+        response = api_client.get(self.ENDPOINT)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    @pytest.mark.freeze_time("2024-05-31T10:25:00Z")
+    def test_case_csv_export_return_filtered_rows(
+        self, api_client, user, hydroponic_measurement_factory
+    ):
+        measurement = hydroponic_measurement_factory(
+            system__user=user, ph=Decimal("7.5"), water_temperature=21, tds=100
+        )
+        hydroponic_measurement_factory(system__user=user, ph=Decimal("3.0"))
+        hydroponic_measurement_factory(ph=Decimal("7.5"))
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(self.ENDPOINT, {"ph__gte": 7})
+        content = b"".join(response.streaming_content).decode()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "text/csv"
+        assert content.splitlines() == [
+            "id,system_id,ph,water_temperature,tds,created_at",
+            f"{measurement.id},{measurement.system_id},7.5,21.0,100,"
+            "2024-05-31T10:25:00Z",
+        ]
+
+    def test_case_ndjson_export_return_row_per_line(
+        self, api_client, user, hydroponic_measurement_factory
+    ):
+        measurements = hydroponic_measurement_factory.create_batch(3, system__user=user)
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(
+            self.ENDPOINT, {"file_format": "ndjson", "order_by": "created_at"}
+        )
+        lines = b"".join(response.streaming_content).decode().splitlines()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/x-ndjson"
+        assert [json.loads(line)["id"] for line in lines] == [
+            str(measurement.id) for measurement in measurements
+        ]
+        assert json.loads(lines[0])["ph"] == str(measurements[0].ph)
+
+    def test_case_invalid_format_return_error(self, api_client, user):
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(self.ENDPOINT, {"file_format": "xlsx"})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -1,6 +1,13 @@
+from decimal import Decimal
+
 import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
 from hydroponic.models import HydroponicSystem
+from hydroponic.serializers import HydroponicSystemDetailsSerializer
+from hydroponic.serializers import HydroponicSystemSerializer
+from hydroponic.views import HydroponicSystemViewSet
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 
 pytestmark = pytest.mark.django_db
 
@@ -82,6 +89,35 @@ class TestHydroponicSystemViewSet:
         assert response.status_code == status.HTTP_200_OK
         assert len(result) == 0
 
+    def test_case_systems_search_description(
+        self, api_client, user, hydroponic_system_factory
+    ):
+        system = hydroponic_system_factory(user=user, description="North greenhouse")
+        hydroponic_system_factory(user=user, description="Balcony")
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(self.ENDPOINT, {"search": "greenhouse"})
+        result = response.json()["results"]
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [row["id"] for row in result] == [str(system.id)]
+
+    def test_case_systems_search_rank_by_similarity(
+        self, api_client, user, hydroponic_system_factory
+    ):
+        hydroponic_system_factory(user=user, name="Tomatoes by the greenhouse door")
+        closest = hydroponic_system_factory(user=user, name="Greenhouse")
+        hydroponic_system_factory(user=user, name="Greenhouse tomatoes")
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(self.ENDPOINT, {"search": "greenhouse"})
+        result = response.json()["results"]
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(result) == 3
+        assert result[0]["id"] == str(closest.id)
+        assert result[-1]["name"] == "Tomatoes by the greenhouse door"
+
     def test_case_create_system_return_success_data(self, api_client, user):
         api_client.force_authenticate(user=user)
         system_name = "Test system"
@@ -160,6 +196,84 @@ class TestHydroponicSystemViewSet:
         assert result["description"] == system.description
         assert len(result["measurements"]) == 10
 
+    def test_retrieve_system_return_latest_measurements_in_constant_queries(
+        self,
+        api_client,
+        user,
+        hydroponic_system_factory,
+        hydroponic_measurement_factory,
+        django_assert_num_queries,
+    ):
+        api_client.force_authenticate(user=user)
+        system = hydroponic_system_factory(user=user)
+        measurements = hydroponic_measurement_factory.create_batch(12, system=system)
+        hydroponic_measurement_factory.create_batch(3, system__user=user)
+
+        with django_assert_num_queries(3):
+            response = api_client.get(f"{self.ENDPOINT}{system.id}/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [m["id"] for m in response.json()["measurements"]] == [
+            str(m.id)
+            for m in sorted(
+                measurements, key=lambda m: (m.created_at, m.id), reverse=True
+            )[:10]
+        ]
+
+    def test_list_systems_does_not_load_measurements(
+        self,
+        api_client,
+        user,
+        hydroponic_measurement_factory,
+        django_assert_num_queries,
+    ):
+        api_client.force_authenticate(user=user)
+        hydroponic_measurement_factory.create_batch(3, system__user=user)
+
+        with django_assert_num_queries(3):
+            response = api_client.get(self.ENDPOINT)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()["results"]) == 3
+
+    def test_systems_list_renders_like_serializer(
+        self, api_client, user, hydroponic_system_factory
+    ):
+        hydroponic_system_factory.create_batch(3, user=user)
+        hydroponic_system_factory(user=user, name="Ünïcode", description="")
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(self.ENDPOINT)
+        systems = HydroponicSystem.objects.order_by("id")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert JSONRenderer().render(response.data["results"]) == (
+            JSONRenderer().render(HydroponicSystemSerializer(systems, many=True).data)
+        )
+
+    @pytest.mark.parametrize("size", [1, 25])
+    def test_systems_stay_within_query_budget(
+        self,
+        api_client,
+        user,
+        hydroponic_system_factory,
+        hydroponic_measurement_factory,
+        assert_query_budget,
+        size,
+    ):
+        api_client.force_authenticate(user=user)
+        system = hydroponic_system_factory(user=user)
+        hydroponic_measurement_factory.create_batch(size, system=system)
+        hydroponic_measurement_factory.create_batch(size, system__user=user)
+
+        with assert_query_budget(HydroponicSystemViewSet, "list"):
+            response = api_client.get(self.ENDPOINT, {"page_size": size + 1})
+        with assert_query_budget(HydroponicSystemViewSet, "retrieve"):
+            detail_response = api_client.get(f"{self.ENDPOINT}{system.id}/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert detail_response.status_code == status.HTTP_200_OK
+
     def test_delete_system_then_properly_remove(
         self, api_client, user, hydroponic_system_factory
     ):
@@ -181,3 +295,163 @@ class TestHydroponicSystemViewSet:
 
         assert response.status_code == status.HTTP_404_NOT_FOUND
         assert HydroponicSystem.objects.filter(id=system.id).exists()
+
+
+class TestHydroponicSystemConditionalGet:
+    ENDPOINT: str = "/hydroponic/systems/"
+
+    def test_case_unchanged_system_return_not_modified_without_serializing(
+        self,
+        api_client,
+        hydroponic_measurement,
+        django_assert_num_queries,
+        mocker,
+    ):
+        system = hydroponic_measurement.system
+        api_client.force_authenticate(user=system.user)
+        response = api_client.get(f"{self.ENDPOINT}{system.id}/")
+        to_representation = mocker.spy(
+            HydroponicSystemDetailsSerializer, "to_representation"
+        )
+
+        with django_assert_num_queries(1):
+            cached_response = api_client.get(
+                f"{self.ENDPOINT}{system.id}/",
+                HTTP_IF_NONE_MATCH=response["ETag"],
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Last-Modified"]
+        assert cached_response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert cached_response["ETag"] == response["ETag"]
+        to_representation.assert_not_called()
+
+    def test_case_new_measurement_change_system_etag(
+        self, api_client, hydroponic_measurement, hydroponic_measurement_factory
+    ):
+        system = hydroponic_measurement.system
+        api_client.force_authenticate(user=system.user)
+        response = api_client.get(f"{self.ENDPOINT}{system.id}/")
+
+        hydroponic_measurement_factory(system=system)
+        response = api_client.get(
+            f"{self.ENDPOINT}{system.id}/", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()["measurements"]) == 2
+
+    def test_case_backdated_import_change_system_etag(
+        self, api_client, hydroponic_measurement
+    ):
+        system = hydroponic_measurement.system
+        api_client.force_authenticate(user=system.user)
+        response = api_client.get(f"{self.ENDPOINT}{system.id}/")
+
+        content = (
+            "system_id,ph,water_temperature,tds,created_at\n"
+            f"{system.id},6.5,21.0,400,2023-01-01T10:00:00Z\n"
+        )
+        upload = SimpleUploadedFile("measurements.csv", content.encode(), "text/csv")
+        api_client.post(
+            "/hydroponic/measurements/import/", {"file": upload}, format="multipart"
+        )
+        response = api_client.get(
+            f"{self.ENDPOINT}{system.id}/", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()["measurements"]) == 2
+
+    def test_case_deleted_system_change_list_etag(
+        self, api_client, user, hydroponic_system_factory
+    ):
+        systems = hydroponic_system_factory.create_batch(2, user=user)
+        api_client.force_authenticate(user=user)
+        response = api_client.get(self.ENDPOINT)
+
+        systems[0].delete()
+        response = api_client.get(self.ENDPOINT, HTTP_IF_NONE_MATCH=response["ETag"])
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()["results"]) == 1
+
+    def test_case_not_owned_system_return_not_found(
+        self, api_client, user, hydroponic_system_factory
+    ):
+        api_client.force_authenticate(user=user)
+        system = hydroponic_system_factory()
+
+        response = api_client.get(f"{self.ENDPOINT}{system.id}/")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert not response.has_header("ETag")
+
+
+class TestHydroponicSystemDashboard:
+    ENDPOINT: str = "/hydroponic/systems/dashboard/"
+
+    def test_case_not_authorized_return_error(self, api_client):
+        response = api_client.get(self.ENDPOINT)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_case_systems_return_latest_measurement_and_aggregates(
+        self,
+        api_client,
+        user,
+        hydroponic_system_factory,
+        hydroponic_measurement_factory,
+        freezer,
+    ):
+        system, idle = hydroponic_system_factory.create_batch(2, user=user)
+        hydroponic_system_factory()
+        freezer.move_to("2024-05-29T10:00:00Z")
+        hydroponic_measurement_factory(system=system, ph=Decimal("5.0"), tds=100)
+        freezer.move_to("2024-05-31T09:00:00Z")
+        hydroponic_measurement_factory(system=system, ph=Decimal("6.0"), tds=300)
+        freezer.move_to("2024-05-31T10:00:00Z")
+        latest = hydroponic_measurement_factory(
+            system=system, ph=Decimal("7.0"), tds=500
+        )
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(self.ENDPOINT)
+        result = {row["id"]: row for row in response.json()}
+
+        assert response.status_code == status.HTTP_200_OK
+        assert set(result) == {str(system.id), str(idle.id)}
+        assert result[str(system.id)]["latest_measurement"] == {
+            "id": str(latest.id),
+            "ph": "7.0",
+            "water_temperature": str(latest.water_temperature),
+            "tds": 500,
+            "created_at": "2024-05-31T10:00:00Z",
+        }
+        summary = result[str(system.id)]["last_24h"]
+        assert "bucket" not in summary
+        assert summary["count"] == 2
+        assert (summary["ph_min"], summary["ph_avg"]) == ("6.0", "6.50")
+        assert (summary["tds_max"], summary["tds_avg"]) == (500, "400.00")
+        assert result[str(idle.id)]["latest_measurement"] is None
+        assert result[str(idle.id)]["last_24h"] is None
+
+    @pytest.mark.parametrize("size", [2, 30])
+    def test_case_dashboard_stay_within_query_budget(
+        self,
+        api_client,
+        user,
+        hydroponic_system_factory,
+        hydroponic_measurement_factory,
+        assert_query_budget,
+        size,
+    ):
+        for system in hydroponic_system_factory.create_batch(size, user=user):
+            hydroponic_measurement_factory.create_batch(2, system=system)
+        api_client.force_authenticate(user=user)
+
+        with assert_query_budget(HydroponicSystemViewSet, "dashboard"):
+            response = api_client.get(self.ENDPOINT)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()) == size
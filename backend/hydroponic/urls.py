@@ -1,4 +1,8 @@
+from django.urls import path
+from hydroponic.views import HydroponicDeviceKeyViewSet
+from hydroponic.views import HydroponicMeasurementAsyncView
 from hydroponic.views import HydroponicMeasurementViewSet
+from hydroponic.views import HydroponicSystemAsyncView
 from hydroponic.views import HydroponicSystemViewSet
 from rest_framework.routers import DefaultRouter
 
@@ -8,5 +12,17 @@ app_name = "hydroponic"
 router = DefaultRouter()
 router.register(r"systems", HydroponicSystemViewSet, basename="systems")
 router.register(r"measurements", HydroponicMeasurementViewSet, basename="measurements")
+router.register(r"device-keys", HydroponicDeviceKeyViewSet, basename="device-keys")
 
-urlpatterns = router.urls
+urlpatterns = router.urls + [
+    path(
+        "async/systems/<uuid:pk>/",
+        HydroponicSystemAsyncView.as_view(),
+        name="systems-async-detail",
+    ),
+    path(
+        "async/measurements/",
+        HydroponicMeasurementAsyncView.as_view(),
+        name="measurements-async",
+    ),
+]
@@ -1,21 +1,81 @@
+from operator import itemgetter
+
+from asgiref.sync import sync_to_async
+from common.mixins import ConditionalGetMixin
+from common.mixins import ValuesListMixin
+from common.pagination import KeysetCursorPagination
+from common.search import TrigramSearchFilter
+from common.views import AsyncAPIView
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Count
+from django.db.models import Max
+from django.db.models import OuterRef
+from django.db.models import Subquery
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django_filters.utils import translate_validation
+from hydroponic.authentication import DeviceKeyAuthentication
+from hydroponic.exports import EXPORT_CONTENT_TYPES
+from hydroponic.exports import EXPORT_STREAMS
 from hydroponic.filters import HydroponicMeasurementFilter
+from hydroponic.models import HydroponicDeviceKey
 from hydroponic.models import HydroponicMeasurement
 from hydroponic.models import HydroponicSystem
+from hydroponic.permissions import DeviceKeyScope
+from hydroponic.queries import aggregate_measurements
+from hydroponic.queries import aggregate_rollups
+from hydroponic.queries import prefetch_latest_measurements
+from hydroponic.rollups import get_partial_buckets_filter
+from hydroponic.rollups import get_rollup_queryset
+from hydroponic.rollups import prefetch_recent_aggregates
+from hydroponic.serializers import HydroponicDeviceKeySerializer
+from hydroponic.serializers import HydroponicMeasurementAggregateQuerySerializer
+from hydroponic.serializers import HydroponicMeasurementAggregateSerializer
+from hydroponic.serializers import HydroponicMeasurementBulkSerializer
+from hydroponic.serializers import HydroponicMeasurementExportQuerySerializer
+from hydroponic.serializers import HydroponicMeasurementImportSerializer
 from hydroponic.serializers import HydroponicMeasurementSerializer
+from hydroponic.serializers import HydroponicSystemDashboardSerializer
 from hydroponic.serializers import HydroponicSystemDetailsSerializer
 from hydroponic.serializers import HydroponicSystemSerializer
 from rest_framework import mixins
 from rest_framework import permissions
+from rest_framework import status
 from rest_framework import viewsets
-from rest_framework.filters import SearchFilter
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+def _created_status() -> int:
+    """Spooled measurements are accepted, but not stored yet."""
+    if settings.HYDROPONIC_INGEST_BUFFER:
+        return status.HTTP_202_ACCEPTED
 
+    return status.HTTP_201_CREATED
 
-class HydroponicSystemViewSet(viewsets.ModelViewSet):
+
+class HydroponicSystemViewSet(
+    ConditionalGetMixin, ValuesListMixin, viewsets.ModelViewSet
+):
     queryset = HydroponicSystem.objects.all()
     serializer_class = HydroponicSystemSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [SearchFilter]
-    search_fields = ["name"]
+    filter_backends = [TrigramSearchFilter]
+    search_fields = ["name", "description"]
+    # Queries per action, authenticating the user included.
+    query_budgets = {
+        "list": 4,
+        "retrieve": 4,
+        "create": 2,
+        "update": 3,
+        "partial_update": 3,
+        "destroy": 9,
+        "dashboard": 4,
+    }
 
     def get_queryset(self):
         if getattr(self, "swagger_fake_view", False):
@@ -23,20 +83,74 @@ class HydroponicSystemViewSet(viewsets.ModelViewSet):
             # fyi: https://github.com/axnsan12/drf-yasg/issues/333
             return HydroponicSystem.objects.none()
 
-        return (
-            HydroponicSystem.objects.filter(user=self.request.user)
-            .prefetch_related("measurements")
-            .order_by("id")
+        return HydroponicSystem.objects.filter(user=self.request.user).order_by("id")
+
+    def get_object(self):
+        system = super().get_object()
+        if self.action == "retrieve":
+            prefetch_latest_measurements(
+                [system], limit=HydroponicSystemDetailsSerializer.measurements_limit
+            )
+
+        return system
+
+    def get_conditional_state(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.action == "list":
+            state = queryset.aggregate(latest=Max("updated_at"), count=Count("id"))
+            if state["latest"] is None:
+                return None
+
+            return state["latest"], str(state["count"])
+
+        latest_measurement = (
+            HydroponicMeasurement.objects.filter(system=OuterRef("pk"))
+            .order_by("-created_at", "-id")
+            .values("created_at")[:1]
         )
+        try:
+            state = (
+                queryset.filter(pk=self.kwargs[self.lookup_field])
+                .annotate(latest_measurement=Subquery(latest_measurement))
+                .values_list(
+                    "updated_at", "latest_measurement", "measurements_changed_at"
+                )
+                .first()
+            )
+        except (TypeError, ValueError, ValidationError):
+            return None
+
+        if state is None:
+            return None
+
+        # Backdated inserts and deletes of older measurements leave the newest
+        # reading alone and date ``measurements_changed_at`` instead.
+        return max(change for change in state if change), ""
 
     def get_serializer_class(self):
         if self.action == "retrieve":
             return HydroponicSystemDetailsSerializer
+        if self.action == "dashboard":
+            return HydroponicSystemDashboardSerializer
 
         return HydroponicSystemSerializer
 
+    @action(detail=False, methods=["get"])
+    def dashboard(self, request):
+        # Every system at once, in the same few queries whatever their number.
+        systems = list(self.filter_queryset(self.get_queryset()))
+        prefetch_latest_measurements(systems, limit=1)
+        prefetch_recent_aggregates(
+            systems, since=timezone.now() - HydroponicSystemDashboardSerializer.window
+        )
+        serializer = self.get_serializer(systems, many=True)
+
+        return Response(serializer.data)
+
 
 class HydroponicMeasurementViewSet(
+    ConditionalGetMixin,
+    ValuesListMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
@@ -44,8 +158,26 @@ class HydroponicMeasurementViewSet(
 ):
     queryset = HydroponicMeasurement.objects.all()
     serializer_class = HydroponicMeasurementSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [
+        *api_settings.DEFAULT_AUTHENTICATION_CLASSES,
+        DeviceKeyAuthentication,
+    ]
+    permission_classes = [permissions.IsAuthenticated, DeviceKeyScope]
+    device_key_actions = ("create", "bulk")
     filterset_class = HydroponicMeasurementFilter
+    pagination_class = KeysetCursorPagination
+    # Keys the cursor of the default ordering.
+    values_extra_fields = ("created_at",)
+    # Imports are left out, they run a few queries per batch of rows. A create
+    # filling the ingestion spool flushes it as well.
+    query_budgets = {
+        "list": 6,
+        "retrieve": 3,
+        "create": 9,
+        "bulk": 7,
+        "aggregate": 4,
+        "export": 3,
+    }
 
     def get_queryset(self):
         if getattr(self, "swagger_fake_view", False):
@@ -58,3 +190,244 @@ class HydroponicMeasurementViewSet(
             .select_related("system")
             .order_by("-created_at")
         )
+
+    def get_conditional_state(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.action == "retrieve":
+            # Measurements nest their system's name and description, so
+            # renaming a system changes them as well.
+            try:
+                state = (
+                    queryset.filter(pk=self.kwargs[self.lookup_field])
+                    .values_list("created_at", "system__updated_at")
+                    .first()
+                )
+            except (TypeError, ValueError, ValidationError):
+                return None
+
+            return None if state is None else (max(state), "")
+
+        # Measurements are immutable through the API, so the newest reading
+        # dates new ones and is found on the ``created_at`` index.
+        latest = (
+            queryset.order_by("-created_at")
+            .values_list("created_at", flat=True)
+            .first()
+        )
+
+        # Backdated inserts and deletes date their systems instead, systems
+        # deleted along with their measurements change the count or the newest.
+        systems = HydroponicSystem.objects.filter(user=self.request.user).aggregate(
+            changed=Max("measurements_changed_at"),
+            updated=Max("updated_at"),
+            created=Max("created_at"),
+            count=Count("id"),
+        )
+        changes = [
+            change
+            for change in (latest, systems["changed"], systems["updated"])
+            if change
+        ]
+        if not changes:
+            return None
+
+        return max(changes), f"{systems['count']}:{systems['created']}"
+
+    def get_serializer_class(self):
+        if self.action == "bulk":
+            return HydroponicMeasurementBulkSerializer
+        if self.action == "aggregate":
+            return HydroponicMeasurementAggregateSerializer
+        if self.action == "upload":
+            return HydroponicMeasurementImportSerializer
+
+        return HydroponicMeasurementSerializer
+
+    def create(self, request, *args, **kwargs):
+        response = super().create(request, *args, **kwargs)
+        response.status_code = _created_status()
+
+        return response
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = serializer.save()
+
+        return Response(
+            result,
+            status=_created_status()
+            if result["created"]
+            else status.HTTP_400_BAD_REQUEST,
+        )
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        parser_classes=[MultiPartParser],
+    )
+    def upload(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = serializer.save()
+
+        return Response(
+            result,
+            status=status.HTTP_201_CREATED
+            if result["imported"]
+            else status.HTTP_400_BAD_REQUEST,
+        )
+
+    @action(detail=False, methods=["get"])
+    def aggregate(self, request):
+        params = HydroponicMeasurementAggregateQuerySerializer(
+            data=request.query_params
+        )
+        params.is_valid(raise_exception=True)
+
+        bucket = params.validated_data["bucket"]
+
+        filterset = self.filterset_class(
+            request.query_params, queryset=self.get_queryset(), request=request
+        )
+        if not filterset.is_valid():
+            raise translate_validation(filterset.errors)
+
+        filters = filterset.form.cleaned_data
+        rollups = get_rollup_queryset(request.user, bucket, filters)
+        partial = get_partial_buckets_filter(bucket, filters)
+        if rollups is not None and partial is not None:
+            # Buckets cut by the range edges are aggregated from raw readings.
+            queryset = sorted(
+                [
+                    *aggregate_rollups(rollups),
+                    *aggregate_measurements(filterset.qs.filter(partial), bucket),
+                ],
+                key=itemgetter("bucket"),
+            )
+        elif rollups is not None:
+            queryset = aggregate_rollups(rollups)
+        else:
+            queryset = aggregate_measurements(filterset.qs, bucket)
+
+        serializer = self.get_serializer(queryset, many=True)
+
+        return Response(serializer.data)
+
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        params = HydroponicMeasurementExportQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        file_format = params.validated_data["file_format"]
+
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(
+            EXPORT_STREAMS[file_format](queryset),
+            content_type=EXPORT_CONTENT_TYPES[file_format],
+        )
+        response[
+            "Content-Disposition"
+        ] = f'attachment; filename="measurements.{file_format}"'
+
+        return response
+
+
+class HydroponicDeviceKeyViewSet(
+    mixins.CreateModelMixin,
+    mixins.ListModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
+    queryset = HydroponicDeviceKey.objects.all()
+    serializer_class = HydroponicDeviceKeySerializer
+    permission_classes = [permissions.IsAuthenticated]
+    query_budgets = {"list": 3, "create": 3, "destroy": 3}
+
+    def get_queryset(self):
+        if getattr(self, "swagger_fake_view", False):
+            # queryset just for schema generation metadata
+            # fyi: https://github.com/axnsan12/drf-yasg/issues/333
+            return HydroponicDeviceKey.objects.none()
+
+        return HydroponicDeviceKey.objects.filter(
+            system__user=self.request.user
+        ).order_by("-created_at")
+
+    def perform_destroy(self, instance: HydroponicDeviceKey) -> None:
+        # Revoked keys are kept, so it stays visible which sensor held one.
+        if instance.revoked_at is None:
+            instance.revoked_at = timezone.now()
+            instance.save(update_fields=["revoked_at", "updated_at"])
+
+
+class HydroponicSystemAsyncView(AsyncAPIView):
+    """Async twin of ``HydroponicSystemViewSet.retrieve``."""
+
+    permission_classes = [permissions.IsAuthenticated]
+    query_budgets = {"get": 4}
+
+    async def get(self, request, pk):
+        try:
+            system = await HydroponicSystem.objects.filter(user=request.user).aget(
+                pk=pk
+            )
+        except HydroponicSystem.DoesNotExist:
+            raise NotFound
+
+        await sync_to_async(prefetch_latest_measurements)(
+            [system], limit=HydroponicSystemDetailsSerializer.measurements_limit
+        )
+        serializer = HydroponicSystemDetailsSerializer(
+            system, context={"request": request, "view": self}
+        )
+
+        return Response(serializer.data)
+
+
+class HydroponicMeasurementAsyncView(AsyncAPIView):
+    """Async twin of ``HydroponicMeasurementViewSet`` list and create."""
+
+    authentication_classes = HydroponicMeasurementViewSet.authentication_classes
+    permission_classes = [permissions.IsAuthenticated, DeviceKeyScope]
+    device_key_actions = ("post",)
+    filterset_class = HydroponicMeasurementFilter
+    pagination_class = KeysetCursorPagination
+    query_budgets = {"get": 5, "post": 8}
+
+    async def get(self, request):
+        filterset = self.filterset_class(
+            request.query_params,
+            queryset=HydroponicMeasurement.objects.filter(system__user=request.user)
+            .select_related("system")
+            .order_by("-created_at"),
+            request=request,
+        )
+        # Validating ``system_id`` looks the system up.
+        if not await sync_to_async(filterset.is_valid)():
+            raise translate_validation(filterset.errors)
+
+        paginator = self.pagination_class()
+        queryset = paginator.get_page_queryset(filterset.qs, request, view=self)
+        results = paginator.get_page_results(
+            [measurement async for measurement in queryset]
+        )
+        serializer = HydroponicMeasurementSerializer(
+            results, many=True, context={"request": request, "view": self}
+        )
+
+        return paginator.get_paginated_response(serializer.data)
+
+    async def post(self, request):
+        serializer = HydroponicMeasurementSerializer(
+            data=request.data, context={"request": request, "view": self}
+        )
+        await sync_to_async(self.perform_create)(serializer)
+
+        return Response(serializer.data, status=_created_status())
+
+    def perform_create(self, serializer: HydroponicMeasurementSerializer) -> None:
+        # Ownership check, insert and rollup upsert share one thread hop.
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
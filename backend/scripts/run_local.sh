@@ -2,4 +2,5 @@
 
 while !</dev/tcp/db/5432; do echo "waiting for db..." && sleep 1; done;
 python manage.py migrate
+python manage.py manage_measurement_partitions --backfill
 python manage.py runserver 0.0.0.0:8000
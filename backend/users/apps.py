@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "users"
+
+    def ready(self):
+        from common import checks  # noqa: F401
+        from common import metrics  # noqa: F401
+        from users import signals  # noqa: F401
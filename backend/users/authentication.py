@@ -0,0 +1,87 @@
+import threading
+from collections import OrderedDict
+
+from common.routers import replica_alias
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import AuthUser
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+from rest_framework_simplejwt.utils import aware_utcnow
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+def get_user_cache_key(user_id) -> str:
+    return f"users:auth:{user_id}"
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    ``JWTAuthentication`` remembering validated tokens and their users.
+
+    Up to ``JWT_TOKEN_CACHE_SIZE`` validated tokens are kept per process in an
+    LRU, so a repeated token skips signature verification and only has its
+    expiry checked again. Users are loaded from the primary, cached for
+    ``JWT_USER_CACHE_TTL`` seconds in Django's cache and dropped from it
+    whenever they are saved or deleted, see ``users.signals``. Only a cache
+    shared by every process, see ``CACHE_URL``, drops them everywhere, other
+    processes of a per-process cache keep a changed or deactivated user for up
+    to ``JWT_USER_CACHE_TTL``.
+    """
+
+    _tokens: OrderedDict[bytes, Token] = OrderedDict()
+    _tokens_lock = threading.Lock()
+
+    def get_validated_token(self, raw_token: bytes) -> Token:
+        with self._tokens_lock:
+            token = self._tokens.get(raw_token)
+            if token is not None:
+                self._tokens.move_to_end(raw_token)
+
+        if token is not None:
+            try:
+                token.check_exp(current_time=aware_utcnow())
+                return token
+            except TokenError:
+                with self._tokens_lock:
+                    self._tokens.pop(raw_token, None)
+
+        # Raises ``InvalidToken`` for expired or forged tokens.
+        token = super().get_validated_token(raw_token)
+        with self._tokens_lock:
+            self._tokens[raw_token] = token
+            while len(self._tokens) > settings.JWT_TOKEN_CACHE_SIZE:
+                self._tokens.popitem(last=False)
+
+        return token
+
+    def get_user(self, validated_token: Token) -> AuthUser:
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        key = get_user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            # Cached users outlive the request, a lagging replica could bring
+            # back one deactivated moments ago.
+            alias = replica_alias.set(None)
+            try:
+                user = super().get_user(validated_token)
+            finally:
+                replica_alias.reset(alias)
+            cache.set(key, user, settings.JWT_USER_CACHE_TTL)
+            return user
+
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+
+        return user
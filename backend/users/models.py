@@ -1,4 +1,5 @@
 from common.models import DateTimeUUIDMixin
+from common.models import trigram_index
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.models import BaseUserManager
 from django.contrib.auth.models import PermissionsMixin
@@ -40,5 +41,8 @@ class User(AbstractUser, PermissionsMixin, DateTimeUUIDMixin):
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
 
+    class Meta(AbstractUser.Meta):
+        indexes = [trigram_index("email", name="user_email_trgm_idx")]
+
     def __str__(self):
         return self.email
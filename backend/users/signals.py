@@ -0,0 +1,13 @@
+from django.core.cache import cache
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from users.authentication import get_user_cache_key
+from users.models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_authenticated_user(sender, instance: User, **kwargs):
+    # ``QuerySet.update`` skips signals, such changes wait for the cache TTL.
+    cache.delete(get_user_cache_key(instance.pk))
@@ -0,0 +1,119 @@
+import pytest
+from common.checks import check_user_cache
+from common.routers import replica_alias
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.tokens import AccessToken
+from users.authentication import CachedJWTAuthentication
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def authentication() -> CachedJWTAuthentication:
+    CachedJWTAuthentication._tokens.clear()
+    return CachedJWTAuthentication()
+
+
+def test_repeated_token_is_verified_once(authentication, user, mocker):
+    raw_token = str(AccessToken.for_user(user)).encode()
+    verify = mocker.spy(AccessToken, "__init__")
+
+    first = authentication.get_validated_token(raw_token)
+    second = authentication.get_validated_token(raw_token)
+
+    assert first is second
+    assert verify.call_count == 1
+
+
+def test_token_cache_is_bounded(authentication, user_factory, settings):
+    settings.JWT_TOKEN_CACHE_SIZE = 2
+    raw_tokens = [str(AccessToken.for_user(user_factory())).encode() for _ in range(3)]
+
+    for raw_token in raw_tokens:
+        authentication.get_validated_token(raw_token)
+
+    assert list(authentication._tokens) == raw_tokens[1:]
+
+
+def test_cached_token_expires(authentication, user, freezer):
+    freezer.move_to("2024-05-31T10:00:00Z")
+    raw_token = str(AccessToken.for_user(user)).encode()
+    authentication.get_validated_token(raw_token)
+
+    freezer.move_to("2024-05-31T11:00:00Z")
+
+    with pytest.raises(InvalidToken):
+        authentication.get_validated_token(raw_token)
+    assert raw_token not in authentication._tokens
+
+
+def test_user_is_loaded_once(authentication, user):
+    token = authentication.get_validated_token(str(AccessToken.for_user(user)).encode())
+    authentication.get_user(token)
+
+    with CaptureQueriesContext(connection) as queries:
+        cached_user = authentication.get_user(token)
+
+    assert cached_user == user
+    assert len(queries) == 0
+
+
+def test_deactivated_user_is_rejected(authentication, user):
+    token = authentication.get_validated_token(str(AccessToken.for_user(user)).encode())
+    authentication.get_user(token)
+
+    user.is_active = False
+    user.save()
+
+    with pytest.raises(AuthenticationFailed):
+        authentication.get_user(token)
+
+
+def test_user_is_loaded_from_primary(authentication, user):
+    token = authentication.get_validated_token(str(AccessToken.for_user(user)).encode())
+    aliases = []
+
+    def record_alias(execute, sql, params, many, context):
+        aliases.append(replica_alias.get())
+        return execute(sql, params, many, context)
+
+    alias = replica_alias.set("replica_0")
+    try:
+        with connection.execute_wrapper(record_alias):
+            authentication.get_user(token)
+    finally:
+        replica_alias.reset(alias)
+
+    assert aliases == [None]
+
+
+def test_measurement_list_skips_user_query(
+    api_client, authentication, hydroponic_measurement
+):
+    user = hydroponic_measurement.system.user
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+    api_client.get("/hydroponic/measurements/")
+
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get("/hydroponic/measurements/")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not any('"users_user"' in query["sql"] for query in queries)
+
+
+def test_process_local_cache_is_reported(settings, tmp_path):
+    settings.DEBUG = False
+
+    assert [warning.id for warning in check_user_cache(None)] == ["common.W001"]
+
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": tmp_path,
+        }
+    }
+    assert check_user_cache(None) == []
@@ -11,6 +11,7 @@ UserModel = get_user_model()
 
 class RegisterUserViewSet(viewsets.ViewSet):
     permission_classes = [permissions.AllowAny]
+    query_budgets = {"create": 2}
 
     def create(self, request):
         serializer = serializers.UserSerializer(data=request.data)
@@ -25,6 +26,7 @@ class RegisterUserViewSet(viewsets.ViewSet):
 class CurrentUserView(APIView):
     serializer_class = serializers.UserSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budgets = {"get": 1}
 
     def get(self, request):
         serializer = self.serializer_class(request.user)